@@ -1,19 +1,26 @@
 from __future__ import annotations
 
-from pathlib import Path  # noqa: TC003
+import datetime
+import logging
+import sys
+import time
 from typing import TYPE_CHECKING
 
-from PySide6.QtCore import Property, QObject, QThread, Signal, Slot
+from PySide6.QtCore import QObject, Qt, QThread, QTimer, Signal, Slot
 
 # import app modules
 from data import db, monthly_gen
-from gen import excel_gen, graph_gen
-from utility import qt_util, save
+from gen.chart_kinds import DASHBOARD_KINDS
+from py_qml import chart_image_provider
+from utility import qt_util, save, startup_trace
 
 if TYPE_CHECKING:
     import argparse
     from collections.abc import Callable
 
+# create logger for module
+logger = logging.getLogger(__name__)
+
 
 class Worker(QObject):
     finished = Signal()
@@ -33,9 +40,10 @@ class InitializationWorker(Worker):
     step_changed = Signal(str)
     init_finished = Signal(bool)
 
-    def __init__(self, *, temp_instance: bool) -> None:
+    def __init__(self, *, temp_instance: bool, db_profile: str) -> None:
         super().__init__("Initialization")
         self._temp_instance = temp_instance
+        self._db_profile = db_profile
 
     def run(self) -> None:
         """Run the initialization steps."""
@@ -43,7 +51,7 @@ class InitializationWorker(Worker):
         save.instantiate(self._temp_instance)
 
         self.step_changed.emit("Initializing database")
-        db.initialize()
+        db.initialize(self._db_profile)
 
         self.step_changed.emit("Ensuring transaction data is up to date")
         monthly_gen.gen_transactions_for_all()
@@ -53,33 +61,221 @@ class InitializationWorker(Worker):
         self.finished.emit()
 
 
+class GenerationWorker(Worker):
+    TASK_NAME = "Generation"
+
+    generated = Signal(list)
+
+    def __init__(self) -> None:
+        super().__init__(self.TASK_NAME)
+
+    def run(self) -> None:
+        """Generate due recurring transactions and report the affected months ("YYYY-MM")."""
+        affected_months = monthly_gen.gen_transactions_for_all()
+
+        self.generated.emit([f"{year}-{month:02}" for year, month in sorted(affected_months)])
+
+        self.finished.emit()
+
+
+class DashboardWorker(Worker):
+    progress = Signal(str, int, int)  # Kind, request id, percentage
+    rendered = Signal(str, int, str)  # Kind, request id, image url
+    failed = Signal(str, int)  # Kind, request id
+    timings = Signal(dict)  # Kind to render milliseconds, -1 for cached charts
+
+    def __init__(  # noqa: PLR0913
+        self,
+        dashboard_request: int,
+        year: int,
+        month: int,
+        *,
+        size: tuple[int, int],
+        request_ids: dict[str, int],
+        is_cancelled: Callable[[], bool],
+    ) -> None:
+        super().__init__(f"Dashboard {dashboard_request}")
+        self._year = year
+        self._month = month
+        self._size = size
+        self._request_ids = request_ids
+        self._is_cancelled = is_cancelled
+
+    def run(self) -> None:
+        """Render all dashboard charts in one pass and report their urls and timings."""
+        from gen import graph_gen  # noqa: PLC0415 # Loaded on first use
+
+        for kind, request_id in self._request_ids.items():
+            self.progress.emit(kind, request_id, 30)
+
+        try:
+            charts = graph_gen.plot_dashboard(
+                self._year,
+                self._month,
+                self._size,
+                is_cancelled=self._is_cancelled,
+            )
+
+            for chart in charts:
+                self.rendered.emit(
+                    chart.kind,
+                    self._request_ids[chart.kind],
+                    chart_image_provider.chart_url(chart.kind, chart.period, chart.data_version),
+                )
+
+            self.timings.emit(
+                {
+                    chart.kind: -1 if chart.render_seconds is None else chart.render_seconds * 1000
+                    for chart in charts
+                },
+            )
+        except graph_gen.RenderCancelledError:
+            logger.debug("Superseded dashboard request was cancelled")
+        except Exception:
+            logger.exception("Failed to render dashboard charts")
+
+            for kind, request_id in self._request_ids.items():
+                self.failed.emit(kind, request_id)
+
+        self.finished.emit()
+
+
+class ChartUrlWorker(Worker):
+    rendered = Signal(str, int, str)  # Kind, request id, image url
+    failed = Signal(str, int)  # Kind, request id
+
+    def __init__(self, kind: str, period: tuple[int, ...], request_id: int) -> None:
+        super().__init__(f"Chart {kind} {request_id}")
+        self._kind = kind
+        self._period = period
+        self._request_id = request_id
+
+    def run(self) -> None:
+        """Report the image url of the chart at the current data version.
+
+        The chart itself is rendered by the image provider once QML loads the url.
+        """
+        try:
+            url = chart_image_provider.chart_url(self._kind, self._period, db.data_version())
+        except Exception:
+            logger.exception("Failed to read the data version of the %s chart", self._kind)
+            self.failed.emit(self._kind, self._request_id)
+        else:
+            self.rendered.emit(self._kind, self._request_id, url)
+
+        self.finished.emit()
+
+
+class WarmUpWorker(Worker):
+    def __init__(self) -> None:
+        super().__init__("Warm-up")
+
+    def run(self) -> None:
+        """Load the modules deferred at startup (charts, exports) and lay out the chart figures."""
+        start = time.perf_counter()
+
+        from gen import excel_gen, graph_gen  # noqa: F401, PLC0415
+
+        graph_gen.warm_up()
+
+        elapsed = time.perf_counter() - start
+        logger.debug("Warm-up finished in %.0f ms", elapsed * 1000)
+        startup_trace.warm_up_finished(elapsed)
+
+        self.finished.emit()
+
+
+class GenerationScheduler(QObject):
+    """Signals when recurring transactions may be due.
+
+    Fires at every local date rollover (midnight) and, if interval_minutes > 0, periodically.
+    The periodic check also covers missed rollovers, e.g. after the system was suspended.
+    """
+
+    due = Signal()
+
+    def __init__(self, interval_minutes: int, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._ROLLOVER_SLACK_MS = 1000  # Fire slightly after midnight, never before it
+
+        self._rollover_timer = QTimer(self)
+        self._rollover_timer.setSingleShot(True)
+        self._rollover_timer.setTimerType(Qt.TimerType.PreciseTimer)  # Coarse timers drift by 5%
+        self._rollover_timer.timeout.connect(self._on_rollover)
+
+        self._interval_timer = QTimer(self)
+        self._interval_timer.setInterval(interval_minutes * 60 * 1000)
+        self._interval_timer.timeout.connect(self._on_interval)
+
+        self._interval_minutes = interval_minutes
+        self._last_date = self._local_date()
+
+    @staticmethod
+    def _local_date() -> datetime.date:
+        return datetime.datetime.now().astimezone().date()
+
+    def _arm_rollover_timer(self) -> None:
+        now = datetime.datetime.now().astimezone()
+        next_midnight = datetime.datetime.combine(
+            now.date() + datetime.timedelta(days=1),
+            datetime.time(),
+            tzinfo=now.tzinfo,
+        )
+
+        msecs = int((next_midnight - now).total_seconds() * 1000) + self._ROLLOVER_SLACK_MS
+        self._rollover_timer.start(msecs)
+
+    def _on_rollover(self) -> None:
+        self._last_date = self._local_date()
+        self._arm_rollover_timer()
+        self.due.emit()
+
+    def _on_interval(self) -> None:
+        if self._local_date() != self._last_date:
+            # Rollover was missed (suspend, clock change), re-arm the rollover timer
+            self._last_date = self._local_date()
+            self._arm_rollover_timer()
+
+        self.due.emit()
+
+    def start(self) -> None:
+        """Start scheduling."""
+        self._last_date = self._local_date()
+        self._arm_rollover_timer()
+
+        if self._interval_minutes > 0:
+            self._interval_timer.start()
+
+    def stop(self) -> None:
+        """Stop scheduling."""
+        self._rollover_timer.stop()
+        self._interval_timer.stop()
+
+
 class AppController(QObject):
+    transactions_generated = Signal(list)  # Months ("YYYY-MM") that received new transactions
+    chart_ready = Signal(str, str)  # Chart kind, image url
+    chart_progress = Signal(str, int)  # Chart kind, percentage
+    chart_failed = Signal(str)  # Chart kind
+    dashboard_timings = Signal(dict)  # Chart kind to render milliseconds, -1 for cached charts
+
     def __init__(self) -> None:
         super().__init__()
         self._current_init_step = ""
         self._init_status = False
+        self._generation_scheduler: GenerationScheduler | None = None
 
         self._threads: dict[str, QThread] = {}
         self._workers: dict[str, Worker] = {}
 
-        self._chart_paths: dict[str, str] = {}
-
-    def _build_chart_paths(self, base_path: Path) -> dict[str, str]:
-        return {
-            "monthlyChart": (base_path / "monthlychart.png").resolve().as_uri(),
-            "dailyChart": (base_path / "dailychart.png").resolve().as_uri(),
-            "incomeVsExpense": (base_path / "income_vs_expense.png").resolve().as_uri(),
-            "expenseDistribution": (base_path / "expense_distribution.png").resolve().as_uri(),
-        }
+        # Latest request id per chart kind, older requests are superseded
+        self._chart_requests: dict[str, int] = {}
+        self._dashboard_requests = 0
 
-    def get_chart_paths(self) -> dict[str, str]:
-        """Get chart paths."""
-        if not self._chart_paths:
-            base_path = save.data_folder_path() / "graphs"
-            self._chart_paths = self._build_chart_paths(base_path)
-        return self._chart_paths
-
-    chart_paths = Property(dict, get_chart_paths)  # type: ignore  # noqa: PGH003
+        # Renders the charts QML asks for, register it with the qml engine
+        self.chart_image_provider = chart_image_provider.ChartImageProvider()
+        self.chart_image_provider.progress.connect(self.chart_progress)
+        self.chart_image_provider.failed.connect(self.chart_failed)
 
     # current initialization step property
     current_init_step, _get_current_init_step, _set_current_init_step, init_step_changed = (
@@ -97,34 +293,111 @@ class AppController(QObject):
         "init_status_changed",
     )
 
+    def _next_chart_request(self, kind: str) -> int:
+        """Get a new request id for a chart kind, superseding running requests for it."""
+        request_id = self._chart_requests.get(kind, 0) + 1
+        self._chart_requests[kind] = request_id
+        return request_id
+
+    def _request_chart(self, kind: str, *period: int) -> None:
+        """Show a chart, superseding running requests for the same kind.
+
+        The data version of its url is read on a worker thread, the chart is rendered by the
+        image provider once QML loads the url.
+        """
+        self._start_task(
+            ChartUrlWorker(kind, period, self._next_chart_request(kind)),
+            {"rendered": self._on_chart_rendered, "failed": self._on_chart_failed},
+        )
+
+    def _on_chart_progress(self, kind: str, request_id: int, percentage: int) -> None:
+        if self._chart_requests.get(kind) == request_id:
+            self.chart_progress.emit(kind, percentage)
+
+    def _on_chart_rendered(self, kind: str, request_id: int, url: str) -> None:
+        # Drop results of requests that were superseded after rendering started
+        if self._chart_requests.get(kind) == request_id:
+            self.chart_ready.emit(kind, url)
+
+    def _on_chart_failed(self, kind: str, request_id: int) -> None:
+        if self._chart_requests.get(kind) == request_id:
+            self.chart_failed.emit(kind)
+
+    @Slot(str, str, int, int)
+    def plot_dashboard(self, year: str, month: str, width: int, height: int) -> None:
+        """Generate all graphs of a year in one pass (daily graph for month).
+
+        Graphs are rendered at width x height device pixels. Emits chart_ready per graph and
+        dashboard_timings once all are done.
+        """
+        self._dashboard_requests += 1
+        request_ids = {kind: self._next_chart_request(kind) for kind in DASHBOARD_KINDS}
+
+        dashboard_worker = DashboardWorker(
+            self._dashboard_requests,
+            int(year),
+            int(month),
+            size=(width, height),
+            request_ids=request_ids,
+            is_cancelled=lambda: all(  # Read from the worker thread
+                self._chart_requests[kind] != request_id for kind, request_id in request_ids.items()
+            ),
+        )
+
+        self._start_task(
+            dashboard_worker,
+            {
+                "progress": self._on_chart_progress,
+                "rendered": self._on_chart_rendered,
+                "failed": self._on_chart_failed,
+                "timings": self.dashboard_timings.emit,
+            },
+        )
+
     @Slot(str, str)
     def plot_daily_transactions(self, year: str, month: str) -> None:
-        """Generate daily transaction graph."""
-        graph_gen.plot_daily_transactions(int(year), int(month))
+        """Generate daily transaction graph. Emits chart_ready with its image url."""
+        self._request_chart("daily_transactions", int(year), int(month))
 
     @Slot(str)
     def plot_monthly_trend(self, year: str) -> None:
-        """Generate monthly trend graph."""
-        graph_gen.plot_monthly_trend(int(year))
+        """Generate monthly trend graph. Emits chart_ready with its image url."""
+        self._request_chart("monthly_trend", int(year))
 
     @Slot(str)
     def plot_income_vs_expense(self, year: str) -> None:
-        """Generate income vs expense graph."""
-        graph_gen.plot_income_vs_expense(int(year))
+        """Generate income vs expense graph. Emits chart_ready with its image url."""
+        self._request_chart("income_vs_expense", int(year))
 
     @Slot(str)
     def plot_expense_distribution(self, year: str) -> None:
-        """Generate expense distribution graph."""
-        graph_gen.plot_expense_distribution(int(year))
+        """Generate expense distribution graph. Emits chart_ready with its image url."""
+        self._request_chart("expense_distribution", int(year))
+
+    @Slot(str, str)
+    def plot_net_flow_trend(self, start_year: str, end_year: str) -> None:
+        """Generate monthly net flow graph of a range of years. Emits chart_ready with its url."""
+        start, end = sorted((int(start_year), int(end_year)))
+        self._request_chart("net_flow_trend", start, 1, end, 12)
+
+    @Slot(str, str)
+    def plot_balance_history(self, start_year: str, end_year: str) -> None:
+        """Generate daily balance graph of a range of years. Emits chart_ready with its url."""
+        start, end = sorted((int(start_year), int(end_year)))
+        self._request_chart("balance_history", start, 1, end, 12)
 
     @Slot()
     def export_database(self) -> None:
         """Export database to excel."""
+        from gen import excel_gen  # noqa: PLC0415 # Loaded on first use
+
         excel_gen.export_database()
 
     @Slot(str, str)
     def export_transactions_by_month(self, month: str, year: str) -> None:
         """Export transaction to excel."""
+        from gen import excel_gen  # noqa: PLC0415 # Loaded on first use
+
         excel_gen.export_transactions_by_month(int(month), int(year))
 
     def _start_task(
@@ -145,9 +418,11 @@ class AppController(QObject):
 
         # set up connections
         thread.started.connect(worker.run)
-        worker.finished.connect(thread.quit)
+        worker.finished.connect(thread.quit, Qt.ConnectionType.DirectConnection)  # Thread-safe
         worker.finished.connect(worker.deleteLater)
-        worker.finished.connect(thread.deleteLater)
+
+        # Release the worker thread's database sessions (runs on the worker thread)
+        worker.finished.connect(db.remove_thread_sessions, Qt.ConnectionType.DirectConnection)
 
         # Connect worker signals to controller methods
         if signal_connections:
@@ -160,24 +435,67 @@ class AppController(QObject):
             del self._workers[worker.task_name]
 
         thread.finished.connect(cleanup_references)
+        thread.finished.connect(thread.deleteLater)  # After cleanup_references, once it has stopped
 
         # start thread
         thread.start()
 
+    @Slot()
+    def on_first_frame(self) -> None:
+        """Record the first frame and load the modules deferred at startup in the background."""
+        startup_trace.first_frame()
+        self._start_task(WarmUpWorker())
+
     def start_initialization(self, command_line_args: argparse.Namespace) -> None:
         """Start the initialization process."""
         # Create the initialization worker
         init_worker = InitializationWorker(
             temp_instance=command_line_args.temp_instance,
+            db_profile=command_line_args.db_profile,
+        )
+
+        # Create the recurring transaction generation scheduler (started after initialization)
+        self._generation_scheduler = GenerationScheduler(
+            command_line_args.generation_interval,
+            self,
         )
+        self._generation_scheduler.due.connect(self._start_generation)
 
         # Start the task
         self._start_task(
             init_worker,
-            {"step_changed": self._set_current_init_step, "init_finished": self._set_init_status},
+            {"step_changed": self._set_current_init_step, "init_finished": self._on_init_finished},
         )
 
+    def _on_init_finished(self, status: bool) -> None:  # noqa: FBT001
+        self._set_init_status(status)
+
+        if status and self._generation_scheduler:
+            self._generation_scheduler.start()
+
+    def _start_generation(self) -> None:
+        """Generate due recurring transactions on a worker thread."""
+        if GenerationWorker.TASK_NAME in self._workers:
+            # Previous generation is still running, it will catch up everything that is due
+            return
+
+        self._start_task(GenerationWorker(), {"generated": self._on_transactions_generated})
+
+    def _on_transactions_generated(self, months: list[str]) -> None:
+        if months:
+            self.transactions_generated.emit(months)
+
     def cleanup(self) -> None:
         """Prepare application for exit."""
-        graph_gen.close_graphs()
+        if self._generation_scheduler:
+            self._generation_scheduler.stop()
+
+        # Let running tasks (e.g. chart renders) finish before the database is closed
+        for thread in list(self._threads.values()):
+            thread.wait()
+
+        # Charts are loaded on first use, there is nothing to close if they never were
+        graph_gen = sys.modules.get("gen.graph_gen")
+        if graph_gen:
+            graph_gen.close_graphs()
         db.close_db()
@@ -1,57 +1,399 @@
 from __future__ import annotations
 
 import logging
+import sqlite3
+from dataclasses import dataclass
+from functools import partial
 from sqlite3 import Connection as SQLite3Connection
-from typing import cast
+from typing import TYPE_CHECKING, cast
 
-from sqlalchemy import create_engine, event
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event, inspect, select
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from utility import save
 
-from .models import Base
+from .models import (
+    CREATE_TRANSACTIONS_SEARCH,
+    DATA_VERSION_TRIGGERS,
+    INIT_DATA_VERSION,
+    INIT_DATABASE_ID,
+    MONTHLY_TOTALS_TRIGGERS,
+    REBUILD_MONTHLY_TOTALS,
+    REBUILD_TRANSACTIONS_SEARCH,
+    TRANSACTIONS_SEARCH_TRIGGERS,
+    Base,
+    DataVersion,
+    Transaction,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from sqlalchemy.engine import Connection, Engine
 
 # create logger for module
 logger = logging.getLogger(__name__)
 
 
-# Enable foreign key constraints
-@event.listens_for(Engine, "connect")
-def _set_sqlite_pragma(dbapi_connection: object, connection_record) -> None:  # noqa: ANN001, ARG001
+@dataclass(frozen=True)
+class PragmaProfile:
+    """SQLite settings applied to every new database connection."""
+
+    journal_mode: str
+    synchronous: str
+    cache_size: int  # Negative values are in KiB, positive values in pages
+    mmap_size: int  # Bytes, 0 disables memory mapped I/O
+    temp_store: str
+    busy_timeout: int  # Milliseconds to wait on a locked database before failing
+
+
+# Named pragma profiles, selectable from the command line (--db-profile)
+#
+# Commit latency of a single transaction insert, median of 500 commits measured with
+# tools/bench_db_profiles.py on a virtual disk (depends heavily on the disk and its fsync):
+#   safe:        ~1.1 ms (rollback journal, fsync on every commit)
+#   performance: ~0.14 ms (write-ahead log, fsync only on checkpoints)
+PRAGMA_PROFILES: dict[str, PragmaProfile] = {
+    # SQLite defaults, maximum durability
+    "safe": PragmaProfile(
+        journal_mode="DELETE",
+        synchronous="FULL",
+        cache_size=-2000,
+        mmap_size=0,
+        temp_store="DEFAULT",
+        busy_timeout=5000,
+    ),
+    # WAL lets the GUI thread read while a worker thread writes. With synchronous=NORMAL a power
+    # loss can roll back the last commits, but it can not corrupt the database.
+    "performance": PragmaProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-64000,
+        mmap_size=256 * 1024 * 1024,
+        temp_store="MEMORY",
+        busy_timeout=5000,
+    ),
+}
+
+DEFAULT_PRAGMA_PROFILE = "performance"
+
+
+# Connection pool sizing. Connections are shared between the GUI thread and worker threads
+# (QThreads), which is why check_same_thread is disabled on every connection.
+POOL_SIZE = 5
+POOL_MAX_OVERFLOW = 5
+POOL_TIMEOUT = 30  # Seconds to wait for a free connection
+
+
+def _set_sqlite_pragma(
+    dbapi_connection: object,
+    connection_record,  # noqa: ANN001, ARG001
+    profile: PragmaProfile,
+    *,
+    read_only: bool = False,
+) -> None:
     if isinstance(dbapi_connection, SQLite3Connection):
         cursor = dbapi_connection.cursor()
+
+        # Enable foreign key constraints
         cursor.execute("PRAGMA foreign_keys=ON;")
+
+        if read_only:
+            # The journal mode is persistent and set by read-write connections
+            cursor.execute("PRAGMA query_only=ON;")
+        else:
+            # Apply performance profile (PRAGMA statements do not support bound parameters)
+            cursor.execute(f"PRAGMA journal_mode={profile.journal_mode};")
+            cursor.execute(f"PRAGMA synchronous={profile.synchronous};")
+
+        # Apply the rest of the performance profile
+        cursor.execute(f"PRAGMA cache_size={int(profile.cache_size)};")
+        cursor.execute(f"PRAGMA mmap_size={int(profile.mmap_size)};")
+        cursor.execute(f"PRAGMA temp_store={profile.temp_store};")
+        cursor.execute(f"PRAGMA busy_timeout={int(profile.busy_timeout)};")
+
         cursor.close()
 
 
+class SchemaVersionError(Exception):
+    def __init__(self, version: int) -> None:
+        super().__init__(
+            f"Database schema version {version} is newer than the supported version "
+            f"{SCHEMA_VERSION}.",
+        )
+
+
+# Schema migrations
+#
+# Base.metadata.create_all only creates missing tables, it never alters existing ones.
+# Databases created by older versions of the app are upgraded in place by the migrations below.
+# The schema version is stored in the database file itself (PRAGMA user_version).
+# Migration N (1-based position in _MIGRATIONS) upgrades a database from version N-1 to N.
+# Migrations must never be edited once released, add a new one instead.
+
+
+def _add_transaction_indexes(connection: Connection) -> None:
+    """Add secondary indexes used by date range, category and recurring transaction lookups."""
+    statements = (
+        (
+            "CREATE INDEX IF NOT EXISTS ix_transactions_execution_date_transaction_type "
+            "ON transactions (execution_date, transaction_type)"
+        ),
+        "CREATE INDEX IF NOT EXISTS ix_transactions_category ON transactions (category)",
+        (
+            "CREATE INDEX IF NOT EXISTS ix_transactions_monthly_transaction_id "
+            "ON transactions (monthly_transaction_id)"
+        ),
+        (
+            "CREATE INDEX IF NOT EXISTS ix_monthly_transactions_category "
+            "ON monthly_transactions (category)"
+        ),
+        (
+            "CREATE INDEX IF NOT EXISTS ix_transaction_categories_transaction_type "
+            "ON transaction_categories (transaction_type)"
+        ),
+    )
+
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def _add_monthly_totals(connection: Connection) -> None:
+    """Add the monthly_totals rollup table, its maintenance triggers and populate it."""
+    connection.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS monthly_totals (
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            transaction_type VARCHAR(7) NOT NULL,
+            category VARCHAR NOT NULL,
+            total NUMERIC(12, 2) NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (year, month, transaction_type, category)
+        )
+        """,
+    )
+
+    for statement in (*MONTHLY_TOTALS_TRIGGERS, *REBUILD_MONTHLY_TOTALS):
+        connection.exec_driver_sql(statement)
+
+
+def _convert_amounts_to_cents(connection: Connection) -> None:
+    """Convert decimal amounts to integer cents and recompute the monthly totals.
+
+    The declared column types of existing tables stay NUMERIC, which stores integers exactly.
+    """
+    # Avoid maintaining the rollup row by row, it is rebuilt from scratch afterwards
+    connection.exec_driver_sql("DROP TRIGGER IF EXISTS trg_transactions_update_monthly_totals")
+
+    for table in ("transactions", "monthly_transactions"):
+        connection.exec_driver_sql(
+            f"UPDATE {table} SET amount = CAST(ROUND(amount * 100) AS INTEGER)",  # noqa: S608
+        )
+
+    for statement in (*MONTHLY_TOTALS_TRIGGERS, *REBUILD_MONTHLY_TOTALS):
+        connection.exec_driver_sql(statement)
+
+
+def _add_data_version(connection: Connection) -> None:
+    """Add the data_version change counter of the transactions table and its triggers."""
+    connection.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER NOT NULL,
+            version INTEGER NOT NULL,
+            PRIMARY KEY (id)
+        )
+        """,
+    )
+
+    for statement in (INIT_DATA_VERSION, *DATA_VERSION_TRIGGERS):
+        connection.exec_driver_sql(statement)
+
+
+def _add_ledger_index(connection: Connection) -> None:
+    """Add the index the transaction ledger pages through transactions with."""
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_transactions_execution_date_id "
+        "ON transactions (execution_date, id)",
+    )
+
+
+_TRANSACTIONS_SEARCH_TABLE = "transactions_search"
+
+
+def _has_fts5(connection: Connection) -> bool:
+    """Check whether SQLite was built with FTS5, which the full text index needs."""
+    return bool(
+        connection.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar_one(),
+    )
+
+
+def _add_transactions_search(connection: Connection) -> None:
+    """Add the full text index of transactions, its maintenance triggers and populate it.
+
+    Skipped if SQLite has no FTS5, transactions are then searched without an index.
+    """
+    if not _has_fts5(connection):
+        logger.warning("SQLite has no FTS5, transactions are searched without full text index")
+        return
+
+    for statement in (
+        CREATE_TRANSACTIONS_SEARCH,
+        *TRANSACTIONS_SEARCH_TRIGGERS,
+        REBUILD_TRANSACTIONS_SEARCH,
+    ):
+        connection.exec_driver_sql(statement)
+
+
+def _add_database_id(connection: Connection) -> None:
+    """Add the random identity of the database, which data versions are only unique within."""
+    connection.exec_driver_sql("ALTER TABLE data_version ADD COLUMN database_id VARCHAR")
+    connection.exec_driver_sql(INIT_DATABASE_ID)
+
+
+_MIGRATIONS: list[Callable[[Connection], None]] = [
+    _add_transaction_indexes,
+    _add_monthly_totals,
+    _convert_amounts_to_cents,
+    _add_data_version,
+    _add_ledger_index,
+    _add_transactions_search,
+    _add_database_id,
+]
+
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+
+def _get_schema_version(connection: Connection) -> int:
+    return cast("int", connection.exec_driver_sql("PRAGMA user_version").scalar_one())
+
+
+def _set_schema_version(connection: Connection, version: int) -> None:
+    # PRAGMA statements do not support bound parameters
+    connection.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+
+
+def _upgrade_schema(engine: Engine) -> None:
+    """Create the database schema or upgrade an existing database to SCHEMA_VERSION."""
+    with engine.begin() as connection:
+        current_version = _get_schema_version(connection)
+
+        if current_version > SCHEMA_VERSION:
+            raise SchemaVersionError(current_version)
+
+        if not inspect(connection).has_table(Transaction.__tablename__):
+            # New database: Create the latest schema directly
+            Base.metadata.create_all(connection)
+            _add_transactions_search(connection)
+            _set_schema_version(connection, SCHEMA_VERSION)
+
+            logger.info("Created database schema at version %d", SCHEMA_VERSION)
+            return
+
+        # Existing database: Apply pending migrations in order
+        for version in range(current_version + 1, SCHEMA_VERSION + 1):
+            migration = _MIGRATIONS[version - 1]
+            migration(connection)
+            _set_schema_version(connection, version)
+
+            logger.info("Migrated database schema to version %d (%s)", version, migration.__name__)
+
+        # Create tables that did not exist in older schemas and have no data to migrate
+        Base.metadata.create_all(connection)
+
+        # The full text index is missing if SQLite had no FTS5 when it was due, add it now
+        if not inspect(connection).has_table(_TRANSACTIONS_SEARCH_TABLE):
+            _add_transactions_search(connection)
+
+
+def _create_engine(db_path: Path, profile: PragmaProfile, *, read_only: bool) -> Engine:
+    """Create a pooled engine for the database file, applying the pragma profile on connect."""
+    if read_only:
+        # Open the file with a read-only URI, writes fail even if query_only is turned off
+        def connect() -> SQLite3Connection:
+            return sqlite3.connect(
+                f"{db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+
+        engine = create_engine(
+            "sqlite://",
+            creator=connect,
+            poolclass=QueuePool,
+            pool_size=POOL_SIZE,
+            max_overflow=POOL_MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+        )
+    else:
+        engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            pool_size=POOL_SIZE,
+            max_overflow=POOL_MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+        )
+
+    event.listen(
+        engine,
+        "connect",
+        partial(_set_sqlite_pragma, profile=profile, read_only=read_only),
+    )
+
+    return engine
+
+
 class State:
     def __init__(self) -> None:
         self._DB_NAME = "pfm"
         self._UNINITIALIZED_MSG = "Database not initialized. Call initialize_db() first."
         self._engine: Engine | None = None
+        self._read_engine: Engine | None = None
         self._session_factory: sessionmaker | None = None
+        self._thread_sessions: scoped_session | None = None
+        self._read_sessions: scoped_session | None = None
+        self._database_id: str | None = None
+        self._has_search_index = False
         self._initialized = False
 
-    def initialize_db(self) -> None:
+    def initialize_db(self, pragma_profile: str = DEFAULT_PRAGMA_PROFILE) -> None:
         """Initialize the database. Allows db operations to be performed.
 
         Save module should be instantiated before this function is called.
+        pragma_profile must be one of the PRAGMA_PROFILES keys.
         """
         if self._initialized:
             return
 
+        profile = PRAGMA_PROFILES[pragma_profile]
+
         # Get the database path
         db_path = save.data_folder_path() / (self._DB_NAME + ".db")
 
-        # Create the database engine
-        self._engine = create_engine(f"sqlite:///{db_path}")
+        # Create the database engine and apply the pragma profile on every new connection
+        self._engine = _create_engine(db_path, profile, read_only=False)
+
+        logger.debug("Using database pragma profile: %s", pragma_profile)
+
+        # Create the database tables or bring an existing database up to date
+        _upgrade_schema(self._engine)
 
-        # Create the database tables if they do not exist
-        Base.metadata.create_all(self._engine)
+        # Only changes if the database file is replaced, which requires a restart
+        with self._engine.connect() as connection:
+            self._database_id = connection.scalars(select(DataVersion.database_id)).one()
+            self._has_search_index = inspect(connection).has_table(_TRANSACTIONS_SEARCH_TABLE)
 
-        # Create a session maker
+        # The read-only engine can only open the file once it exists
+        self._read_engine = _create_engine(db_path, profile, read_only=True)
+
+        # Create session makers, scoped ones hand out one session per thread
         self._session_factory = sessionmaker(bind=self._engine)
+        self._thread_sessions = scoped_session(self._session_factory)
+        self._read_sessions = scoped_session(sessionmaker(bind=self._read_engine))
 
         self._initialized = True
 
@@ -62,6 +404,7 @@ class State:
             return
 
         cast("Engine", self._engine).dispose()
+        cast("Engine", self._read_engine).dispose()
 
     def create_session(self) -> Session:
         """Create a new database session."""
@@ -70,9 +413,78 @@ class State:
 
         return cast("sessionmaker", self._session_factory)()
 
+    def thread_session(self) -> Session:
+        """Get the database session of the current thread.
+
+        Repeated calls from the same thread return the same session. Close it after use
+        (e.g. with a with block), it remains reusable by the thread.
+        """
+        if not self._initialized:
+            raise RuntimeError(self._UNINITIALIZED_MSG)
+
+        return cast("scoped_session", self._thread_sessions)()
+
+    def read_session(self) -> Session:
+        """Get the read-only database session of the current thread, used for reporting.
+
+        Read-only sessions use their own connection pool, so charts and exports never wait on
+        connections used for writing. Close it after use, it remains reusable by the thread.
+        """
+        if not self._initialized:
+            raise RuntimeError(self._UNINITIALIZED_MSG)
+
+        return cast("scoped_session", self._read_sessions)()
+
+    def data_version(self) -> int:
+        """Get the change counter of the transactions table, bumped on every committed write.
+
+        The counter is stored in the database, so it keeps increasing across restarts. Read on
+        a connection of its own, it never touches the read-only session of the calling thread.
+        """
+        if not self._initialized:
+            raise RuntimeError(self._UNINITIALIZED_MSG)
+
+        with cast("Engine", self._read_engine).connect() as connection:
+            return connection.scalars(select(DataVersion.version)).one()
+
+    def database_id(self) -> str:
+        """Get the random identity of the database, unique to the database file.
+
+        Data versions only identify data together with it, every new database file starts its
+        data version over.
+        """
+        if not self._initialized:
+            raise RuntimeError(self._UNINITIALIZED_MSG)
+
+        return cast("str", self._database_id)
+
+    def has_search_index(self) -> bool:
+        """Check whether the database has the full text index of transactions.
+
+        It is missing if SQLite was built without FTS5, search has to do without it then.
+        """
+        if not self._initialized:
+            raise RuntimeError(self._UNINITIALIZED_MSG)
+
+        return self._has_search_index
+
+    def remove_thread_sessions(self) -> None:
+        """Close and discard the sessions of the current thread. Call before a thread exits."""
+        if not self._initialized:
+            return
+
+        cast("scoped_session", self._thread_sessions).remove()
+        cast("scoped_session", self._read_sessions).remove()
+
 
 _state = State()
 
 initialize = _state.initialize_db
 create_session = _state.create_session
+thread_session = _state.thread_session
+read_session = _state.read_session
+remove_thread_sessions = _state.remove_thread_sessions
+data_version = _state.data_version
+database_id = _state.database_id
+has_search_index = _state.has_search_index
 close_db = _state.close_db
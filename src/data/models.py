@@ -3,15 +3,19 @@ from datetime import date
 from decimal import Decimal
 
 from sqlalchemy import (
+    DDL,
     Date,
     Enum,
     ForeignKey,
+    Index,
     Integer,
-    Numeric,
     String,
+    event,
 )
 from sqlalchemy.orm import Mapped, declarative_base, mapped_column
 
+from .money import Money
+
 Base = declarative_base()
 
 
@@ -22,20 +26,32 @@ class TransactionType(enum.Enum):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Month/year views filter on a date range and are often split by type
+        Index(
+            "ix_transactions_execution_date_transaction_type",
+            "execution_date",
+            "transaction_type",
+        ),
+        # The ledger pages through all transactions in (execution_date, id) order
+        Index("ix_transactions_execution_date_id", "execution_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String())
-    amount: Mapped[Decimal] = mapped_column(Numeric(precision=10, scale=2))
+    amount: Mapped[Decimal] = mapped_column(Money())
     transaction_type: Mapped[TransactionType] = mapped_column(Enum(TransactionType))
     execution_date: Mapped[date] = mapped_column(Date())
     category: Mapped[str] = mapped_column(
         String(),
         ForeignKey("transaction_categories.name", ondelete="CASCADE", onupdate="CASCADE"),
+        index=True,
     )
     monthly_transaction_id: Mapped[int] = mapped_column(
         Integer(),
         ForeignKey("monthly_transactions.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
     )
 
 
@@ -43,7 +59,7 @@ class TransactionCategory(Base):
     __tablename__ = "transaction_categories"
 
     name: Mapped[str] = mapped_column(String(), primary_key=True)
-    transaction_type: Mapped[TransactionType] = mapped_column(Enum(TransactionType))
+    transaction_type: Mapped[TransactionType] = mapped_column(Enum(TransactionType), index=True)
 
 
 class MonthlyTransaction(Base):
@@ -51,7 +67,7 @@ class MonthlyTransaction(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String())
-    amount: Mapped[Decimal] = mapped_column(Numeric(precision=10, scale=2))
+    amount: Mapped[Decimal] = mapped_column(Money())
     transaction_type: Mapped[TransactionType] = mapped_column(Enum(TransactionType))
     day_of_month: Mapped[int] = mapped_column(Integer())
     start_date: Mapped[date] = mapped_column(Date())
@@ -59,5 +75,214 @@ class MonthlyTransaction(Base):
     category: Mapped[str] = mapped_column(
         String(),
         ForeignKey("transaction_categories.name", ondelete="CASCADE", onupdate="CASCADE"),
+        index=True,
     )
     generated_until: Mapped[date] = mapped_column(Date(), nullable=True)
+
+
+class MonthlyTotal(Base):
+    """Per month, type and category rollup of the transactions table.
+
+    Rows are maintained by the triggers in MONTHLY_TOTALS_TRIGGERS, never write to this table
+    directly. Because triggers also fire for foreign key cascades, category renames and deletions
+    are reflected as well.
+    """
+
+    __tablename__ = "monthly_totals"
+
+    year: Mapped[int] = mapped_column(Integer(), primary_key=True)
+    month: Mapped[int] = mapped_column(Integer(), primary_key=True)
+    transaction_type: Mapped[TransactionType] = mapped_column(
+        Enum(TransactionType),
+        primary_key=True,
+    )
+    category: Mapped[str] = mapped_column(String(), primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Money())
+    count: Mapped[int] = mapped_column(Integer())
+
+
+class DataVersion(Base):
+    """Single row change counter of the transactions table.
+
+    Bumped by the triggers in DATA_VERSION_TRIGGERS on every insert, update and delete (cascades
+    included). Derived data such as rendered charts can be keyed on it to detect stale results.
+    The counter starts over in every new database file, so keys also need database_id: a random
+    id set once when the row is created (see INIT_DATABASE_ID).
+    """
+
+    __tablename__ = "data_version"
+
+    id: Mapped[int] = mapped_column(Integer(), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer())
+    database_id: Mapped[str] = mapped_column(String(), nullable=True)
+
+
+# Dates are stored as ISO strings (YYYY-MM-DD), so year and month can be sliced out directly
+
+_ADD_TO_MONTHLY_TOTALS = """
+    INSERT INTO monthly_totals (year, month, transaction_type, category, total, count)
+    VALUES (
+        CAST(substr(NEW.execution_date, 1, 4) AS INTEGER),
+        CAST(substr(NEW.execution_date, 6, 2) AS INTEGER),
+        NEW.transaction_type,
+        NEW.category,
+        NEW.amount,
+        1
+    )
+    ON CONFLICT (year, month, transaction_type, category)
+    DO UPDATE SET total = total + excluded.total, count = count + 1;
+"""
+
+_SUBTRACT_FROM_MONTHLY_TOTALS = """
+    UPDATE monthly_totals
+    SET total = total - OLD.amount, count = count - 1
+    WHERE year = CAST(substr(OLD.execution_date, 1, 4) AS INTEGER)
+        AND month = CAST(substr(OLD.execution_date, 6, 2) AS INTEGER)
+        AND transaction_type = OLD.transaction_type
+        AND category = OLD.category;
+
+    DELETE FROM monthly_totals
+    WHERE year = CAST(substr(OLD.execution_date, 1, 4) AS INTEGER)
+        AND month = CAST(substr(OLD.execution_date, 6, 2) AS INTEGER)
+        AND transaction_type = OLD.transaction_type
+        AND category = OLD.category
+        AND count <= 0;
+"""
+
+MONTHLY_TOTALS_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_insert_monthly_totals
+    AFTER INSERT ON transactions
+    BEGIN
+        {_ADD_TO_MONTHLY_TOTALS}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_delete_monthly_totals
+    AFTER DELETE ON transactions
+    BEGIN
+        {_SUBTRACT_FROM_MONTHLY_TOTALS}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_update_monthly_totals
+    AFTER UPDATE OF amount, transaction_type, execution_date, category ON transactions
+    BEGIN
+        {_SUBTRACT_FROM_MONTHLY_TOTALS}
+        {_ADD_TO_MONTHLY_TOTALS}
+    END
+    """,
+)
+
+# Recomputes the rollup from scratch, used to populate monthly_totals for existing data
+REBUILD_MONTHLY_TOTALS = (
+    "DELETE FROM monthly_totals",
+    """
+    INSERT INTO monthly_totals (year, month, transaction_type, category, total, count)
+    SELECT
+        CAST(substr(execution_date, 1, 4) AS INTEGER),
+        CAST(substr(execution_date, 6, 2) AS INTEGER),
+        transaction_type,
+        category,
+        SUM(amount),
+        COUNT(*)
+    FROM transactions
+    GROUP BY 1, 2, 3, 4
+    """,
+)
+
+INIT_DATA_VERSION = "INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)"
+
+# Gives the database its random identity, keeps an existing one
+INIT_DATABASE_ID = (
+    "UPDATE data_version SET database_id = lower(hex(randomblob(16))) "
+    "WHERE id = 1 AND database_id IS NULL"
+)
+
+_BUMP_DATA_VERSION = "UPDATE data_version SET version = version + 1 WHERE id = 1;"
+
+DATA_VERSION_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_insert_data_version
+    AFTER INSERT ON transactions
+    BEGIN
+        {_BUMP_DATA_VERSION}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_delete_data_version
+    AFTER DELETE ON transactions
+    BEGIN
+        {_BUMP_DATA_VERSION}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_update_data_version
+    AFTER UPDATE ON transactions
+    BEGIN
+        {_BUMP_DATA_VERSION}
+    END
+    """,
+)
+
+# Full text index of transaction names and categories, searched by TransactionSearchModel.
+# It has external content: the text stays in transactions, only the index is stored.
+# Only created if SQLite has FTS5 (see db._add_transactions_search), search falls back to LIKE.
+CREATE_TRANSACTIONS_SEARCH = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_search USING fts5(
+        name,
+        category,
+        content='transactions',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+_ADD_TO_TRANSACTIONS_SEARCH = """
+    INSERT INTO transactions_search (rowid, name, category)
+    VALUES (NEW.id, NEW.name, NEW.category);
+"""
+
+_REMOVE_FROM_TRANSACTIONS_SEARCH = """
+    INSERT INTO transactions_search (transactions_search, rowid, name, category)
+    VALUES ('delete', OLD.id, OLD.name, OLD.category);
+"""
+
+TRANSACTIONS_SEARCH_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_insert_search
+    AFTER INSERT ON transactions
+    BEGIN
+        {_ADD_TO_TRANSACTIONS_SEARCH}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_delete_search
+    AFTER DELETE ON transactions
+    BEGIN
+        {_REMOVE_FROM_TRANSACTIONS_SEARCH}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_update_search
+    AFTER UPDATE OF name, category ON transactions
+    BEGIN
+        {_REMOVE_FROM_TRANSACTIONS_SEARCH}
+        {_ADD_TO_TRANSACTIONS_SEARCH}
+    END
+    """,
+)
+
+# Reindexes all transactions, used to populate transactions_search for existing data
+REBUILD_TRANSACTIONS_SEARCH = (
+    "INSERT INTO transactions_search (transactions_search) VALUES ('rebuild')"
+)
+
+# Create the triggers once all tables exist (create_all does not guarantee table order)
+for _statement in (
+    *MONTHLY_TOTALS_TRIGGERS,
+    INIT_DATA_VERSION,
+    INIT_DATABASE_ID,
+    *DATA_VERSION_TRIGGERS,
+):
+    event.listen(Base.metadata, "after_create", DDL(_statement))
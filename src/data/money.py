@@ -0,0 +1,49 @@
+"""Money representation. Amounts are stored as integer cents and exposed as Decimal to the ORM."""
+
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Integer
+from sqlalchemy.types import TypeDecorator
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Dialect
+
+CENTS_PER_UNIT = 100
+
+
+def to_cents(amount: Decimal) -> int:
+    """Convert an amount to integer cents, rounding half up to the nearest cent."""
+    return int((amount * CENTS_PER_UNIT).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> Decimal:
+    """Convert integer cents to an exact Decimal amount with two decimal places."""
+    return Decimal(cents).scaleb(-2)
+
+
+class Money(TypeDecorator[Decimal]):
+    """Integer cents column mapped to a Decimal attribute.
+
+    SQL aggregates over Money columns are exact integer sums. Use type_coerce(column, Integer) to
+    read raw cents without creating a Decimal per row.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value: Decimal | None, dialect: Dialect) -> int | None:  # noqa: ARG002
+        """Convert a Decimal amount to cents before it is sent to the database."""
+        if value is None:
+            return None
+
+        return to_cents(Decimal(value))
+
+    def process_result_value(self, value: int | None, dialect: Dialect) -> Decimal | None:  # noqa: ARG002
+        """Convert cents read from the database to a Decimal amount."""
+        if value is None:
+            return None
+
+        return from_cents(value)
@@ -3,7 +3,8 @@ import datetime
 import logging
 from datetime import date
 
-from sqlalchemy import select
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.orm import Session
 
 from data import db
 from data.models import MonthlyTransaction, Transaction
@@ -19,6 +20,90 @@ class GenerationError(Exception):
         super().__init__("Failed to generate transactions for monthly transaction.")
 
 
+def occurrence_dates(day_of_month: int, first_date: date, last_date: date) -> list[date]:
+    """Get the dates a monthly transaction falls on between first_date and last_date (inclusive).
+
+    day_of_month is clamped to the length of each month, e.g. 31 becomes 30 in April.
+    """
+    dates = []
+    year, month = first_date.year, first_date.month
+
+    while (year, month) <= (last_date.year, last_date.month):
+        # Month has 30 days but day of month is 31, adjust to last day of month
+        occurrence = date(year, month, min(day_of_month, calendar.monthrange(year, month)[1]))
+
+        if first_date <= occurrence <= last_date:
+            dates.append(occurrence)
+
+        # Advance to next month
+        year, month = (year + 1, 1) if month == MONTHS_IN_YEAR else (year, month + 1)
+
+    return dates
+
+
+def _materialize(
+    session: Session,
+    monthly_transaction: MonthlyTransaction,
+    current_date: date,
+) -> list[date]:
+    """Insert the missing transactions of a monthly transaction up until current_date.
+
+    Updates generated_until, does not commit. Returns the execution dates of the new transactions.
+    """
+    # Dates up until generated_until (inclusive) have already been generated. start_date may have
+    # been moved past generated_until since, nothing is generated before it.
+    first_date = (
+        max(
+            monthly_transaction.generated_until + datetime.timedelta(days=1),
+            monthly_transaction.start_date,
+        )
+        if monthly_transaction.generated_until
+        else monthly_transaction.start_date
+    )
+    last_date = min(current_date, monthly_transaction.end_date or current_date)
+
+    dates = occurrence_dates(monthly_transaction.day_of_month, first_date, last_date)
+
+    if dates:
+        # Insert all transactions with a single executemany instead of a flush per transaction
+        session.execute(
+            insert(Transaction),
+            [
+                {
+                    "name": monthly_transaction.name,
+                    "amount": monthly_transaction.amount,
+                    "transaction_type": monthly_transaction.transaction_type,
+                    "execution_date": execution_date,
+                    "category": monthly_transaction.category,
+                    "monthly_transaction_id": monthly_transaction.id,
+                }
+                for execution_date in dates
+            ],
+        )
+
+    if (
+        monthly_transaction.generated_until is None
+        or last_date > monthly_transaction.generated_until
+    ):
+        monthly_transaction.generated_until = last_date
+
+    return dates
+
+
+def _creation_info(monthly_transaction: MonthlyTransaction, dates: list[date]) -> str | None:
+    """Summarize the transactions generated for a monthly transaction for logging."""
+    if not dates:
+        return None
+
+    return (
+        f"{len(dates)} transactions ({dates[0]} to {dates[-1]}) for monthly transaction with "
+        f"Id: {monthly_transaction.id}, Name: {monthly_transaction.name}, "
+        f"Amount: {monthly_transaction.amount}, "
+        f"Type: {monthly_transaction.transaction_type.value}, "
+        f"Category: {monthly_transaction.category}"
+    )
+
+
 def gen_transactions(monthly_transaction_id: int) -> None:
     """Generate transactions for a given monthly transaction by ID.
 
@@ -26,85 +111,24 @@ def gen_transactions(monthly_transaction_id: int) -> None:
     Transactions previously generated will not be generated again.
     """
     try:
-        with db.create_session() as session:
+        with db.thread_session() as session:
             # Fetch monthly transaction
             stmt = select(MonthlyTransaction).where(MonthlyTransaction.id == monthly_transaction_id)
             monthly_transaction = session.scalars(stmt).one()
 
-            # Check if the monthly transaction is already fully generated (based on current date)
-
             current_date = datetime.datetime.now().astimezone().date()
 
-            generated_until = monthly_transaction.generated_until or monthly_transaction.start_date
-            end_date = monthly_transaction.end_date or current_date
-
-            if generated_until in (current_date, end_date) and monthly_transaction.generated_until:
-                # No new transactions to generate:
-                return
-
-            # Generate transactions
-
-            loop_conclusion = min(current_date, end_date)
-            loop_log = []
-
-            while generated_until <= loop_conclusion:
-                # Get day of month while accounting for month length
-                # Month has 30 days but day of month is 31, adjust to last day of month
-                day_of_month = min(
-                    monthly_transaction.day_of_month,
-                    calendar.monthrange(generated_until.year, generated_until.month)[1],
-                )
-
-                month_gen_date = date(generated_until.year, generated_until.month, day_of_month)
-
-                if month_gen_date <= loop_conclusion and month_gen_date >= generated_until:
-                    # Create transaction for this month
-                    transaction = Transaction(
-                        name=monthly_transaction.name,
-                        amount=monthly_transaction.amount,
-                        transaction_type=monthly_transaction.transaction_type,
-                        execution_date=month_gen_date,
-                        category=monthly_transaction.category,
-                        monthly_transaction_id=monthly_transaction.id,
-                    )
-                    session.add(transaction)
-
-                    # Populate id, format log string and append it to loop_log
-
-                    session.flush()  # Slows things down but I would not consider this "hot" code
-
-                    loop_log.append(
-                        f"Created transaction: "
-                        f"Name: {transaction.name}, amount {transaction.amount}, "
-                        f"transaction_type: {transaction.transaction_type.value}, "
-                        f"execution_date: {transaction.execution_date}, "
-                        f"category: {transaction.category}, "
-                        f"monthly_transaction_id: {transaction.monthly_transaction_id}, ",
-                    )
-
-                # Set generated_until to next month
-
-                next_month = (
-                    generated_until.month + 1 if generated_until.month < MONTHS_IN_YEAR else 1
-                )
-                next_year = (
-                    generated_until.year
-                    if generated_until.month < MONTHS_IN_YEAR
-                    else generated_until.year + 1
-                )
-
-                generated_until = date(next_year, next_month, 1)
-
-            # Update generated_until in monthly transaction
-            monthly_transaction.generated_until = loop_conclusion
+            dates = _materialize(session, monthly_transaction, current_date)
+
+            # Gather data for logging (attributes expire on commit)
+            creation_info = _creation_info(monthly_transaction, dates)
 
             # Commit the session
             session.commit()
 
-            # Log the transactions created
-            if len(loop_log) > 0:
-                for transaction_creation in loop_log:
-                    logger.info(transaction_creation)
+        # Log a summary of the transactions created
+        if creation_info:
+            logger.info("Created %s", creation_info)
 
     except Exception as err:
         logger.exception(
@@ -114,19 +138,67 @@ def gen_transactions(monthly_transaction_id: int) -> None:
         raise GenerationError from err
 
 
-def gen_transactions_for_all() -> None:
+def gen_transactions_for_all() -> set[tuple[int, int]]:
     """Generate missing transactions for all monthly transactions in the DB.
 
     Will generate missing transactions up until current date.
     Transactions previously generated will not be generated again.
+
+    Only monthly transactions that are behind the current date are loaded, and all of them are
+    generated within a single session and commit.
+
+    Returns the (year, month) pairs that received new transactions.
     """
+    affected_months: set[tuple[int, int]] = set()
+
     try:
-        with db.create_session() as session:
-            stmt = select(MonthlyTransaction)
+        current_date = datetime.datetime.now().astimezone().date()
+
+        with db.thread_session() as session:
+            # Select monthly transactions with occurrences due, that have not been generated yet
+            stmt = select(MonthlyTransaction).where(
+                MonthlyTransaction.start_date <= current_date,
+                or_(
+                    MonthlyTransaction.generated_until.is_(None),
+                    and_(
+                        MonthlyTransaction.generated_until < current_date,
+                        or_(
+                            MonthlyTransaction.end_date.is_(None),
+                            MonthlyTransaction.generated_until < MonthlyTransaction.end_date,
+                        ),
+                    ),
+                ),
+            )
 
             monthly_transactions = session.scalars(stmt).all()
 
+            creation_infos = []
+            generated_months: set[tuple[int, int]] = set()
+
             for monthly_transaction in monthly_transactions:
-                gen_transactions(monthly_transaction.id)
+                dates = _materialize(session, monthly_transaction, current_date)
+
+                # Gather data for logging (attributes expire on commit)
+                creation_info = _creation_info(monthly_transaction, dates)
+                if creation_info:
+                    creation_infos.append(creation_info)
+
+                generated_months.update((d.year, d.month) for d in dates)
+
+            session.commit()
+
+        affected_months = generated_months
+
+        # Log a summary of the transactions created
+        logger.info(
+            "Generation caught up %d monthly transactions that were due",
+            len(monthly_transactions),
+        )
+
+        for creation_info in creation_infos:
+            logger.info("Created %s", creation_info)
+
     except Exception:
         logger.exception("Failed to generate transactions for monthly transactions.")
+
+    return affected_months
@@ -0,0 +1,307 @@
+"""Chart aggregations pushed down to SQLite.
+
+Date filtering and grouping run in SQL using range predicates on indexed columns, only the grouped
+rows are read back. Results are small int64 arrays of cents, indexed by day/month.
+"""
+
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import (
+    Integer,
+    SQLColumnExpression,
+    and_,
+    case,
+    cast,
+    func,
+    or_,
+    select,
+    type_coerce,
+)
+
+from data import db
+from data.models import MonthlyTotal, Transaction, TransactionType
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+    from sqlalchemy.orm import InstrumentedAttribute, Session
+    from sqlalchemy.sql.elements import ColumnElement
+
+MONTHS_IN_YEAR = 12
+
+
+@dataclass(frozen=True)
+class IncomeExpenseSeries:
+    """Income and expense totals in cents, one element per day or month (index 0 is the 1st)."""
+
+    income: npt.NDArray[np.int64]
+    expense: npt.NDArray[np.int64]
+
+
+@dataclass(frozen=True)
+class CategoryTotals:
+    """Totals in cents per category, sorted by category name."""
+
+    categories: list[str]
+    totals: npt.NDArray[np.int64]
+
+
+@dataclass(frozen=True)
+class DateSeries:
+    """Amounts in cents over a date range, one element per day or month (first day of month)."""
+
+    dates: npt.NDArray[np.datetime64]
+    values: npt.NDArray[np.int64]
+
+
+def _month_range(year: int, month: int) -> tuple[date, date]:
+    """Get the first day of the month and the first day of the following month."""
+    if month == MONTHS_IN_YEAR:
+        return date(year, month, 1), date(year + 1, 1, 1)
+
+    return date(year, month, 1), date(year, month + 1, 1)
+
+
+def _cents_sum(column: SQLColumnExpression[Decimal]) -> ColumnElement[int]:
+    """SUM over a Money column, read back as raw integer cents instead of Decimal."""
+    return type_coerce(func.sum(column), Integer)
+
+
+def _net_cents_sum(
+    column: SQLColumnExpression[Decimal],
+    transaction_type: InstrumentedAttribute[TransactionType],
+) -> ColumnElement[int]:
+    """SUM of income minus expense over a Money column, in cents. 0 instead of NULL."""
+    signed = case((transaction_type == TransactionType.INCOME, column), else_=-column)
+    return type_coerce(func.coalesce(func.sum(signed), 0), Integer)
+
+
+def _month_index(year: int, month: int) -> int:
+    """Count the months since year 0, for month arithmetic."""
+    return year * MONTHS_IN_YEAR + month - 1
+
+
+def _before_month(year: int, month: int) -> ColumnElement[bool]:
+    """Rollup rows of the months before year-month (range on the rollup primary key)."""
+    return or_(
+        MonthlyTotal.year < year,
+        and_(MonthlyTotal.year == year, MonthlyTotal.month < month),
+    )
+
+
+@dataclass(frozen=True)
+class DashboardTotals:
+    """Everything the dashboard charts of a year plot, read in a single transaction."""
+
+    daily: IncomeExpenseSeries  # Of the selected month
+    monthly: IncomeExpenseSeries
+    yearly: tuple[int, int]  # Income, expense
+    expense_categories: CategoryTotals
+
+
+def _has_transactions(session: Session) -> bool:
+    return session.scalars(select(MonthlyTotal.year).limit(1)).first() is not None
+
+
+def has_transactions() -> bool:
+    """Check if there is at least one transaction in the database."""
+    with db.read_session() as session:
+        return _has_transactions(session)
+
+
+def _daily_totals(session: Session, year: int, month: int) -> IncomeExpenseSeries:
+    start, end = _month_range(year, month)
+    days_in_month = calendar.monthrange(year, month)[1]
+
+    # Dates are stored as ISO strings (YYYY-MM-DD), the day is characters 9-10
+    day = cast(func.substr(Transaction.execution_date, 9, 2), Integer)
+
+    stmt = (
+        select(day, Transaction.transaction_type, _cents_sum(Transaction.amount))
+        .where(Transaction.execution_date >= start, Transaction.execution_date < end)
+        .group_by(day, Transaction.transaction_type)
+    )
+
+    income = np.zeros(days_in_month, dtype=np.int64)
+    expense = np.zeros(days_in_month, dtype=np.int64)
+
+    for row_day, transaction_type, total in session.execute(stmt):
+        target = income if transaction_type == TransactionType.INCOME else expense
+        target[row_day - 1] = total
+
+    return IncomeExpenseSeries(income, expense)
+
+
+def _monthly_totals(session: Session, year: int) -> IncomeExpenseSeries:
+    stmt = (
+        select(MonthlyTotal.month, MonthlyTotal.transaction_type, _cents_sum(MonthlyTotal.total))
+        .where(MonthlyTotal.year == year)
+        .group_by(MonthlyTotal.month, MonthlyTotal.transaction_type)
+    )
+
+    income = np.zeros(MONTHS_IN_YEAR, dtype=np.int64)
+    expense = np.zeros(MONTHS_IN_YEAR, dtype=np.int64)
+
+    for month, transaction_type, total in session.execute(stmt):
+        target = income if transaction_type == TransactionType.INCOME else expense
+        target[month - 1] = total
+
+    return IncomeExpenseSeries(income, expense)
+
+
+def _yearly_totals(session: Session, year: int) -> tuple[int, int]:
+    stmt = (
+        select(MonthlyTotal.transaction_type, _cents_sum(MonthlyTotal.total))
+        .where(MonthlyTotal.year == year)
+        .group_by(MonthlyTotal.transaction_type)
+    )
+
+    totals = dict(session.execute(stmt).tuples().all())
+
+    return totals.get(TransactionType.INCOME, 0), totals.get(TransactionType.EXPENSE, 0)
+
+
+def _category_totals(
+    session: Session,
+    year: int,
+    transaction_type: TransactionType,
+) -> CategoryTotals:
+    stmt = (
+        select(MonthlyTotal.category, _cents_sum(MonthlyTotal.total))
+        .where(MonthlyTotal.year == year, MonthlyTotal.transaction_type == transaction_type)
+        .group_by(MonthlyTotal.category)
+        .order_by(MonthlyTotal.category)
+    )
+
+    rows = session.execute(stmt).tuples().all()
+
+    return CategoryTotals(
+        [category for category, _ in rows],
+        np.fromiter((total for _, total in rows), dtype=np.int64, count=len(rows)),
+    )
+
+
+def daily_totals(year: int, month: int) -> IncomeExpenseSeries:
+    """Get income and expense totals per day of a month.
+
+    Reads only the transactions of the month (range scan on the execution_date index).
+    """
+    with db.read_session() as session:
+        return _daily_totals(session, year, month)
+
+
+def monthly_totals(year: int) -> IncomeExpenseSeries:
+    """Get income and expense totals per month of a year (from the monthly_totals rollup)."""
+    with db.read_session() as session:
+        return _monthly_totals(session, year)
+
+
+def yearly_totals(year: int) -> tuple[int, int]:
+    """Get the total income and expense of a year in cents (from the monthly_totals rollup)."""
+    with db.read_session() as session:
+        return _yearly_totals(session, year)
+
+
+def category_totals(year: int, transaction_type: TransactionType) -> CategoryTotals:
+    """Get the totals per category of a year for a transaction type (from the rollup)."""
+    with db.read_session() as session:
+        return _category_totals(session, year, transaction_type)
+
+
+def dashboard_totals(year: int, month: int) -> DashboardTotals | None:
+    """Get the data of all dashboard charts of a year, daily totals are for month.
+
+    Returns None if the database has no transactions. The yearly totals are summed from the
+    monthly ones instead of being queried again.
+    """
+    with db.read_session() as session:
+        if not _has_transactions(session):
+            return None
+
+        monthly = _monthly_totals(session, year)
+
+        return DashboardTotals(
+            daily=_daily_totals(session, year, month),
+            monthly=monthly,
+            yearly=(int(monthly.income.sum()), int(monthly.expense.sum())),
+            expense_categories=_category_totals(session, year, TransactionType.EXPENSE),
+        )
+
+
+def monthly_net_flow(start: date, end: date) -> DateSeries:
+    """Get the net flow (income - expense) per month, for the months of start to end included.
+
+    Read from the monthly_totals rollup, ten years are at most 120 grouped rows.
+    """
+    first = _month_index(start.year, start.month)
+    month_count = max(0, _month_index(end.year, end.month) - first + 1)
+    after_end = divmod(first + month_count, MONTHS_IN_YEAR)  # Year and month - 1
+
+    stmt = (
+        select(
+            MonthlyTotal.year,
+            MonthlyTotal.month,
+            _net_cents_sum(MonthlyTotal.total, MonthlyTotal.transaction_type),
+        )
+        .where(
+            ~_before_month(start.year, start.month),
+            _before_month(after_end[0], after_end[1] + 1),
+        )
+        .group_by(MonthlyTotal.year, MonthlyTotal.month)
+    )
+
+    values = np.zeros(month_count, dtype=np.int64)
+
+    with db.read_session() as session:
+        for year, month, total in session.execute(stmt):
+            values[_month_index(year, month) - first] = total
+
+    dates = np.datetime64(f"{start.year:04d}-{start.month:02d}", "M") + np.arange(month_count)
+
+    return DateSeries(dates.astype("datetime64[D]"), values)
+
+
+def daily_balance(start: date, end: date) -> DateSeries:
+    """Get the balance (all income - all expenses so far) at the end of every day of start to end.
+
+    The opening balance is summed from the rollup for whole months and from transactions for the
+    days of the start month before start, then only the transactions of the range are grouped.
+    """
+    day_count = max(0, (end - start).days + 1)
+    month_start = start.replace(day=1)
+
+    opening_months = select(
+        _net_cents_sum(MonthlyTotal.total, MonthlyTotal.transaction_type),
+    ).where(_before_month(start.year, start.month))
+
+    opening_days = select(
+        _net_cents_sum(Transaction.amount, Transaction.transaction_type),
+    ).where(Transaction.execution_date >= month_start, Transaction.execution_date < start)
+
+    daily_net = (
+        select(
+            Transaction.execution_date,
+            _net_cents_sum(Transaction.amount, Transaction.transaction_type),
+        )
+        .where(Transaction.execution_date >= start, Transaction.execution_date <= end)
+        .group_by(Transaction.execution_date)
+    )
+
+    values = np.zeros(day_count, dtype=np.int64)
+
+    with db.read_session() as session:
+        opening = session.scalar(opening_months) + session.scalar(opening_days)
+
+        for execution_date, total in session.execute(daily_net):
+            values[(execution_date - start).days] = total
+
+    dates = np.datetime64(start, "D") + np.arange(day_count)
+
+    return DateSeries(dates, opening + np.cumsum(values))
@@ -0,0 +1,291 @@
+"""Chart cache of rendered png images, kept in memory and persisted in the graphs folder.
+
+A cached chart is named after everything its content depends on (chart kind, period, style, the
+database identity and its data version), so a cached chart is never stale and stays valid across
+restarts. Charts of a replaced or recreated database never match, they are evicted eventually.
+Each rendered size of a chart is cached separately.
+Charts are served from memory. The graphs folder is only read for charts that are not in memory
+(e.g. after a restart), and rendered charts are written to it in the background.
+Least recently used charts are evicted once the memory cache grows above MEMORY_SIZE_BUDGET and
+the folder grows above CACHE_SIZE_BUDGET. The folder is then trimmed to EVICTION_TARGET of its
+budget, its size is kept as a running total, so it is only listed when charts are evicted.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import math
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from utility.save import data_folder_path
+
+# create logger for module
+logger = logging.getLogger(__name__)
+
+MEMORY_SIZE_BUDGET = 16 * 1024 * 1024  # Bytes
+CACHE_SIZE_BUDGET = 32 * 1024 * 1024  # Bytes
+EVICTION_TARGET = 0.75  # Share of CACHE_SIZE_BUDGET left after evicting from the graphs folder
+_CHART_SUFFIX = ".png"
+_TEMP_SUFFIX = ".tmp"
+
+
+class _MemoryCache:
+    """Least recently used png images by chart name, safe to use from any thread."""
+
+    def __init__(self, budget: int) -> None:
+        self._lock = threading.Lock()
+        self._charts: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._budget = budget
+
+    def get(self, name: str) -> bytes | None:
+        with self._lock:
+            data = self._charts.get(name)
+
+            if data is not None:
+                self._charts.move_to_end(name)
+
+            return data
+
+    def get_largest(self, prefix: str) -> bytes | None:
+        """Get the largest image of the names starting with prefix."""
+        with self._lock:
+            matches = [name for name in self._charts if name.startswith(prefix)]
+
+            if not matches:
+                return None
+
+            name = max(matches, key=lambda name: len(self._charts[name]))
+            self._charts.move_to_end(name)
+            return self._charts[name]
+
+    def put(self, name: str, data: bytes) -> None:
+        with self._lock:
+            old_data = self._charts.pop(name, None)
+            self._size -= len(old_data) if old_data is not None else 0
+
+            self._charts[name] = data
+            self._size += len(data)
+
+            # Keep at least the new chart, even if it is larger than the budget
+            while self._size > self._budget and len(self._charts) > 1:
+                _, evicted = self._charts.popitem(last=False)
+                self._size -= len(evicted)
+
+
+_memory_cache = _MemoryCache(MEMORY_SIZE_BUDGET)
+
+
+class _Writer:
+    """Background thread that persists rendered charts, started on first use."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def submit(self, sized_name: str, data: bytes) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="chart-cache-writer",
+                )
+
+            self._executor.submit(_write, sized_name, data)
+
+    def shutdown(self) -> None:
+        """Wait for the pending writes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+_writer = _Writer()
+
+
+class _DiskUsage:
+    """Running total of the bytes used by the charts in the graphs folder.
+
+    Counted on first use, then updated as charts are written and evicted.
+    """
+
+    def __init__(self, budget: int) -> None:
+        self._lock = threading.Lock()
+        self._used: int | None = None
+        self._budget = budget
+
+    def add(self, size: int) -> None:
+        """Count size more bytes (written to the folder), evict charts if above the budget."""
+        with self._lock:
+            if self._used is None:
+                self._used = evict(self._budget)  # Lists the folder, which includes the new chart
+            else:
+                self._used += size
+
+            if self._used > self._budget:
+                self._used = evict(round(self._budget * EVICTION_TARGET))
+
+    def trim(self) -> None:
+        """Recount the folder, evict charts if above the budget."""
+        with self._lock:
+            self._used = evict(self._budget)
+
+
+_disk_usage = _DiskUsage(CACHE_SIZE_BUDGET)
+
+
+def cache_folder() -> Path:
+    """Get the folder cached charts are stored in, creating it if needed."""
+    folder = data_folder_path() / "graphs"
+    folder.mkdir(exist_ok=True)
+    return folder
+
+
+def chart_name(kind: str, *key: object) -> str:
+    """Get the cache name of a chart from its kind and the values its content depends on."""
+    digest = hashlib.sha256(repr((kind, *key)).encode()).hexdigest()[:16]
+    return f"{kind}-{digest}"
+
+
+def _sized_name(name: str, size: tuple[int, int]) -> str:
+    return f"{name}-{size[0]}x{size[1]}"
+
+
+def _chart_path(sized_name: str) -> Path:
+    return cache_folder() / f"{sized_name}{_CHART_SUFFIX}"
+
+
+def _read(sized_name: str, path: Path) -> bytes | None:
+    """Read a persisted chart into the memory cache."""
+    try:
+        data = path.read_bytes()
+        os.utime(path)  # Mark as recently used
+    except FileNotFoundError:
+        return None
+
+    _memory_cache.put(sized_name, data)
+    return data
+
+
+def get(name: str, size: tuple[int, int]) -> bytes | None:
+    """Get a cached png image of a chart at a size (pixels), or None if it is not cached."""
+    sized_name = _sized_name(name, size)
+    data = _memory_cache.get(sized_name)
+
+    if data is not None:
+        return data
+
+    return _read(sized_name, _chart_path(sized_name))
+
+
+def get_any(name: str) -> bytes | None:
+    """Get the largest cached png image of a chart at any size, or None if it is not cached."""
+    data = _memory_cache.get_largest(f"{name}-")
+
+    if data is not None:
+        return data
+
+    # Largest first, by the size in the file name ("{name}-{width}x{height}.png")
+    paths = sorted(
+        cache_folder().glob(f"{name}-*{_CHART_SUFFIX}"),
+        key=lambda path: math.prod(map(int, path.stem.rpartition("-")[2].split("x"))),
+        reverse=True,
+    )
+
+    for path in paths:
+        data = _read(path.stem, path)
+
+        if data is not None:
+            return data
+
+    return None
+
+
+def put(name: str, size: tuple[int, int], data: bytes) -> None:
+    """Cache a png image of a chart at a size. It is available at once and persisted later."""
+    sized_name = _sized_name(name, size)
+    _memory_cache.put(sized_name, data)
+    _writer.submit(sized_name, data)
+
+
+def _write(sized_name: str, data: bytes) -> None:
+    """Write a chart to a temporary file and move it into place, then evict above the budget.
+
+    Readers never see a partially written file.
+    """
+    path = _chart_path(sized_name)
+    fd, temp_name = tempfile.mkstemp(suffix=_TEMP_SUFFIX, dir=path.parent)
+    temp_path = Path(temp_name)
+
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+
+        # A chart rendered twice (e.g. by concurrent requests) replaces its file
+        replaced_size = 0
+        with contextlib.suppress(FileNotFoundError):
+            replaced_size = path.stat().st_size
+
+        temp_path.replace(path)
+        _disk_usage.add(len(data) - replaced_size)
+    except OSError:
+        logger.exception("Failed to persist chart %s", sized_name)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def evict(budget: int = CACHE_SIZE_BUDGET) -> int:
+    """Delete the least recently used charts until the graphs folder fits in budget bytes.
+
+    Returns the bytes used by the charts that are left.
+    """
+    charts = []
+
+    for file_path in cache_folder().glob(f"*{_CHART_SUFFIX}"):
+        with contextlib.suppress(FileNotFoundError):
+            charts.append((file_path.stat(), file_path))
+
+    # Most recently used first
+    charts.sort(key=lambda chart: chart[0].st_mtime, reverse=True)
+
+    used = 0
+    kept = 0
+    evicted = 0
+
+    for stat, file_path in charts:
+        used += stat.st_size
+
+        if used > budget:
+            with contextlib.suppress(FileNotFoundError, PermissionError):
+                file_path.unlink()
+                evicted += 1
+                continue
+
+        kept += stat.st_size
+
+    if evicted:
+        logger.debug("Evicted %d charts from the chart cache", evicted)
+
+    return kept
+
+
+def remove_temp_files() -> None:
+    """Delete leftover temporary files of interrupted writes."""
+    for file_path in cache_folder().glob(f"*{_TEMP_SUFFIX}"):
+        with contextlib.suppress(FileNotFoundError, PermissionError):
+            file_path.unlink()
+
+
+def close() -> None:
+    """Finish persisting rendered charts and trim the graphs folder to its size budget."""
+    _writer.shutdown()
+    remove_temp_files()
+    _disk_usage.trim()
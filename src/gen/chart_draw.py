@@ -0,0 +1,452 @@
+"""Chart figures and the drawing of charts from aggregated data.
+
+Also the module render processes work with (see graph_gen._ProcessPool): it only imports
+matplotlib and numpy, and drawn data is passed as plain values in currency units, so render
+processes start without loading the database or Qt modules.
+"""
+
+from __future__ import annotations
+
+import functools
+import io
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import matplotlib as mpl
+import numpy as np
+import numpy.typing as npt
+from matplotlib import dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Wedge
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from matplotlib.axes import Axes
+    from matplotlib.collections import PolyCollection
+    from matplotlib.text import Text
+
+logging.getLogger("matplotlib.font_manager").setLevel(logging.ERROR)
+
+FIGURE_SIZE = (6, 4)  # Inches, at DEFAULT_SIZE
+BASE_DPI = 100
+DEFAULT_SIZE = (600, 400)  # Pixels, FIGURE_SIZE at BASE_DPI
+MAX_DAYS_IN_MONTH = 31
+MONTHS_IN_YEAR = 12
+DATABASE_EMPTY_MESSAGE = "Database empty. Please add data first."
+NO_DATA_MESSAGE = "No data available"
+
+# Income and expense amounts per slot (day or month), in currency units
+IncomeExpense = tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]
+
+
+class _Chart:
+    """Figure laid out once and reused by every render of a chart kind.
+
+    Renders only update the data of existing artists. Figures are drawn with the Agg canvas
+    directly (no pyplot), a figure is only touched while holding its lock. A figure is resized
+    to the render size before each render, scaling the dpi with the width so text keeps its size
+    relative to the chart.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.figure = Figure(figsize=FIGURE_SIZE)
+        FigureCanvasAgg(self.figure)
+        self._layout_key: object = None
+
+    def _resize(self, size: tuple[int, int]) -> None:
+        width, height = size
+        dpi = BASE_DPI * width / DEFAULT_SIZE[0]
+
+        self.figure.set_dpi(dpi)
+        self.figure.set_size_inches(width / dpi, height / dpi)
+
+    def _fit_layout(self, axes: Axes) -> None:
+        """Re-run tight_layout only when the aspect ratio or the widest y tick label changes."""
+        ticks = axes.yaxis.get_major_locator()()
+        labels = axes.yaxis.get_major_formatter().format_ticks(ticks)
+        layout_key = (tuple(self.figure.get_size_inches()), max(map(len, labels), default=0))
+
+        if layout_key != self._layout_key:
+            self.figure.tight_layout()
+            self._layout_key = layout_key
+
+    def save(self) -> bytes:
+        """Rasterize the figure to a png image in memory."""
+        buffer = io.BytesIO()
+        self.figure.savefig(buffer, format="png", dpi=self.figure.dpi)
+        return buffer.getvalue()
+
+
+class _MessageChart(_Chart):
+    """Title and a centered message, used when there is nothing to plot."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        axes = self.figure.add_subplot()
+        axes.axis("off")
+
+        self._title = axes.set_title("", fontsize=12)
+        self._message = axes.text(0.5, 0.5, "", ha="center", va="center", fontsize=10)
+
+    def render(self, title: str, message: str, size: tuple[int, int]) -> bytes:
+        """Render the message chart to a png image of size."""
+        with self.lock:
+            self._resize(size)
+            self._title.set_text(title)
+            self._message.set_text(message)
+            return self.save()
+
+
+class _IncomeExpenseBarChart(_Chart):
+    """Grouped income and expense bars for up to slot_count periods (days or months)."""
+
+    def __init__(self, slot_count: int) -> None:
+        super().__init__()
+        self.axes = self.figure.add_subplot()
+        self.bar_width = 0.35
+
+        index = np.arange(1, slot_count + 1)
+        zeros = np.zeros(slot_count)
+
+        self._income = self.axes.bar(
+            index,
+            zeros,
+            self.bar_width,
+            label="Income",
+            color="green",
+        )
+        self._expense = self.axes.bar(
+            index + self.bar_width,
+            zeros,
+            self.bar_width,
+            label="Expense",
+            color="red",
+        )
+
+        self.axes.set_ylabel("Amount (€)")
+        self.axes.grid(visible=True, axis="y", linestyle="--", alpha=0.7)
+
+    def render(
+        self,
+        title: str,
+        income: npt.NDArray[np.float64],
+        expense: npt.NDArray[np.float64],
+        size: tuple[int, int],
+    ) -> bytes:
+        """Update the bar heights and render the chart to a png image of size.
+
+        Slots past len(income) are hidden.
+        """
+        with self.lock:
+            self._resize(size)
+            for bars, heights in ((self._income, income), (self._expense, expense)):
+                for i, bar in enumerate(bars):
+                    bar.set_visible(i < len(heights))
+                    bar.set_height(heights[i] if i < len(heights) else 0)
+
+            self.axes.set_title(title, fontsize=12)
+            self.axes.relim(visible_only=True)
+            self.axes.autoscale_view()
+
+            self._fit_layout(self.axes)
+            return self.save()
+
+
+class _DailyChart(_IncomeExpenseBarChart):
+    def __init__(self) -> None:
+        super().__init__(MAX_DAYS_IN_MONTH)
+
+        self.axes.set_xlabel("Day", fontsize=10)
+        self.axes.yaxis.label.set_fontsize(10)
+        self.axes.tick_params(axis="x", labelsize=8, labelrotation=45)
+        self.axes.tick_params(axis="y", labelsize=8)
+        self.axes.legend(fontsize=8, loc="upper left", bbox_to_anchor=(1, 1))
+
+
+class _MonthlyChart(_IncomeExpenseBarChart):
+    def __init__(self) -> None:
+        super().__init__(MONTHS_IN_YEAR)
+
+        months = range(1, MONTHS_IN_YEAR + 1)
+        self.axes.set_xlabel("Month")
+        self.axes.set_xticks([i + self.bar_width / 2 for i in months], [str(i) for i in months])
+        self.axes.legend()
+
+
+class _TotalsChart(_Chart):
+    """Total income and expense bars."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.axes = self.figure.add_subplot()
+        self._bars = self.axes.bar(["Income", "Expenses"], [0, 0], color=["green", "red"])
+
+        self.axes.set_ylabel("Amount (€)")
+        self.axes.grid(axis="y", linestyle="--", alpha=0.7)
+
+    def render(self, title: str, income: float, expense: float, size: tuple[int, int]) -> bytes:
+        """Update the bar heights and render the chart to a png image of size."""
+        with self.lock:
+            self._resize(size)
+            self._bars[0].set_height(income)
+            self._bars[1].set_height(expense)
+
+            self.axes.set_title(title)
+            self.axes.relim()
+            self.axes.autoscale_view()
+
+            self._fit_layout(self.axes)
+            return self.save()
+
+
+class _PieChart(_Chart):
+    """Pie chart with a label and a percentage per wedge. Wedges are reused between renders."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.axes = self.figure.add_subplot()
+        self.axes.set(frame_on=False, xticks=[], yticks=[], xlim=(-1.25, 1.25), ylim=(-1.25, 1.25))
+        self.axes.set_aspect("equal")  # Ensure pie is a circle
+
+        self._start_angle = 140
+        self._label_distance = 1.1
+        self._percentage_distance = 0.8
+
+        self._wedges: list[Wedge] = []
+        self._labels: list[Text] = []
+        self._percentages: list[Text] = []
+
+    def _ensure_wedges(self, count: int) -> None:
+        while len(self._wedges) < count:
+            wedge = Wedge((0, 0), 1, 0, 0, clip_on=False)
+            self.axes.add_patch(wedge)
+
+            self._wedges.append(wedge)
+            self._labels.append(
+                self.axes.text(
+                    0,
+                    0,
+                    "",
+                    clip_on=False,
+                    va="center",
+                    fontsize=mpl.rcParams["xtick.labelsize"],
+                ),
+            )
+            self._percentages.append(
+                self.axes.text(0, 0, "", clip_on=False, ha="center", va="center"),
+            )
+
+    def render(
+        self,
+        title: str,
+        labels: list[str],
+        values: npt.NDArray[np.float64],
+        size: tuple[int, int],
+    ) -> bytes:
+        """Update the wedges, labels and percentages and render the chart to a png image of size."""
+        with self.lock:
+            self._resize(size)
+            self._ensure_wedges(len(labels))
+
+            fractions = values / values.sum()
+            colormap = mpl.colormaps["Set3"]
+            theta1 = self._start_angle / 360  # In turns
+
+            for i, (wedge, label, percentage) in enumerate(
+                zip(self._wedges, self._labels, self._percentages, strict=True),
+            ):
+                visible = i < len(labels)
+                wedge.set_visible(visible)
+                label.set_visible(visible)
+                percentage.set_visible(visible)
+
+                if not visible:
+                    continue
+
+                theta2 = theta1 + fractions[i]
+                wedge.set_theta1(360 * theta1)
+                wedge.set_theta2(360 * theta2)
+                wedge.set_facecolor(colormap(i / len(labels)))
+
+                middle = np.pi * (theta1 + theta2)
+                x, y = np.cos(middle), np.sin(middle)
+
+                label.set_text(labels[i])
+                label.set_position((self._label_distance * x, self._label_distance * y))
+                label.set_horizontalalignment("left" if x > 0 else "right")
+
+                percentage.set_text(f"{100 * fractions[i]:1.1f}%")
+                percentage.set_position(
+                    (self._percentage_distance * x, self._percentage_distance * y),
+                )
+
+                theta1 = theta2
+
+            self.axes.set_title(title)
+            return self.save()
+
+
+class _RangeChart(_Chart):
+    """Line over a date range, filled green above zero and red below."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.axes = self.figure.add_subplot()
+        (self._line,) = self.axes.plot([], [], color="black", linewidth=1)
+        self._fills: list[PolyCollection] = []
+
+        locator = mdates.AutoDateLocator()
+        self.axes.xaxis.set_major_locator(locator)
+        self.axes.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+
+        self.axes.axhline(0, color="gray", linewidth=0.8)
+        self.axes.set_ylabel("Amount (€)")
+        self.axes.grid(visible=True, axis="y", linestyle="--", alpha=0.7)
+
+    def render(
+        self,
+        title: str,
+        dates: npt.NDArray[np.datetime64],
+        values: npt.NDArray[np.float64],
+        size: tuple[int, int],
+    ) -> bytes:
+        """Update the line and fills and render the chart to a png image of size."""
+        with self.lock:
+            self._resize(size)
+
+            x = mdates.date2num(dates)
+            self._line.set_data(x, values)
+
+            for fill in self._fills:
+                fill.remove()
+
+            self._fills = [
+                self.axes.fill_between(
+                    x,
+                    values,
+                    0,
+                    where=where,
+                    interpolate=True,
+                    color=color,
+                    alpha=0.3,
+                    linewidth=0,
+                )
+                for where, color in ((values >= 0, "green"), (values < 0, "red"))
+            ]
+
+            self.axes.set_title(title)
+            self.axes.relim()
+            self.axes.autoscale_view()
+
+            self._fit_layout(self.axes)
+            return self.save()
+
+
+message_chart = functools.cache(_MessageChart)
+daily_chart = functools.cache(_DailyChart)
+monthly_chart = functools.cache(_MonthlyChart)
+totals_chart = functools.cache(_TotalsChart)
+pie_chart = functools.cache(_PieChart)
+net_flow_chart = functools.cache(_RangeChart)
+balance_chart = functools.cache(_RangeChart)
+
+
+def draw_daily_transactions(
+    year: int,
+    month: int,
+    totals: IncomeExpense | None,
+    size: tuple[int, int],
+) -> bytes:
+    """Draw the daily transaction graph of a month. None totals mean an empty db."""
+    title = f"No Transactions for {year}-{month:02d}"
+
+    if totals is None:
+        return message_chart().render(title, DATABASE_EMPTY_MESSAGE, size)
+
+    income, expense = totals
+
+    if not income.any() and not expense.any():
+        return message_chart().render(title, NO_DATA_MESSAGE, size)
+
+    return daily_chart().render(
+        f"Daily Income & Expenses for {year}-{month:02d}",
+        income,
+        expense,
+        size,
+    )
+
+
+def draw_monthly_trend(year: int, totals: IncomeExpense | None, size: tuple[int, int]) -> bytes:
+    """Draw the monthly trend graph of a year. None totals mean an empty db."""
+    if totals is None:
+        return message_chart().render(f"No Transactions for {year}", DATABASE_EMPTY_MESSAGE, size)
+
+    income, expense = totals
+
+    if not income.any() and not expense.any():
+        return message_chart().render(f"No Transactions for {year}", NO_DATA_MESSAGE, size)
+
+    return monthly_chart().render(f"Income & Expenses Trend for {year}", income, expense, size)
+
+
+def draw_income_vs_expense(
+    year: int,
+    totals: tuple[float, float] | None,
+    size: tuple[int, int],
+) -> bytes:
+    """Draw the income vs expenses graph of a year. None totals mean an empty db."""
+    if totals is None:
+        return message_chart().render(f"No Transactions for {year}", DATABASE_EMPTY_MESSAGE, size)
+
+    total_income, total_expense = totals
+
+    if not total_income and not total_expense:
+        return message_chart().render(f"No Income or Expenses for {year}", NO_DATA_MESSAGE, size)
+
+    return totals_chart().render(
+        f"Total Income vs. Expenses for {year}",
+        total_income,
+        total_expense,
+        size,
+    )
+
+
+def draw_expense_distribution(
+    year: int,
+    category_totals: tuple[list[str], npt.NDArray[np.float64]] | None,
+    size: tuple[int, int],
+) -> bytes:
+    """Draw the expense distribution graph of a year from its categories and their totals.
+
+    None category totals mean an empty db.
+    """
+    if category_totals is None:
+        return message_chart().render(f"No Transactions for {year}", DATABASE_EMPTY_MESSAGE, size)
+
+    categories, totals = category_totals
+
+    # Categories with only zero totals have no share to draw either
+    if not categories or totals.sum() == 0:
+        return message_chart().render(f"No Expenses for {year}", NO_DATA_MESSAGE, size)
+
+    return pie_chart().render(
+        f"Expense Distribution by Category ({year})",
+        categories,
+        totals,
+        size,
+    )
+
+
+def timed_draw(draw: Callable[..., bytes], *args: object) -> tuple[bytes, float]:
+    """Run a draw function, return its png image and how many seconds it took.
+
+    Runs in a render process.
+    """
+    start = time.perf_counter()
+    data = draw(*args)
+    return data, time.perf_counter() - start
@@ -0,0 +1,13 @@
+"""Chart kinds shared by the app and the chart modules.
+
+Importing this module does not load the chart modules (numpy, matplotlib), so the GUI thread can
+use it before they are warmed up.
+"""
+
+# Charts plot_dashboard renders in one pass
+DASHBOARD_KINDS = (
+    "monthly_trend",
+    "daily_transactions",
+    "income_vs_expense",
+    "expense_distribution",
+)
@@ -0,0 +1,85 @@
+"""Downsampling of chart series to about as many points as the chart has pixels.
+
+Both methods keep the first and last points and return the selected points in order.
+x may be numeric or datetime64.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+
+
+def min_max[X: np.generic](
+    x: npt.NDArray[X],
+    y: npt.NDArray[np.float64],
+    bin_count: int,
+) -> tuple[npt.NDArray[X], npt.NDArray[np.float64]]:
+    """Keep the minimum and maximum point of each of bin_count equal bins.
+
+    Preserves the envelope and every spike of dense line series, at most 2 * bin_count + 2
+    points are returned. Fully vectorized.
+    """
+    count = len(y)
+
+    if bin_count < 1 or count <= 2 * bin_count:
+        return x, y
+
+    bin_size = -(-count // bin_count)  # Ceil
+
+    # Pad with the last value so every bin has bin_size points, padding never changes a bin's range
+    padded = np.pad(y, (0, bin_size * bin_count - count), mode="edge").reshape(bin_count, bin_size)
+    offsets = np.arange(bin_count) * bin_size
+
+    minimums = np.minimum(offsets + padded.argmin(axis=1), count - 1)
+    maximums = np.minimum(offsets + padded.argmax(axis=1), count - 1)
+
+    indices = np.unique(np.concatenate(([0, count - 1], minimums, maximums)))  # Sorted
+    return x[indices], y[indices]
+
+
+def lttb[X: np.generic](
+    x: npt.NDArray[X],
+    y: npt.NDArray[np.float64],
+    threshold: int,
+) -> tuple[npt.NDArray[X], npt.NDArray[np.float64]]:
+    """Keep threshold points using Largest-Triangle-Three-Buckets.
+
+    From each bucket the point forming the largest triangle with the previously kept point and
+    the average of the next bucket is kept, which preserves the visual shape of the series.
+    """
+    count = len(y)
+
+    if threshold < 3 or count <= threshold:  # noqa: PLR2004
+        return x, y
+
+    x_values = x.astype(np.float64)
+    y_values = y.astype(np.float64)
+
+    # Bucket edges of the points between the first and the last one
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.intp)
+
+    # Average point of every bucket, the last point stands for the bucket after the last one
+    bucket_sizes = np.diff(edges)
+    average_x = np.append(np.add.reduceat(x_values[:-1], edges[:-1])[1:] / bucket_sizes[1:], 0)
+    average_y = np.append(np.add.reduceat(y_values[:-1], edges[:-1])[1:] / bucket_sizes[1:], 0)
+    average_x[-1], average_y[-1] = x_values[-1], y_values[-1]
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, count - 1
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+
+        # Twice the triangle areas, the factor does not change which one is the largest
+        areas = np.abs(
+            (x_values[previous] - average_x[bucket]) * (y_values[start:stop] - y_values[previous])
+            - (x_values[previous] - x_values[start:stop])
+            * (average_y[bucket] - y_values[previous]),
+        )
+
+        previous = start + int(areas.argmax())
+        selected[bucket + 1] = previous
+
+    return x[selected], y[selected]
@@ -3,7 +3,7 @@ import enum
 
 import xlsxwriter
 from PySide6.QtWidgets import QFileDialog
-from sqlalchemy import extract, inspect
+from sqlalchemy import inspect
 
 from data import db
 from data.models import MonthlyTransaction, Transaction, TransactionCategory
@@ -25,7 +25,7 @@ def export_database() -> None:
 
     models = [Transaction, TransactionCategory, MonthlyTransaction]
 
-    with db.create_session() as session:
+    with db.read_session() as session:
         for model in models:
             table_name = model.__tablename__
             worksheet = workbook.add_worksheet(name=table_name[:31])
@@ -72,7 +72,7 @@ def export_transactions_by_month(month: int, year: int) -> None:
     workbook = xlsxwriter.Workbook(str(excel_path))
     worksheet = workbook.add_worksheet(name="Transactions")
 
-    with db.create_session() as session:
+    with db.read_session() as session:
         # inspect columns dynamically
         excluded_columns = {"monthly_transaction_id"}
         mapper = inspect(Transaction)
@@ -83,11 +83,17 @@ def export_transactions_by_month(month: int, year: int) -> None:
             worksheet.write(0, col_idx, col_name)
 
         # filter transactions by given month and year
+        # (compare against a date range instead of extracting parts so the date index is used)
+        start_of_month = datetime.date(year, month, 1)
+        start_of_next_month = (
+            datetime.date(year + 1, 1, 1) if month == 12 else datetime.date(year, month + 1, 1)  # noqa: PLR2004
+        )
+
         rows = (
             session.query(Transaction)
             .filter(
-                extract("month", Transaction.execution_date) == month,
-                extract("year", Transaction.execution_date) == year,
+                Transaction.execution_date >= start_of_month,
+                Transaction.execution_date < start_of_next_month,
             )
             .all()
         )
@@ -1,358 +1,479 @@
-import contextlib
+from __future__ import annotations
+
+import calendar
 import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING
 
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-import pandas as pd
+import numpy as np
+import numpy.typing as npt
 
 from data import db
-from data.models import Transaction, TransactionType
-from utility.save import data_folder_path
-
-logging.getLogger("matplotlib.font_manager").setLevel(logging.ERROR)
-
-
-def load_transactions_as_dataframe() -> pd.DataFrame:
-    """Load all transactions from the database and return them as a pandas DataFrame."""
-    session = db.create_session()
-
-    try:
-        transactions = session.query(Transaction).all()
-
-        data = [
-            {
-                "Name": t.name,
-                "Amount": float(t.amount),
-                "OfType": "Income" if t.transaction_type == TransactionType.INCOME else "Expense",
-                "DateOf": t.execution_date,
-                "Category": t.category,
-            }
-            for t in transactions
-        ]
-
-        if not data:
-            return pd.DataFrame(columns=["Name", "Amount", "OfType", "DateOf", "Category"])
-
-        dataframe = pd.DataFrame(data)
-        dataframe["DateOf"] = pd.to_datetime(dataframe["DateOf"])  # Ensure datetime format
-        return dataframe
-
-    finally:
-        session.close()
-
-
-def plot_daily_transactions(year: int, month: int) -> None:
-    """Use load_transactions_as_dataframe generate a daily transaction graph and save it."""
-    dataframe = load_transactions_as_dataframe()
-    if dataframe.empty:
-        plt.figure(figsize=(6, 4))
-        plt.title(f"No Transactions for {year}-{month:02d}", fontsize=12)
-        plt.text(
-            0.5,
-            0.5,
-            "Database empty. Please add data first.",
-            ha="center",
-            va="center",
-            fontsize=10,
-        )
-        plt.axis("off")
-        output_dir = data_folder_path() / "graphs"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / "dailychart.png"
-        plt.savefig(output_path)
-        plt.close()
-        return
-    # Filter data for the given year & month
-    filtered_df = dataframe[
-        (dataframe["DateOf"].dt.year == year) & (dataframe["DateOf"].dt.month == month)
-    ].copy()
-
-    if filtered_df.empty:
-        plt.figure(figsize=(6, 4))
-        plt.title(f"No Transactions for {year}-{month:02d}", fontsize=12)
-        plt.text(0.5, 0.5, "No data available", ha="center", va="center", fontsize=10)
-        plt.axis("off")
-        output_dir = data_folder_path() / "graphs"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / "dailychart.png"
-        plt.savefig(output_path)
-        plt.close()
-        return
-
-    # Group by day and calculate income and expense
-    income_df = (
-        filtered_df[filtered_df["OfType"] == "Income"]
-        .groupby(filtered_df["DateOf"].dt.day)["Amount"]
-        .sum()
-    )
-    expense_df = (
-        filtered_df[filtered_df["OfType"] == "Expense"]
-        .groupby(filtered_df["DateOf"].dt.day)["Amount"]
-        .sum()
-    )
+from data.models import TransactionType
+from data.money import CENTS_PER_UNIT
+from gen import aggregation, chart_cache, chart_draw, downsample
+from gen.chart_draw import DEFAULT_SIZE
 
-    valid_days = range(1, (filtered_df["DateOf"].dt.days_in_month.max() + 1))
-    income_df = income_df.reindex(valid_days, fill_value=0)
-    expense_df = expense_df.reindex(valid_days, fill_value=0)
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Future
 
-    plt.figure(figsize=(6, 4))
+# create logger for module
+logger = logging.getLogger(__name__)
 
-    bar_width = 0.35  # Narrower bars to reduce clutter
-    index = valid_days
+# Part of every chart cache key, bump it when the look of the charts changes
+CHART_STYLE = 2
 
-    # Plot bars
-    plt.bar(index, income_df, bar_width, label="Income", color="green")
-    plt.bar([i + bar_width for i in index], expense_df, bar_width, label="Expense", color="red")
+SIZE_STEP = 50  # Pixels, render sizes are rounded up to a multiple so resizes reuse renders
+MAX_SIZE = 4000  # Pixels, per side
+CANCEL_POLL_INTERVAL = 0.05  # Seconds between cancellation checks while waiting for renders
 
-    # Plot settings
-    plt.xlabel("Day", fontsize=10)
-    plt.ylabel("Amount (€)", fontsize=10)
-    plt.title(f"Daily Income & Expenses for {year}-{month:02d}", fontsize=12)
-    plt.xticks(fontsize=8, rotation=45)
-    plt.yticks(fontsize=8)
 
-    plt.grid(visible=True, axis="y", linestyle="--", alpha=0.7)
+def render_size(requested: tuple[int, int] | None) -> tuple[int, int]:
+    """Get the size (pixels) a chart is rendered at for a requested size in device pixels.
 
-    plt.legend(
-        fontsize=8,
-        loc="upper left",
-        bbox_to_anchor=(1, 1),
-    )
+    Both sides are rounded up to a multiple of SIZE_STEP, so nearby sizes share a render, and
+    scaled down to at most MAX_SIZE. None or an empty size means DEFAULT_SIZE.
+    """
+    if requested is None or min(requested) <= 0:
+        return DEFAULT_SIZE
+
+    scale = min(1.0, MAX_SIZE / max(requested))
+    width, height = (-(-round(side * scale) // SIZE_STEP) * SIZE_STEP for side in requested)
+    return width, height
+
+
+def _preview_size(size: tuple[int, int]) -> tuple[int, int]:
+    """Get the size of the low resolution preview of a render, at most as wide as DEFAULT_SIZE."""
+    width, height = size
+
+    if width <= DEFAULT_SIZE[0]:
+        return size
+
+    return render_size((DEFAULT_SIZE[0], round(height * DEFAULT_SIZE[0] / width)))
+
+
+class RenderCancelledError(Exception):
+    def __init__(self) -> None:
+        super().__init__("Chart render was cancelled.")
+
+
+def cents_to_units(cents: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    """Convert (summed) integer cents to currency units for plotting."""
+    return np.asarray(cents, dtype=np.int64) / CENTS_PER_UNIT
+
+
+def _income_expense_units(
+    totals: aggregation.IncomeExpenseSeries | None,
+) -> chart_draw.IncomeExpense | None:
+    """Convert aggregated income and expense cents for drawing, None (empty db) stays None."""
+    if totals is None:
+        return None
+
+    return cents_to_units(totals.income), cents_to_units(totals.expense)
+
+
+def _totals_units(totals: tuple[int, int] | None) -> tuple[float, float] | None:
+    """Convert aggregated income and expense totals for drawing, None (empty db) stays None."""
+    if totals is None:
+        return None
+
+    income, expense = cents_to_units(totals).tolist()
+    return income, expense
+
+
+def _category_units(
+    category_totals: aggregation.CategoryTotals | None,
+) -> tuple[list[str], npt.NDArray[np.float64]] | None:
+    """Convert aggregated category totals for drawing, None (empty db) stays None."""
+    if category_totals is None:
+        return None
+
+    return list(category_totals.categories), cents_to_units(category_totals.totals)
+
+
+def _render_daily_transactions(year: int, month: int, size: tuple[int, int]) -> bytes:
+    """Use aggregation.daily_totals to generate a daily transaction graph."""
+    totals = aggregation.daily_totals(year, month) if aggregation.has_transactions() else None
+    return chart_draw.draw_daily_transactions(year, month, _income_expense_units(totals), size)
+
+
+def _render_monthly_trend(year: int, size: tuple[int, int]) -> bytes:
+    """Use aggregation.monthly_totals to generate a monthly trend graph."""
+    totals = aggregation.monthly_totals(year) if aggregation.has_transactions() else None
+    return chart_draw.draw_monthly_trend(year, _income_expense_units(totals), size)
 
-    plt.tight_layout()
-
-    # Save plot
-    output_dir = data_folder_path() / "graphs"
-    output_dir.mkdir(exist_ok=True)
-    output_path = output_dir / "dailychart.png"
-    plt.savefig(output_path)
-    plt.close()
-
-
-def plot_monthly_trend(year: int) -> None:
-    """Use load_transactions_as_dataframe generate a monthly trend graph and save it."""
-    dataframe = load_transactions_as_dataframe()
-
-    if dataframe.empty:
-        plt.figure(figsize=(6, 4))
-        plt.title(f"No Transactions for {year}", fontsize=12)
-        plt.text(
-            0.5,
-            0.5,
-            "Database empty. Please add data first.",
-            ha="center",
-            va="center",
-            fontsize=10,
-        )
-        plt.axis("off")
-        output_dir = data_folder_path() / "graphs"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / "monthlychart.png"
-        plt.savefig(output_path)
-        plt.close()
-        return
-    # Filter for the given year
-    filtered_df = dataframe[dataframe["DateOf"].dt.year == year].copy()
-    if filtered_df.empty:
-        plt.figure(figsize=(6, 4))
-        plt.title(f"No Transactions for {year}", fontsize=12)
-        plt.text(0.5, 0.5, "No data available", ha="center", va="center", fontsize=10)
-        plt.axis("off")
-        output_dir = data_folder_path() / "graphs"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / "monthlychart.png"
-        plt.savefig(output_path)
-        plt.close()
-        return
-
-    # Group by month and calculate income and expense
-    income_df = (
-        filtered_df[filtered_df["OfType"] == "Income"]
-        .groupby(filtered_df["DateOf"].dt.month)["Amount"]
-        .sum()
-        .reset_index()
+
+def _render_income_vs_expense(year: int, size: tuple[int, int]) -> bytes:
+    """Use aggregation.yearly_totals to generate an income vs expenses graph."""
+    totals = aggregation.yearly_totals(year) if aggregation.has_transactions() else None
+    return chart_draw.draw_income_vs_expense(year, _totals_units(totals), size)
+
+
+def _render_expense_distribution(year: int, size: tuple[int, int]) -> bytes:
+    """Use aggregation.category_totals to generate an expense distribution graph."""
+    category_totals = (
+        aggregation.category_totals(year, TransactionType.EXPENSE)
+        if aggregation.has_transactions()
+        else None
     )
-    expense_df = (
-        filtered_df[filtered_df["OfType"] == "Expense"]
-        .groupby(filtered_df["DateOf"].dt.month)["Amount"]
-        .sum()
-        .reset_index()
+    return chart_draw.draw_expense_distribution(year, _category_units(category_totals), size)
+
+
+def _range_title(title: str, start: date, end: date) -> str:
+    return f"{title} {start.year}-{start.month:02d} to {end.year}-{end.month:02d}"
+
+
+def _month_span(
+    start_year: int,
+    start_month: int,
+    end_year: int,
+    end_month: int,
+) -> tuple[date, date]:
+    """Get the first day of the start month and the last day of the end month."""
+    return (
+        date(start_year, start_month, 1),
+        date(end_year, end_month, calendar.monthrange(end_year, end_month)[1]),
     )
 
-    # Fill missing months with 0
-    income_df = income_df.set_index("DateOf").reindex(range(1, 13), fill_value=0).reset_index()
-    expense_df = expense_df.set_index("DateOf").reindex(range(1, 13), fill_value=0).reset_index()
 
-    income_df.columns = ["Month", "Income"]
-    expense_df.columns = ["Month", "Expense"]
+def _render_net_flow_trend(
+    start_year: int,
+    start_month: int,
+    end_year: int,
+    end_month: int,
+    size: tuple[int, int],
+) -> bytes:
+    """Use aggregation.monthly_net_flow to generate a net flow graph of a range of months.
+
+    Ranges with more months than the chart has pixels are downsampled with LTTB.
+    """
+    start, end = _month_span(start_year, start_month, end_year, end_month)
+    title = _range_title("Monthly Net Flow", start, end)
+
+    if not aggregation.has_transactions():
+        return chart_draw.message_chart().render(title, chart_draw.DATABASE_EMPTY_MESSAGE, size)
+
+    series = aggregation.monthly_net_flow(start, end)
+
+    if not series.values.any():
+        return chart_draw.message_chart().render(title, chart_draw.NO_DATA_MESSAGE, size)
+
+    dates, values = downsample.lttb(series.dates, cents_to_units(series.values), size[0])
+    return chart_draw.net_flow_chart().render(title, dates, values, size)
+
+
+def _render_balance_history(
+    start_year: int,
+    start_month: int,
+    end_year: int,
+    end_month: int,
+    size: tuple[int, int],
+) -> bytes:
+    """Use aggregation.daily_balance to generate a daily balance graph of a range of months.
 
-    plt.figure(figsize=(6, 4))
-    bar_width = 0.35
-    index = range(1, 13)
+    The daily series is decimated to the minimum and maximum of every two pixels of width, so
+    decades render as fast as a single month.
+    """
+    start, end = _month_span(start_year, start_month, end_year, end_month)
+    title = _range_title("Daily Balance", start, end)
 
-    plt.bar(index, income_df["Income"], bar_width, label="Income", color="green")
-    plt.bar(
-        [i + bar_width for i in index],
-        expense_df["Expense"],
-        bar_width,
-        label="Expense",
-        color="red",
+    if not aggregation.has_transactions():
+        return chart_draw.message_chart().render(title, chart_draw.DATABASE_EMPTY_MESSAGE, size)
+
+    series = aggregation.daily_balance(start, end)
+
+    if not len(series.values):
+        return chart_draw.message_chart().render(title, chart_draw.NO_DATA_MESSAGE, size)
+
+    dates, values = downsample.min_max(series.dates, cents_to_units(series.values), size[0] // 2)
+    return chart_draw.balance_chart().render(title, dates, values, size)
+
+
+def warm_up() -> None:
+    """Create and lay out the chart figures ahead of the first render."""
+    for chart in (
+        chart_draw.message_chart,
+        chart_draw.daily_chart,
+        chart_draw.monthly_chart,
+        chart_draw.totals_chart,
+        chart_draw.pie_chart,
+        chart_draw.net_flow_chart,
+        chart_draw.balance_chart,
+    ):
+        chart()
+
+
+# Chart kinds mapped to their renderers, each renderer takes the period followed by the size and
+# returns a png image
+_RENDERERS: dict[str, Callable[..., bytes]] = {
+    "daily_transactions": _render_daily_transactions,
+    "monthly_trend": _render_monthly_trend,
+    "income_vs_expense": _render_income_vs_expense,
+    "expense_distribution": _render_expense_distribution,
+    "net_flow_trend": _render_net_flow_trend,
+    "balance_history": _render_balance_history,
+}
+
+CHART_KINDS = tuple(_RENDERERS)
+
+_kind_locks = {kind: threading.Lock() for kind in CHART_KINDS}
+
+
+def _cache_name(kind: str, period: tuple[int, ...], data_version: int) -> str:
+    """Get the chart cache name of a chart of a period, rendered from the data at data_version."""
+    return chart_cache.chart_name(kind, *period, CHART_STYLE, db.database_id(), data_version)
+
+
+def plot_chart(
+    kind: str,
+    *period: int,
+    size: tuple[int, int] | None = None,
+    progress: Callable[[int], None] | None = None,
+    is_cancelled: Callable[[], bool] | None = None,
+) -> bytes:
+    """Get a chart of a period as a png image, rendering it only if it is not in the chart cache.
+
+    size is the requested size in device pixels, the chart is rendered at render_size(size).
+    Safe to call from any thread. progress receives the completion percentage. is_cancelled is
+    checked before rendering starts, a RenderCancelledError is raised if it returns true.
+    """
+    report = progress or (lambda _: None)
+    size = render_size(size)
+
+    name = _cache_name(kind, period, db.data_version())
+    report(10)
+
+    data = chart_cache.get(name, size)
+
+    if data is None:
+        # Requests for the same kind share a figure, so they are rendered one at a time
+        with _kind_locks[kind]:
+            if is_cancelled and is_cancelled():
+                raise RenderCancelledError
+
+            report(30)
+
+            # The same chart may have been rendered while waiting
+            data = chart_cache.get(name, size)
+
+            if data is None:
+                data = _RENDERERS[kind](*period, size)
+                chart_cache.put(name, size, data)
+
+    report(100)
+    return data
+
+
+def plot_preview(
+    kind: str,
+    *period: int,
+    size: tuple[int, int] | None = None,
+    is_cancelled: Callable[[], bool] | None = None,
+) -> bytes:
+    """Get a quick preview of a chart to show until plot_chart returns the full resolution one.
+
+    The preview is a cached render of the chart at any size if there is one, otherwise the chart
+    is rendered at a low resolution (at most DEFAULT_SIZE). Rendering time is mostly layout and
+    text, not pixels, so the preview is only cheaper for large sizes.
+    """
+    name = _cache_name(kind, period, db.data_version())
+    data = chart_cache.get_any(name)
+
+    if data is not None:
+        return data
+
+    return plot_chart(
+        kind,
+        *period,
+        size=_preview_size(render_size(size)),
+        is_cancelled=is_cancelled,
     )
 
-    # Plot settings
-    plt.xlabel("Month")
-    plt.ylabel("Amount (€)")
-    plt.title(f"Income & Expenses Trend for {year}")
-    plt.xticks([i + bar_width / 2 for i in index], income_df["Month"].astype(str).tolist())
-    plt.grid(visible=True, axis="y", linestyle="--", alpha=0.7)
-    plt.legend()
-    plt.tight_layout()
-
-    # Save plot
-    output_dir = data_folder_path() / "graphs"
-    output_dir.mkdir(exist_ok=True)
-    output_path = output_dir / "monthlychart.png"
-    plt.savefig(output_path)
-    plt.close()
-
-
-def plot_income_vs_expense(year: int) -> None:
-    """Use load_transactions_as_dataframe generate a income vs expenses graph and save it."""
-    dataframe = load_transactions_as_dataframe()
-
-    if dataframe.empty:
-        plt.figure(figsize=(6, 4))
-        plt.title(f"No Transactions for {year}", fontsize=12)
-        plt.text(
-            0.5,
-            0.5,
-            "Database empty. Please add data first.",
-            ha="center",
-            va="center",
-            fontsize=10,
-        )
-        plt.axis("off")
-        output_dir = data_folder_path() / "graphs"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / "income_vs_expense.png"
-        plt.savefig(output_path)
-        plt.close()
-        return
-    # Filter data for the given year
-    filtered_df = dataframe[dataframe["DateOf"].dt.year == year]
-
-    if filtered_df.empty:
-        plt.figure(figsize=(6, 4))
-        plt.title(f"No Income or Expenses for {year}", fontsize=12)
-        plt.text(0.5, 0.5, "No data available", ha="center", va="center", fontsize=10)
-        plt.axis("off")
-        output_dir = data_folder_path() / "graphs"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / "income_vs_expense.png"
-        plt.savefig(output_path)
-        plt.close()
-        return
-
-    total_income = filtered_df[filtered_df["OfType"] == "Income"]["Amount"].sum()
-    total_expense = filtered_df[filtered_df["OfType"] == "Expense"]["Amount"].sum()
-
-    plt.figure(figsize=(6, 4))
-    plt.bar(["Income", "Expenses"], [total_income, total_expense], color=["green", "red"])
-
-    # Plot settings
-    plt.ylabel("Amount (€)")
-    plt.title(f"Total Income vs. Expenses for {year}")
-    plt.grid(axis="y", linestyle="--", alpha=0.7)
-    plt.tight_layout()
-
-    # Save plot
-    output_dir = data_folder_path() / "graphs"
-    output_dir.mkdir(exist_ok=True)
-    output_path = output_dir / "income_vs_expense.png"
-    plt.savefig(output_path)
-    plt.close()
-
-
-def plot_expense_distribution(year: int) -> None:
-    """Use load_transactions_as_dataframe generate an expense distribution graph and save it."""
-    dataframe = load_transactions_as_dataframe()
-
-    if dataframe.empty:
-        plt.figure(figsize=(6, 4))
-        plt.title(f"No Transactions for {year}", fontsize=12)
-        plt.text(
-            0.5,
-            0.5,
-            "Database empty. Please add data first.",
-            ha="center",
-            va="center",
-            fontsize=10,
-        )
-        plt.axis("off")
-        output_dir = data_folder_path() / "graphs"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / "expense_distribution.png"
-        plt.savefig(output_path)
-        plt.close()
-        return
-    # Filter for the given year and only include expenses
-    expense_df = dataframe[
-        (dataframe["DateOf"].dt.year == year) & (dataframe["OfType"] == "Expense")
+
+def plot_daily_transactions(year: int, month: int) -> bytes:
+    """Get the daily transaction graph of a month. Returns the png image."""
+    return plot_chart("daily_transactions", year, month)
+
+
+def plot_monthly_trend(year: int) -> bytes:
+    """Get the monthly trend graph of a year. Returns the png image."""
+    return plot_chart("monthly_trend", year)
+
+
+def plot_income_vs_expense(year: int) -> bytes:
+    """Get the income vs expenses graph of a year. Returns the png image."""
+    return plot_chart("income_vs_expense", year)
+
+
+def plot_expense_distribution(year: int) -> bytes:
+    """Get the expense distribution graph of a year. Returns the png image."""
+    return plot_chart("expense_distribution", year)
+
+
+def plot_net_flow_trend(start_year: int, start_month: int, end_year: int, end_month: int) -> bytes:
+    """Get the monthly net flow graph of a range of months. Returns the png image."""
+    return plot_chart("net_flow_trend", start_year, start_month, end_year, end_month)
+
+
+def plot_balance_history(start_year: int, start_month: int, end_year: int, end_month: int) -> bytes:
+    """Get the daily balance graph of a range of months. Returns the png image."""
+    return plot_chart("balance_history", start_year, start_month, end_year, end_month)
+
+
+@dataclass(frozen=True)
+class RenderedChart:
+    kind: str
+    period: tuple[int, ...]
+    data_version: int  # Of the data the chart was rendered from
+    render_seconds: float | None  # None if the chart was taken from the chart cache
+
+
+class _ProcessPool:
+    """Lazily started render processes used to render dashboard charts in parallel.
+
+    matplotlib holds the GIL while drawing, so threads would render one chart at a time. Each
+    chart kind gets its own single process, which keeps that kind's figure laid out between
+    renders. Processes are spawned (not forked) because the parent process runs Qt threads.
+    They only import chart_draw (and the __main__ module, which skips the app imports outside of
+    the app process) to draw charts.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executors: dict[str, ProcessPoolExecutor] = {}
+
+    def get(self, kind: str) -> ProcessPoolExecutor:
+        """Get the render process of a chart kind, starting it on first use."""
+        with self._lock:
+            if kind not in self._executors:
+                self._executors[kind] = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+
+            return self._executors[kind]
+
+    def shutdown(self) -> None:
+        """Stop the render processes that were started."""
+        with self._lock:
+            for executor in self._executors.values():
+                executor.shutdown(cancel_futures=True)
+
+            self._executors.clear()
+
+
+_process_pool = _ProcessPool()
+
+
+def plot_dashboard(
+    year: int,
+    month: int,
+    size: tuple[int, int] | None = None,
+    is_cancelled: Callable[[], bool] | None = None,
+) -> list[RenderedChart]:
+    """Get all dashboard charts of a year (the daily chart is for month) in one pass.
+
+    The data of all charts is loaded once, in a single transaction, then the charts that are not
+    in the chart cache are rendered in parallel in render processes and added to it. size is
+    the requested size of each chart in device pixels, as for plot_chart. is_cancelled is checked
+    before rendering starts and while waiting for the render processes. If it returns true, renders
+    that have not started are cancelled and a RenderCancelledError is raised (running renders
+    finish in their process, their charts are dropped).
+    """
+    start = time.perf_counter()
+    size = render_size(size)
+
+    version = db.data_version()
+    totals = aggregation.dashboard_totals(year, month)
+
+    # Kind, period and the draw function with its data arguments (None data: database empty)
+    jobs: list[tuple[str, tuple[int, ...], Callable[..., bytes], tuple[object, ...]]] = [
+        (
+            "monthly_trend",
+            (year,),
+            chart_draw.draw_monthly_trend,
+            (year, _income_expense_units(totals.monthly if totals else None)),
+        ),
+        (
+            "daily_transactions",
+            (year, month),
+            chart_draw.draw_daily_transactions,
+            (year, month, _income_expense_units(totals.daily if totals else None)),
+        ),
+        (
+            "income_vs_expense",
+            (year,),
+            chart_draw.draw_income_vs_expense,
+            (year, _totals_units(totals.yearly if totals else None)),
+        ),
+        (
+            "expense_distribution",
+            (year,),
+            chart_draw.draw_expense_distribution,
+            (year, _category_units(totals.expense_categories if totals else None)),
+        ),
     ]
 
-    if expense_df.empty:
-        plt.figure(figsize=(6, 4))
-        plt.title(f"No Expenses for {year}", fontsize=12)
-        plt.text(0.5, 0.5, "No data available", ha="center", va="center", fontsize=10)
-        plt.axis("off")
-        output_dir = data_folder_path() / "graphs"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / "expense_distribution.png"
-        plt.savefig(output_path)
-        plt.close()
-        return
-
-    # Group expenses by category
-    category_totals = expense_df.groupby("Category")["Amount"].sum()
-
-    category_labels = category_totals.index.astype(str).tolist()
-
-    # Generate colors
-    num_categories = len(category_totals)
-    colormap = mpl.colormaps["Set3"]
-    colors = [colormap(i / num_categories) for i in range(num_categories)]
-
-    # Plot settings
-    fig, ax = plt.subplots(figsize=(6, 4))
-    ax.pie(
-        category_totals,
-        labels=category_labels,
-        autopct="%1.1f%%",
-        colors=colors,
-        startangle=140,
-        pctdistance=0.8,
-        labeldistance=1.1,
+    if is_cancelled and is_cancelled():
+        raise RenderCancelledError
+
+    charts: list[RenderedChart] = []
+    renders: dict[Future[tuple[bytes, float]], tuple[str, tuple[int, ...], str]] = {}
+
+    for kind, period, draw, args in jobs:
+        name = _cache_name(kind, period, version)
+
+        if chart_cache.get(name, size) is not None:
+            charts.append(RenderedChart(kind, period, version, None))
+            continue
+
+        future = _process_pool.get(kind).submit(chart_draw.timed_draw, draw, *args, size)
+        renders[future] = (kind, period, name)
+
+    pending = set(renders)
+
+    while pending:
+        done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            kind, period, name = renders[future]
+            data, render_seconds = future.result()
+            chart_cache.put(name, size, data)
+            charts.append(RenderedChart(kind, period, version, render_seconds))
+
+        if pending and is_cancelled and is_cancelled():
+            for future in pending:
+                future.cancel()
+
+            raise RenderCancelledError
+
+    logger.info(
+        "Rendered dashboard for %d-%02d at %dx%d in %.0f ms (%s)",
+        year,
+        month,
+        *size,
+        (time.perf_counter() - start) * 1000,
+        ", ".join(
+            f"{chart.kind}: "
+            + (
+                "cached"
+                if chart.render_seconds is None
+                else f"{chart.render_seconds * 1000:.0f} ms"
+            )
+            for chart in charts
+        ),
     )
-    ax.set_title(f"Expense Distribution by Category ({year})")
-    ax.set_aspect("equal")  # Ensure pie is a circle
 
-    # Save plot
-    output_dir = data_folder_path() / "graphs"
-    output_dir.mkdir(exist_ok=True)
-    output_path = output_dir / "expense_distribution.png"
-    plt.savefig(output_path)
-    plt.close()
+    return charts
 
 
 def close_graphs() -> None:
-    """Delete generated graphs before quitting."""
-    dry_run = False
-    folder = data_folder_path() / "graphs"  # delete pngs before quitting
-    if not folder.exists() or not folder.is_dir():
-        return
-    files = list(folder.glob("*.png"))  # list so glob runs once
-
-    for file_path in files:
-        if file_path.exists() and not dry_run:
-            with contextlib.suppress(FileNotFoundError, PermissionError):
-                file_path.unlink()
+    """Stop the render processes and finish persisting the chart cache before quitting."""
+    _process_pool.shutdown()
+    chart_cache.close()
@@ -1,19 +1,9 @@
 import argparse
+import multiprocessing
 import sys
 
-from PySide6.QtCore import QTimer
-from PySide6.QtGui import QIcon
-from PySide6.QtQml import QQmlApplicationEngine, qmlRegisterSingletonInstance
-from PySide6.QtWidgets import QApplication
-
-# Import app modules
-from app_controller import AppController
-
-# Import qml data models
-from py_qml import category_model, monthly_transaction_model, transaction_model  # noqa: F401
-
-# Import qrc resources
-from ui import qml_rc  # noqa: F401
+# Starts the startup clock, keep it the first app import
+from utility import startup_trace
 
 
 def parse_args() -> argparse.Namespace:
@@ -25,14 +15,66 @@ def parse_args() -> argparse.Namespace:
         help="Creates a temp app instance. Data will not be saved.",
         default=False,
     )
+    parser.add_argument(
+        "--db-profile",
+        choices=sorted(db.PRAGMA_PROFILES),
+        help="SQLite pragma profile used for database connections.",
+        default=db.DEFAULT_PRAGMA_PROFILE,
+    )
+    parser.add_argument(
+        "--generation-interval",
+        type=int,
+        help="Minutes between checks for due recurring transactions, 0 only checks at midnight.",
+        default=60,
+    )
+    parser.add_argument(
+        "--startup-trace",
+        action="store_true",
+        help="Print the time to first frame and an import time breakdown.",
+    )
 
     return parser.parse_args()
 
 
 if __name__ == "__main__":
+    # Lets chart render processes start from a frozen (pyinstaller) executable
+    multiprocessing.freeze_support()
+
+    # Chart render processes (see gen.graph_gen) import this module as __mp_main__ and skip this
+    # block, only the app process imports Qt, the app modules and the qml models
+    with startup_trace.measure_import("PySide6"):
+        from PySide6.QtCore import Qt, QTimer
+        from PySide6.QtGui import QIcon
+        from PySide6.QtQml import QQmlApplicationEngine, qmlRegisterSingletonInstance
+        from PySide6.QtWidgets import QApplication
+
+    # Import app modules (charts and exports are imported on first use, see AppController)
+    with startup_trace.measure_import("app_controller"):
+        from app_controller import AppController
+        from data import db
+
+    # Import qml data models
+    with startup_trace.measure_import("py_qml models"):
+        from py_qml import (  # noqa: F401
+            category_model,
+            chart_image_provider,
+            chart_series_model,
+            monthly_transaction_model,
+            transaction_ledger_model,
+            transaction_model,
+            transaction_search_model,
+        )
+
+    # Import qrc resources
+    with startup_trace.measure_import("qrc resources"):
+        from ui import qml_rc  # noqa: F401
+
     # Get command line arguments
     cl_args = parse_args()
 
+    if cl_args.startup_trace:
+        startup_trace.enable()
+
     # Create the application controller
     app_controller = AppController()
 
@@ -56,21 +98,36 @@ if __name__ == "__main__":
     # Create qml engine
     engine = QQmlApplicationEngine()
 
+    # Serve charts to qml from memory (image://charts/...)
+    engine.addImageProvider(
+        chart_image_provider.PROVIDER_ID,
+        app_controller.chart_image_provider,
+    )
+
     # Add the current directory to the import paths and load the main module.
     engine.addImportPath(sys.path[0])
-    engine.loadFromModule("ui", "Main")
+
+    with startup_trace.measure_import("qml ui.Main"):
+        engine.loadFromModule("ui", "Main")
 
     # Check if the QML file was loaded successfully
     if not engine.rootObjects():
         sys.exit(-1)
 
+    # Warm up deferred modules in the background once the window is on screen
+    engine.rootObjects()[0].frameSwapped.connect(
+        app_controller.on_first_frame,
+        Qt.ConnectionType.SingleShotConnection,
+    )
+
     # Start initialization process
     QTimer.singleShot(0, lambda: app_controller.start_initialization(cl_args))
 
     # Start event loop (yields)
     exit_code = app.exec()
 
-    # Cleanup and exit
+    # Cleanup and exit (the engine owns the chart image provider)
+    app_controller.chart_image_provider.wait_for_renders()
     del engine
     app_controller.cleanup()
     sys.exit(exit_code)
@@ -16,7 +16,7 @@ from sqlalchemy.exc import IntegrityError
 
 from data import db
 from data.models import MonthlyTransaction, Transaction, TransactionCategory, TransactionType
-from py_qml.common import EmptyStringError, OperationResult, strip_name
+from py_qml.common import EmptyStringError, OperationResult, SortedRows, strip_name
 
 QML_IMPORT_NAME = "PFM.Models"
 QML_IMPORT_MAJOR_VERSION = 1
@@ -24,6 +24,13 @@ QML_IMPORT_MAJOR_VERSION = 1
 # Create logger for context
 logger = logging.getLogger(__name__)
 
+_CREATE_CATEGORY = "Create new category"  # Text of the creation element, always the last row
+
+
+def _category_sort_key(category_name: str) -> tuple[str, str]:
+    """Alphabetically, case-insensitive."""
+    return category_name.lower(), category_name
+
 
 @QmlElement
 class CategoryModel(QAbstractListModel):
@@ -55,7 +62,7 @@ class CategoryModel(QAbstractListModel):
         notify=display_for_changed,  # type: ignore  # noqa: PGH003
     )
 
-    def _get_categories(self) -> list[str]:
+    def _get_categories(self) -> SortedRows[str]:
         """Get the categories for the current display type."""
         with db.create_session() as session:
             # Create query statement
@@ -66,23 +73,8 @@ class CategoryModel(QAbstractListModel):
             # Execute query
             categories = [category.name for category in session.scalars(stmt).all()]
 
-        # Sort categories alphabetically, case-insensitive
-        categories.sort(key=str.lower)
-
-        # Append creation element to categories
-        categories.append("Create new category")
-
-        return categories
-
-    def _get_insert_index(self, category_name: str) -> int:
-        insert_index = len(self._categories) - 1  # We want to always be behind the creation element
-
-        for i, existing_category in enumerate(self._categories[:-1]):
-            if category_name.lower() < existing_category.lower():
-                insert_index = i
-                break
-
-        return insert_index
+        # Sort categories alphabetically, case-insensitive (the creation element follows them)
+        return SortedRows(_category_sort_key, str, categories)
 
     def __init__(self, parent: QObject | None = None) -> None:
         super().__init__(parent)
@@ -91,14 +83,14 @@ class CategoryModel(QAbstractListModel):
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: ARG002, B008, N802
         """Return the number of rows in the model."""
-        return len(self._categories)
+        return len(self._categories) + 1  # Categories and the creation element
 
     def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> str | None:
         """Return the data for a given row in the model."""
         row = index.row()
 
         if index.isValid() and row < self.rowCount() and role == Qt.ItemDataRole.DisplayRole:
-            return self._categories[row]
+            return self._categories[row] if row < len(self._categories) else _CREATE_CATEGORY
 
         return None
 
@@ -109,17 +101,15 @@ class CategoryModel(QAbstractListModel):
     @Slot(str, result=int)
     def get_index(self, category_name: str) -> int:
         """Get the index of a category in the model."""
-        try:
-            return self._categories.index(category_name)
-        except ValueError:
-            return -1
+        return self._categories.index_of(category_name)
 
     @Slot()
     def update_model(self) -> None:
-        """Update the model to reflect current categories in the db."""
-        self.beginResetModel()
-        self._categories = self._get_categories()
-        self.endResetModel()
+        """Update the model to reflect current categories in the db.
+
+        Only changed rows are signalled, so views keep their delegates and scroll position.
+        """
+        self._categories.refresh(self, self._get_categories())
 
     @Slot(str, result=dict)
     def append(self, category_name: str) -> OperationResult:
@@ -145,10 +135,10 @@ class CategoryModel(QAbstractListModel):
             # Log new category creation
             logger.info("Created new category: %s", new_category_info)
 
-            # Append new category to the model
-            insert_index = self._get_insert_index(category_name)
-            self.beginInsertRows(QModelIndex(), insert_index, insert_index)  # Insert at the front
-            self._categories.insert(insert_index, category_name)  # Insert at the front of the list
+            # Insert new category into the model, in alphabetical order
+            insert_index = self._categories.insert_index(category_name)
+            self.beginInsertRows(QModelIndex(), insert_index, insert_index)
+            self._categories.insert(category_name)
             self.endInsertRows()
 
         except IntegrityError:  # Catch duplicate names
@@ -187,18 +177,18 @@ class CategoryModel(QAbstractListModel):
             )
 
             # Check if data model needs to be updated
-            if self.display_for == category_type:
-                # Remove from current position
-                index = self._categories.index(category_name)
+            index = self._categories.index_of(category_name)
 
+            if self.display_for == category_type and index != -1:
+                # Remove from current position
                 self.beginRemoveRows(QModelIndex(), index, index)
                 self._categories.pop(index)
                 self.endRemoveRows()
 
                 # Insert at new position
-                insert_index = self._get_insert_index(new_name)
+                insert_index = self._categories.insert_index(new_name)
                 self.beginInsertRows(QModelIndex(), insert_index, insert_index)
-                self._categories.insert(insert_index, new_name)
+                self._categories.insert(new_name)
                 self.endInsertRows()
 
         except IntegrityError:  # Catch duplicate names
@@ -306,8 +296,9 @@ class CategoryModel(QAbstractListModel):
     @Slot(str, result=int)
     def index_of(self, category_name: str) -> int:
         """Get the index of a category in the model."""
-        try:
-            return self._categories.index(category_name)
-        except ValueError:
-            logger.exception("Failed to get index of category: %s", category_name)
-            return -1
+        index = self._categories.index_of(category_name)
+
+        if index == -1:
+            logger.error("Failed to get index of category: %s", category_name)
+
+        return index
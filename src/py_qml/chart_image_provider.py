@@ -0,0 +1,152 @@
+"""Image provider serving charts to QML from memory (image://charts/monthly_trend/2025?version=7).
+
+Charts are rendered (or taken from the chart cache) on a thread pool, the png image never goes
+through a file. A chart url includes the data version, so it changes only when the chart content
+does and Qt's image cache can be used as is.
+
+Charts are rendered at the requested size (the Image sourceSize, in device pixels). Adding
+&preview to a url gives a quick low resolution preview of the chart instead, see
+graph_gen.plot_preview.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QThreadPool, Signal
+from PySide6.QtGui import QImage
+from PySide6.QtQuick import QQuickAsyncImageProvider, QQuickImageResponse, QQuickTextureFactory
+
+from data import db
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from PySide6.QtCore import QSize
+
+# create logger for module
+logger = logging.getLogger(__name__)
+
+PROVIDER_ID = "charts"
+_RENDER_THREADS = 4  # One per chart kind
+
+
+def chart_url(kind: str, period: Sequence[int], data_version: int) -> str:
+    """Get the image url of a chart of a period, rendered from the data at data_version."""
+    return f"image://{PROVIDER_ID}/{kind}/{'/'.join(map(str, period))}?version={data_version}"
+
+
+class _ChartImageResponse(QQuickImageResponse):
+    def __init__(
+        self,
+        provider: ChartImageProvider,
+        kind: str,
+        period: tuple[int, ...],
+        size: tuple[int, int] | None,
+        *,
+        preview: bool,
+    ) -> None:
+        super().__init__()
+        self._provider = provider
+        self._kind = kind
+        self._period = period
+        self._size = size
+        self._preview = preview
+        self._image = QImage()
+        self._error = ""
+        self._cancelled = threading.Event()
+
+    def run(self) -> None:
+        """Render the chart (or get it from the chart cache). Runs on the render thread pool."""
+        from gen import graph_gen  # noqa: PLC0415 # Loaded on first use
+
+        try:
+            if self._preview:
+                data = graph_gen.plot_preview(
+                    self._kind,
+                    *self._period,
+                    size=self._size,
+                    is_cancelled=self._is_cancelled,
+                )
+            else:
+                data = graph_gen.plot_chart(
+                    self._kind,
+                    *self._period,
+                    size=self._size,
+                    progress=self._report_progress,
+                    is_cancelled=self._is_cancelled,
+                )
+
+            if not self._image.loadFromData(data, "PNG"):
+                self._error = f"Failed to decode {self._kind} chart"
+        except graph_gen.RenderCancelledError:
+            logger.debug("Superseded %s chart request was cancelled", self._kind)
+            self._error = "Cancelled"
+        except Exception:
+            logger.exception("Failed to render %s chart", self._kind)
+            self._error = f"Failed to render {self._kind} chart"
+        finally:
+            db.remove_thread_sessions()
+
+        # Previews are best effort, the full resolution request reports failures
+        if self._error and not self._preview and not self._is_cancelled():
+            self._provider.failed.emit(self._kind)
+
+        self.finished.emit()
+
+    def _is_cancelled(self) -> bool:
+        return self._cancelled.is_set() or self._provider.shutting_down.is_set()
+
+    def _report_progress(self, percentage: int) -> None:
+        if not self._is_cancelled():
+            self._provider.progress.emit(self._kind, percentage)
+
+    def textureFactory(self) -> QQuickTextureFactory:  # noqa: N802
+        """Get the rendered chart."""
+        return QQuickTextureFactory.textureFactoryForImage(self._image)
+
+    def errorString(self) -> str:  # noqa: N802
+        """Get the reason the chart could not be provided, empty if it was."""
+        return self._error
+
+    def cancel(self) -> None:
+        """Skip rendering if it has not started yet, called when the image is no longer needed."""
+        self._cancelled.set()
+
+
+class ChartImageProvider(QQuickAsyncImageProvider):
+    """Provides charts by url, see chart_url. Register it with the engine under PROVIDER_ID."""
+
+    progress = Signal(str, int)  # Chart kind, percentage
+    failed = Signal(str)  # Chart kind
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(_RENDER_THREADS)
+        self.shutting_down = threading.Event()  # Cancels renders that have not started yet
+
+    def requestImageResponse(self, image_id: str, requested_size: QSize) -> QQuickImageResponse:  # noqa: N802
+        """Start providing the chart of an image id ("kind/period...?version=...[&preview]")."""
+        path, _, query = image_id.partition("?")  # The version is only in the url for Qt's cache
+        kind, *period = path.split("/")
+
+        response = _ChartImageResponse(
+            self,
+            kind,
+            tuple(map(int, period)),
+            (requested_size.width(), requested_size.height()) if requested_size.isValid() else None,
+            preview="preview" in query.split("&"),
+        )
+        self._pool.start(response.run)
+        return response
+
+    def wait_for_renders(self) -> None:
+        """Cancel pending renders and block until running ones are done.
+
+        Call before the engine (which owns the provider) is deleted.
+        """
+        self.shutting_down.set()
+        self._pool.waitForDone()
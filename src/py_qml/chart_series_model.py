@@ -0,0 +1,334 @@
+import datetime
+import logging
+from dataclasses import dataclass
+from enum import IntEnum, StrEnum
+
+from PySide6.QtCore import (
+    Property,
+    QAbstractListModel,
+    QByteArray,
+    QEnum,
+    QModelIndex,
+    QObject,
+    Qt,
+    QThreadPool,
+    QTimer,
+    Signal,
+    Slot,
+)
+from PySide6.QtQml import QmlElement
+
+from data import db
+from data.models import TransactionType
+from data.money import CENTS_PER_UNIT
+from utility import qt_util
+
+QML_IMPORT_NAME = "PFM.Models"
+QML_IMPORT_MAJOR_VERSION = 1
+
+# Create logger for context
+logger = logging.getLogger(__name__)
+
+
+class Series(StrEnum):
+    """Aggregated series a ChartSeriesModel can expose."""
+
+    DAILY = "daily"  # Income and expense per day of month
+    MONTHLY = "monthly"  # Income and expense per month of year
+    CATEGORIES = "categories"  # Total per category of category_type in year
+
+
+@QmlElement
+class ChartSeriesModel(QAbstractListModel):
+    """Aggregated chart data as a list model, one row per day, month or category.
+
+    Meant to be drawn natively in QML (Qt Graphs, QtCharts or plain items). Series are aggregated
+    on a background thread while loading is true, property changes made together (e.g. while qml
+    creates the model) are loaded once. Loaded series update the rows in place (dataChanged), rows
+    are only inserted or removed when the number of days or categories changes.
+    """
+
+    series_changed = Signal()
+    year_changed = Signal()
+    month_changed = Signal()
+    category_type_changed = Signal()
+    values_changed = Signal()
+    _points_loaded = Signal(int, object)  # Request id, points (None if loading failed)
+
+    # whether the series is being loaded, the rows are still of the previous one
+    loading, _get_loading, _set_loading, loading_changed = qt_util.qt_property(
+        bool,
+        "loading",
+        "loading_changed",
+    )
+
+    @QEnum
+    class SeriesRole(IntEnum):
+        """Roles coresponding to model data."""
+
+        LabelRole = Qt.ItemDataRole.DisplayRole
+        IncomeRole = Qt.ItemDataRole.UserRole + 1
+        ExpenseRole = Qt.ItemDataRole.UserRole + 2
+        ValueRole = Qt.ItemDataRole.UserRole + 3
+
+    @dataclass
+    class Point:
+        """Data structure for a point of the series, amounts are in currency units."""
+
+        label: str
+        income: float
+        expense: float
+        value: float  # Net flow (income - expense), or the category total
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        today = datetime.datetime.now().astimezone().date()  # use local time zone
+
+        self._series = Series.MONTHLY
+        self._year = today.year
+        self._month = today.month
+        self._category_type = TransactionType.EXPENSE
+        self._points: list[ChartSeriesModel.Point] = []
+
+        self._load_pool = QThreadPool(self)  # Waits for running loads when destroyed
+        self._load_pool.setMaxThreadCount(1)
+        self._points_loaded.connect(self._on_points_loaded)  # Queued, loads emit it from the pool
+
+        self._loading = False
+        self._load_scheduled = False
+        self._request_id = 0  # Identifies the latest load, results of earlier ones are dropped
+        self.update_model()
+
+    def _get_series(self) -> str:
+        return self._series.value
+
+    def _set_series(self, value: str) -> None:
+        try:
+            series = Series(value.lower())
+        except ValueError:
+            logger.exception("Failed to set series value: %s", value)
+            return
+
+        if self._series != series:
+            self._series = series
+            self.update_model()
+            self.series_changed.emit()
+
+    series = Property(str, _get_series, _set_series, notify=series_changed)  # type: ignore  # noqa: PGH003
+
+    def _get_year(self) -> int:
+        return self._year
+
+    def _set_year(self, value: int) -> None:
+        if self._year != value:
+            self._year = value
+            self.update_model()
+            self.year_changed.emit()
+
+    year = Property(int, _get_year, _set_year, notify=year_changed)  # type: ignore  # noqa: PGH003
+
+    def _get_month(self) -> int:
+        return self._month
+
+    def _set_month(self, value: int) -> None:
+        if not 1 <= value <= 12:  # noqa: PLR2004
+            logger.error("Failed to set month value: %s", value)
+            return
+
+        if self._month != value:
+            self._month = value
+
+            if self._series == Series.DAILY:
+                self.update_model()
+
+            self.month_changed.emit()
+
+    month = Property(int, _get_month, _set_month, notify=month_changed)  # type: ignore  # noqa: PGH003
+
+    def _get_category_type(self) -> str:
+        return self._category_type.value
+
+    def _set_category_type(self, value: str) -> None:
+        try:
+            category_type = TransactionType(value.lower())
+        except ValueError:
+            logger.exception("Failed to set category_type value: %s", value)
+            return
+
+        if self._category_type != category_type:
+            self._category_type = category_type
+
+            if self._series == Series.CATEGORIES:
+                self.update_model()
+
+            self.category_type_changed.emit()
+
+    category_type = Property(  # transaction type of the categories series
+        str,
+        _get_category_type,
+        _set_category_type,
+        notify=category_type_changed,  # type: ignore  # noqa: PGH003
+    )
+
+    def _get_maximum(self) -> float:
+        """Get the largest amount in the series, for scaling axes."""
+        return max(
+            (max(point.income, point.expense, point.value) for point in self._points),
+            default=0.0,
+        )
+
+    maximum = Property(float, _get_maximum, notify=values_changed)  # type: ignore  # noqa: PGH003
+
+    def _start_load(self) -> None:
+        """Start loading the current series on the load thread pool."""
+        self._load_scheduled = False
+        self._request_id += 1  # Supersedes pending loads
+        request_id = self._request_id
+        args = (self._series, self._year, self._month, self._category_type)
+
+        self._set_loading(True)  # noqa: FBT003
+        self._load_pool.start(lambda: self._load(request_id, *args))
+
+    def _load(
+        self,
+        request_id: int,
+        series: Series,
+        year: int,
+        month: int,
+        category_type: TransactionType,
+    ) -> None:
+        """Load a series and report it. Runs on the load thread pool."""
+        points = None
+
+        try:
+            points = self._load_points(series, year, month, category_type)
+        except Exception:
+            logger.exception("Failed to load %s chart series of %d-%02d", series, year, month)
+        finally:
+            db.remove_thread_sessions()
+
+        self._points_loaded.emit(request_id, points)
+
+    def _on_points_loaded(self, request_id: int, points: list[Point] | None) -> None:
+        if request_id != self._request_id:
+            logger.debug("Dropped points of superseded series request %d", request_id)
+            return
+
+        # A failed load shows an empty series rather than the one of the previous period
+        self._show_points(points if points is not None else [])
+        self._set_loading(False)  # noqa: FBT003
+
+    def _show_points(self, points: list[Point]) -> None:
+        """Replace the rows, existing rows are updated in place."""
+        old_count = len(self._points)
+        new_count = len(points)
+
+        if new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            del self._points[new_count:]
+            self.endRemoveRows()
+        elif new_count > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, new_count - 1)
+            self._points.extend(points[old_count:])
+            self.endInsertRows()
+
+        common_count = min(old_count, new_count)
+        self._points[:common_count] = points[:common_count]
+
+        if common_count:
+            self.dataChanged.emit(self.index(0), self.index(common_count - 1))
+
+        self.values_changed.emit()
+
+    @classmethod
+    def _load_points(
+        cls,
+        series: Series,
+        year: int,
+        month: int,
+        category_type: TransactionType,
+    ) -> list[Point]:
+        """Load a series from the database (aggregated in SQL)."""
+        from gen import aggregation  # noqa: PLC0415 # Loaded on first use, keeps numpy out of startup
+
+        if series == Series.CATEGORIES:
+            totals = aggregation.category_totals(year, category_type)
+
+            return [
+                cls.Point(category, 0.0, 0.0, total / CENTS_PER_UNIT)
+                for category, total in zip(totals.categories, totals.totals.tolist(), strict=True)
+            ]
+
+        if series == Series.DAILY:
+            income_expense = aggregation.daily_totals(year, month)
+        else:
+            income_expense = aggregation.monthly_totals(year)
+
+        return [
+            cls.Point(
+                str(i),
+                income / CENTS_PER_UNIT,
+                expense / CENTS_PER_UNIT,
+                (income - expense) / CENTS_PER_UNIT,
+            )
+            for i, (income, expense) in enumerate(
+                zip(income_expense.income.tolist(), income_expense.expense.tolist(), strict=True),
+                start=1,
+            )
+        ]
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: ARG002, B008, N802
+        """Return the number of rows in the model."""
+        return len(self._points)
+
+    def data(self, index: QModelIndex, role: int) -> str | float | None:
+        """Return the data for a given role and index in the model."""
+        row = index.row()
+        s_role = ChartSeriesModel.SeriesRole  # type: ignore  # noqa: PGH003 # Pylance doesn't recognize SeriesRole
+
+        if row < self.rowCount():
+            point = self._points[row]
+
+            if role == s_role.LabelRole:
+                return point.label
+            if role == s_role.IncomeRole:
+                return point.income
+            if role == s_role.ExpenseRole:
+                return point.expense
+            if role == s_role.ValueRole:
+                return point.value
+
+        return None
+
+    def roleNames(self) -> dict[int, QByteArray]:  # noqa: N802
+        """Map role enum values to QByteArray identifiers for QML property access."""
+        roles = super().roleNames()
+        s_role = ChartSeriesModel.SeriesRole  # type: ignore  # noqa: PGH003 # Pylance doesn't recognize SeriesRole
+
+        roles[s_role.LabelRole] = QByteArray(b"label")
+        roles[s_role.IncomeRole] = QByteArray(b"income")
+        roles[s_role.ExpenseRole] = QByteArray(b"expense")
+        roles[s_role.ValueRole] = QByteArray(b"value")
+
+        return roles
+
+    @Slot()
+    def update_model(self) -> None:
+        """Update the model to reflect the current series in the db, loads in the background.
+
+        Calls made before the load starts (in the same event loop iteration) share one load.
+        """
+        if not self._load_scheduled:
+            self._load_scheduled = True
+            QTimer.singleShot(0, self, self._start_load)
+
+    @Slot(list)
+    def update_months(self, months: list[str]) -> None:
+        """Update the model if the series covers one of the given months ("YYYY-MM")."""
+        if self._series == Series.DAILY:
+            affected = f"{self._year}-{self._month:02}" in months
+        else:
+            affected = any(month.startswith(f"{self._year}-") for month in months)
+
+        if affected:
+            self.update_model()
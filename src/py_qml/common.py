@@ -1,4 +1,14 @@
-from typing import NotRequired, TypedDict
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
+
+from PySide6.QtCore import QModelIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable, Iterator
+
+    from PySide6.QtCore import QAbstractListModel
 
 
 class EmptyStringError(ValueError):
@@ -20,3 +30,169 @@ def strip_name(name: str, fallback_msg: str = "Name cannot be empty.") -> str:
         raise EmptyStringError(fallback_msg)
 
     return name
+
+
+def _ranges(indices: list[int]) -> list[tuple[int, int]]:
+    """Group ascending indices into (first, last) ranges of consecutive indices."""
+    ranges: list[tuple[int, int]] = []
+
+    for index in indices:
+        if ranges and ranges[-1][1] == index - 1:
+            ranges[-1] = (ranges[-1][0], index)
+        else:
+            ranges.append((index, index))
+
+    return ranges
+
+
+class SortedRows[T]:
+    """Rows of a list model kept sorted by a key, with lookup of a row's position by its id.
+
+    Keys must be unique (break ties with the row id), so the position of a row is found by
+    bisecting its key and never has to be tracked. Finding, inserting and removing rows takes
+    O(log n) comparisons, list insert/remove still moves the rows after them.
+    """
+
+    def __init__(
+        self,
+        key: Callable[[T], Any],
+        row_id: Callable[[T], Hashable],
+        rows: Iterable[T] = (),
+    ) -> None:
+        self._key = key
+        self._row_id = row_id
+        self._rows = sorted(rows, key=key)
+        self._keys = [key(row) for row in self._rows]
+        self._keys_by_id = {
+            row_id(row): row_key for row, row_key in zip(self._rows, self._keys, strict=True)
+        }
+
+    def __len__(self) -> int:
+        """Get the number of rows."""
+        return len(self._rows)
+
+    def __getitem__(self, index: int) -> T:
+        """Get the row at index."""
+        return self._rows[index]
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over the rows in order."""
+        return iter(self._rows)
+
+    def index_of(self, row_id: Hashable) -> int:
+        """Get the position of the row with row_id, -1 if there is none."""
+        row_key = self._keys_by_id.get(row_id)
+
+        if row_key is None:
+            return -1
+
+        return bisect_left(self._keys, row_key)
+
+    def insert(self, row: T) -> int:
+        """Insert a row at its sorted position, which is returned."""
+        row_key = self._key(row)
+        index = bisect_left(self._keys, row_key)
+
+        self._rows.insert(index, row)
+        self._keys.insert(index, row_key)
+        self._keys_by_id[self._row_id(row)] = row_key
+
+        return index
+
+    def insert_index(self, row: T) -> int:
+        """Get the position a row would be inserted at."""
+        return bisect_left(self._keys, self._key(row))
+
+    def pop(self, index: int) -> T:
+        """Remove and return the row at index."""
+        row = self._rows.pop(index)
+        del self._keys[index]
+        del self._keys_by_id[self._row_id(row)]
+
+        return row
+
+    def replace(self, index: int, row: T) -> bool:
+        """Replace the row at index if row sorts at the same position, return whether it did."""
+        row_key = self._key(row)
+
+        if row_key != self._keys[index]:
+            return False
+
+        del self._keys_by_id[self._row_id(self._rows[index])]
+        self._rows[index] = row
+        self._keys_by_id[self._row_id(row)] = row_key
+
+        return True
+
+    def refresh(self, model: QAbstractListModel, new: SortedRows[T]) -> None:
+        """Change the rows to the rows of new, notifying model of each change.
+
+        Rows are matched by id. Only removed, moved, inserted and changed rows are signalled,
+        so views keep the delegates and scroll position of the rest. Rows must be the rows of
+        model, starting at row 0.
+        """
+        if new is self:
+            return
+
+        parent = QModelIndex()
+
+        # Remove rows that are gone, from the end so the earlier indices stay valid
+        removed = [
+            i for i, row in enumerate(self._rows) if self._row_id(row) not in new._keys_by_id
+        ]
+
+        for first, last in reversed(_ranges(removed)):
+            model.beginRemoveRows(parent, first, last)
+
+            for row in self._rows[first : last + 1]:
+                del self._keys_by_id[self._row_id(row)]
+
+            del self._rows[first : last + 1]
+            del self._keys[first : last + 1]
+            model.endRemoveRows()
+
+        # Move rows whose sort key changed, one at a time so the keys stay sorted
+        for row_id, old_key in list(self._keys_by_id.items()):
+            new_key = new._keys_by_id[row_id]
+
+            if new_key == old_key:
+                continue
+
+            source = bisect_left(self._keys, old_key)
+            destination = bisect_left(self._keys, new_key)  # Index before the move
+            self._keys_by_id[row_id] = new_key
+
+            if destination in (source, source + 1):
+                self._keys[source] = new_key  # Stays in place
+                continue
+
+            model.beginMoveRows(parent, source, source, parent, destination)
+            row = self._rows.pop(source)
+            del self._keys[source]
+            target = destination - 1 if destination > source else destination
+            self._rows.insert(target, row)
+            self._keys.insert(target, new_key)
+            model.endMoveRows()
+
+        # Insert new rows, every other row is at its final index already
+        inserted = [
+            i for i, row in enumerate(new._rows) if self._row_id(row) not in self._keys_by_id
+        ]
+
+        for first, last in _ranges(inserted):
+            model.beginInsertRows(parent, first, last)
+
+            for index in range(first, last + 1):
+                row = new._rows[index]
+                self._rows.insert(index, row)
+                self._keys.insert(index, new._keys[index])
+                self._keys_by_id[self._row_id(row)] = new._keys[index]
+
+            model.endInsertRows()
+
+        # Replace the rows with the new ones, then signal the ones that changed
+        changed = [i for i, row in enumerate(new._rows) if row != self._rows[i]]
+        self._rows = list(new._rows)  # Not shared, new may be modified independently
+
+        for first, last in _ranges(changed):
+            model.dataChanged.emit(model.index(first, 0), model.index(last, 0))
@@ -1,8 +1,9 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
 from enum import IntEnum
+from operator import attrgetter
 from typing import NotRequired, TypedDict, cast
 
 from PySide6.QtCore import (
@@ -21,7 +22,7 @@ from sqlalchemy import delete, select
 from data import db, models, monthly_gen
 from data.models import Transaction, TransactionType
 from data.monthly_gen import GenerationError
-from py_qml.common import EmptyStringError, OperationResult, strip_name
+from py_qml.common import EmptyStringError, OperationResult, SortedRows, strip_name
 
 QML_IMPORT_NAME = "PFM.Models"
 QML_IMPORT_MAJOR_VERSION = 1
@@ -45,9 +46,9 @@ class MonthlyTransactionModel(QAbstractListModel):
         EndDateRole = Qt.ItemDataRole.UserRole + 6
         DayOfMonthRole = Qt.ItemDataRole.UserRole + 7
 
-    @dataclass
+    @dataclass(slots=True)
     class MonthlyTransaction:
-        """Data structure for recurring transactions."""
+        """Data structure for recurring transactions, display values are computed once."""
 
         id: int
         name: str
@@ -57,12 +58,48 @@ class MonthlyTransactionModel(QAbstractListModel):
         start_date: date
         end_date: date | None
         day_of_month: int
+        amount_text: str = field(init=False)
+        q_start_date: QDate = field(init=False)
+        q_end_date: QDate | None = field(init=False)
+
+        def __post_init__(self) -> None:
+            """Compute the display values."""
+            self.amount_text = str(self.amount)
+            self.q_start_date = QDate(
+                self.start_date.year,
+                self.start_date.month,
+                self.start_date.day,
+            )
+            self.q_end_date = (
+                QDate(self.end_date.year, self.end_date.month, self.end_date.day)
+                if self.end_date
+                else None
+            )
+
+    @staticmethod
+    def _sort_key(monthly_transaction: MonthlyTransaction) -> tuple[str, int]:
+        """Name (case insensitive) first, then created first."""
+        return monthly_transaction.name.lower(), monthly_transaction.id
 
     def __init__(self, parent: QObject | None = None) -> None:
         super().__init__(parent)
+
+        # Role to row value getters, so data() does not build anything per call
+        mt_role = MonthlyTransactionModel.MonthlyTransactionRole  # type: ignore  # noqa: PGH003 # Pylance doesn't recognize TransactionRole
+        self._role_getters = {
+            mt_role.IdRole: attrgetter("id"),
+            mt_role.NameRole: attrgetter("name"),
+            mt_role.AmountRole: attrgetter("amount_text"),
+            mt_role.CategoryRole: attrgetter("category"),
+            mt_role.TypeRole: attrgetter("type.value"),
+            mt_role.StartDateRole: attrgetter("q_start_date"),
+            mt_role.EndDateRole: attrgetter("q_end_date"),
+            mt_role.DayOfMonthRole: attrgetter("day_of_month"),
+        }
+
         self._monthly_transactions = self._load_monthly_transactions()
 
-    def _load_monthly_transactions(self) -> list[MonthlyTransaction]:
+    def _load_monthly_transactions(self) -> SortedRows[MonthlyTransaction]:
         with db.create_session() as session:
             stmt = select(models.MonthlyTransaction)
 
@@ -81,17 +118,7 @@ class MonthlyTransactionModel(QAbstractListModel):
             ]
 
         # return sorted monthly transactions by name
-        return sorted(monthly_transactions, key=lambda x: x.name)
-
-    def _get_insert_index(self, name: str) -> int:
-        insert_index = len(self._monthly_transactions)
-
-        for i, transaction in enumerate(self._monthly_transactions):
-            if transaction.name.lower() > name.lower():
-                insert_index = i
-                break
-
-        return insert_index
+        return SortedRows(self._sort_key, attrgetter("id"), monthly_transactions)
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: ARG002, B008, N802
         """Return the number of rows in the model."""
@@ -100,36 +127,10 @@ class MonthlyTransactionModel(QAbstractListModel):
     def data(self, index: QModelIndex, role: int) -> str | QDate | int | None:
         """Return the data for a given role and index in the model."""
         row = index.row()
-        mt_role = MonthlyTransactionModel.MonthlyTransactionRole  # type: ignore  # noqa: PGH003 # Pylance doesn't recognize TransactionRole
-
-        if row < self.rowCount():
-            monthly_transaction = self._monthly_transactions[row]
-
-            data = {
-                mt_role.IdRole: monthly_transaction.id,
-                mt_role.NameRole: monthly_transaction.name,
-                mt_role.AmountRole: str(monthly_transaction.amount),
-                mt_role.CategoryRole: monthly_transaction.category,
-                mt_role.TypeRole: monthly_transaction.type.value,
-                mt_role.StartDateRole: QDate(
-                    monthly_transaction.start_date.year,
-                    monthly_transaction.start_date.month,
-                    monthly_transaction.start_date.day,
-                ),
-                mt_role.EndDateRole: (
-                    QDate(
-                        monthly_transaction.end_date.year,
-                        monthly_transaction.end_date.month,
-                        monthly_transaction.end_date.day,
-                    )
-                    if monthly_transaction.end_date
-                    else None
-                ),
-                mt_role.DayOfMonthRole: monthly_transaction.day_of_month,
-            }
+        getter = self._role_getters.get(role)
 
-            if role in data:
-                return data[role]
+        if getter is not None and row < len(self._monthly_transactions):
+            return getter(self._monthly_transactions[row])
 
         return None
 
@@ -151,10 +152,11 @@ class MonthlyTransactionModel(QAbstractListModel):
 
     @Slot()
     def update_model(self) -> None:
-        """Update the model to reflect current monthly transactions in the db."""
-        self.beginResetModel()
-        self._monthly_transactions = self._load_monthly_transactions()
-        self.endResetModel()
+        """Update the model to reflect current monthly transactions in the db.
+
+        Only changed rows are signalled, so views keep their delegates and scroll position.
+        """
+        self._monthly_transactions.refresh(self, self._load_monthly_transactions())
 
     class OptionalEndDate(TypedDict):
         """Optional end date type for monthly transactions."""
@@ -218,22 +220,20 @@ class MonthlyTransactionModel(QAbstractListModel):
 
             # Update data model
 
-            insert_index = self._get_insert_index(name)
+            model_monthly_transaction = self.MonthlyTransaction(
+                monthly_transaction_id,
+                name,
+                decimal_amount,
+                category,
+                transaction_type_enum,
+                py_start_date,
+                py_end_date if py_end_date else None,
+                day_of_month,
+            )
+            insert_index = self._monthly_transactions.insert_index(model_monthly_transaction)
 
             self.beginInsertRows(QModelIndex(), insert_index, insert_index)
-            self._monthly_transactions.insert(
-                insert_index,
-                self.MonthlyTransaction(
-                    monthly_transaction_id,
-                    name,
-                    decimal_amount,
-                    category,
-                    transaction_type_enum,
-                    py_start_date,
-                    py_end_date if py_end_date else None,
-                    day_of_month,
-                ),
-            )
+            self._monthly_transactions.insert(model_monthly_transaction)
             self.endInsertRows()
 
             # Attempt to generate transactions for the new monthly transaction
@@ -398,32 +398,44 @@ class MonthlyTransactionModel(QAbstractListModel):
 
                 # Update data model object
 
-                model_monthly_transaction = next(
-                    (m_t for m_t in self._monthly_transactions if m_t.id == monthly_transaction_id),
-                )
-
-                model_monthly_transaction.name = name
-                model_monthly_transaction.amount = decimal_amount
-                model_monthly_transaction.category = category
-                model_monthly_transaction.type = transaction_type_enum
-                model_monthly_transaction.start_date = py_start_date
-                model_monthly_transaction.end_date = py_end_date
-                model_monthly_transaction.day_of_month = day_of_month
+                row_index = self._monthly_transactions.index_of(monthly_transaction_id)
 
-                # Remove from current position
-                row_index = self._monthly_transactions.index(model_monthly_transaction)
-                self.beginRemoveRows(QModelIndex(), row_index, row_index)
-                self._monthly_transactions.pop(row_index)
-                self.endRemoveRows()
-
-                # Calculate new position in list
+                # Replaced, its display values depend on the fields
+                model_monthly_transaction = self.MonthlyTransaction(
+                    monthly_transaction_id,
+                    name,
+                    decimal_amount,
+                    category,
+                    transaction_type_enum,
+                    py_start_date,
+                    py_end_date,
+                    day_of_month,
+                )
 
-                insert_index = self._get_insert_index(name)
+                if row_index == -1:
+                    logger.debug(
+                        "Monthly transaction with id %d is not in the model",
+                        monthly_transaction_id,
+                    )
+                elif self._monthly_transactions.replace(row_index, model_monthly_transaction):
+                    # Name unchanged, notify QML about the changes
+                    model_index = self.index(row_index, 0)
+                    self.dataChanged.emit(model_index, model_index)
+                else:
+                    # Remove from current position
+                    self.beginRemoveRows(QModelIndex(), row_index, row_index)
+                    self._monthly_transactions.pop(row_index)
+                    self.endRemoveRows()
+
+                    # Calculate new position in list
+                    insert_index = self._monthly_transactions.insert_index(
+                        model_monthly_transaction,
+                    )
 
-                # Insert at new position
-                self.beginInsertRows(QModelIndex(), insert_index, insert_index)
-                self._monthly_transactions.insert(insert_index, model_monthly_transaction)
-                self.endInsertRows()
+                    # Insert at new position
+                    self.beginInsertRows(QModelIndex(), insert_index, insert_index)
+                    self._monthly_transactions.insert(model_monthly_transaction)
+                    self.endInsertRows()
 
         except EmptyStringError as e:
             logger.exception("Failed to edit monthly transaction")
@@ -495,17 +507,12 @@ class MonthlyTransactionModel(QAbstractListModel):
 
                 # Update data model
 
-                index = next(
-                    (
-                        i
-                        for i, mt in enumerate(self._monthly_transactions)
-                        if mt.id == monthly_transaction_id
-                    ),
-                )
+                index = self._monthly_transactions.index_of(monthly_transaction_id)
 
-                self.beginRemoveRows(QModelIndex(), index, index)
-                self._monthly_transactions.pop(index)
-                self.endRemoveRows()
+                if index != -1:
+                    self.beginRemoveRows(QModelIndex(), index, index)
+                    self._monthly_transactions.pop(index)
+                    self.endRemoveRows()
 
         except Exception:
             logger.exception("Failed to remove monthly transaction")
@@ -0,0 +1,327 @@
+import logging
+from collections.abc import Iterable
+from datetime import date
+from operator import attrgetter
+
+from PySide6.QtCore import (
+    Property,
+    QAbstractListModel,
+    QByteArray,
+    QDate,
+    QModelIndex,
+    QObject,
+    QThreadPool,
+    QTimer,
+    Signal,
+    Slot,
+)
+from PySide6.QtQml import QmlElement
+from sqlalchemy import and_, or_, select, tuple_
+
+from data import db, models
+from py_qml.common import SortedRows
+from py_qml.transaction_model import TransactionModel
+
+QML_IMPORT_NAME = "PFM.Models"
+QML_IMPORT_MAJOR_VERSION = 1
+
+# Create logger for context
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 200  # Transactions per fetch
+
+Transaction = TransactionModel.Transaction
+
+
+def _ledger_key(transaction: Transaction) -> tuple[int, int]:
+    """Latest date first, then latest created first."""
+    return -transaction.date.toordinal(), -transaction.id
+
+
+def _month_of(day: date) -> str:
+    """Get the month of day as "YYYY-MM"."""
+    return f"{day.year}-{day.month:02}"
+
+
+def _month_range(month: str) -> tuple[date, date]:
+    """Get the first day of a month ("YYYY-MM") and the first day of the month after it."""
+    year, month_number = int(month[:4]), int(month[5:7])
+    next_year, next_month = divmod(year * 12 + month_number, 12)
+    return date(year, month_number, 1), date(next_year, next_month + 1, 1)
+
+
+@QmlElement
+class TransactionLedgerModel(QAbstractListModel):
+    """Full transaction history (newest first), fetched a page at a time as views scroll.
+
+    Pages use keyset pagination on (execution_date, id): a page starts right after the last
+    loaded transaction, so every page costs the same however deep into the history it is, and
+    only scrolled to transactions are kept in memory. Roles are the ones of TransactionModel.
+
+    Written months are reloaded on a background thread, only while the model is active (its
+    view is shown). Changes made while inactive are reloaded once it becomes active.
+    """
+
+    active_changed = Signal()
+    # Request id, reloaded months, oldest reloaded transaction, transactions (None if it failed)
+    _rows_loaded = Signal(int, object, object, object)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+
+        # Role to row value getters, so data() does not build anything per call
+        t_role = TransactionModel.TransactionRole  # type: ignore  # noqa: PGH003 # Pylance doesn't recognize TransactionRole
+        self._role_getters = {
+            t_role.IdRole: attrgetter("id"),
+            t_role.NameRole: attrgetter("name"),
+            t_role.AmountRole: attrgetter("amount_text"),
+            t_role.DateRole: attrgetter("q_date"),
+            t_role.CategoryRole: attrgetter("category"),
+            t_role.TypeRole: attrgetter("type.value"),
+        }
+
+        self._transactions: SortedRows[Transaction] = SortedRows(_ledger_key, attrgetter("id"))
+        self._exhausted = False  # All transactions are loaded
+        self._active = False
+
+        # Months ("YYYY-MM") to reload, None for all fetched transactions
+        self._stale_months: set[str] | None = set()
+        self._loading_months: set[str] | None = set()  # Months of the running reload
+        self._reload_scheduled = False
+        self._request_id = 0  # Identifies the latest reload, results of earlier ones are dropped
+
+        self._load_pool = QThreadPool(self)  # Waits for running reloads when destroyed
+        self._load_pool.setMaxThreadCount(1)
+        self._rows_loaded.connect(self._on_rows_loaded)  # Queued, reloads emit it from the pool
+
+    def _get_active(self) -> bool:
+        return self._active
+
+    def _set_active(self, value: bool) -> None:  # noqa: FBT001
+        if self._active != value:
+            self._active = value
+            self.active_changed.emit()
+            self._schedule_reload()
+
+    active = Property(  # whether the view is shown, written months are only reloaded if it is
+        bool,
+        _get_active,
+        _set_active,
+        notify=active_changed,  # type: ignore  # noqa: PGH003
+    )
+
+    @staticmethod
+    def _load(
+        older_than: Transaction | None = None,
+        down_to: Transaction | None = None,
+        limit: int | None = PAGE_SIZE,
+        months: Iterable[str] | None = None,
+    ) -> list[Transaction]:
+        """Load transactions (newest first) older than one transaction, or down to one.
+
+        months ("YYYY-MM") restricts them to the given months, None is all months.
+        """
+        transaction = models.Transaction
+        key = tuple_(transaction.execution_date, transaction.id)
+        stmt = (
+            select(transaction)
+            .order_by(transaction.execution_date.desc(), transaction.id.desc())
+            .limit(limit)
+        )
+
+        # Compared as row values, which SQLite answers with an index range scan
+        if older_than is not None:
+            stmt = stmt.where(key < tuple_(older_than.date, older_than.id))
+
+        if down_to is not None:
+            stmt = stmt.where(key >= tuple_(down_to.date, down_to.id))
+
+        if months is not None:
+            stmt = stmt.where(
+                or_(
+                    *(
+                        and_(transaction.execution_date >= start, transaction.execution_date < end)
+                        for start, end in map(_month_range, months)
+                    ),
+                ),
+            )
+
+        with db.read_session() as session:
+            return [
+                Transaction(
+                    row.id,
+                    row.name,
+                    row.amount,
+                    row.execution_date,
+                    row.category,
+                    row.transaction_type,
+                )
+                for row in session.scalars(stmt).all()
+            ]
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:  # noqa: B008, N802
+        """Return whether older transactions are left to fetch."""
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:  # noqa: B008, N802
+        """Fetch the next page of older transactions, called by views as they scroll."""
+        if parent.isValid() or self._exhausted:
+            return
+
+        last = self._transactions[-1] if len(self._transactions) else None
+        page = self._load(older_than=last)
+        self._exhausted = len(page) < PAGE_SIZE
+
+        if page:
+            first = len(self._transactions)
+
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+
+            for transaction in page:
+                self._transactions.insert(transaction)
+
+            self.endInsertRows()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: ARG002, B008, N802
+        """Return the number of fetched rows."""
+        return len(self._transactions)
+
+    def data(self, index: QModelIndex, role: int) -> str | QDate | int | None:
+        """Return the data for a given role and index in the model."""
+        row = index.row()
+        getter = self._role_getters.get(role)
+
+        if getter is not None and row < len(self._transactions):
+            return getter(self._transactions[row])
+
+        return None
+
+    def roleNames(self) -> dict[int, QByteArray]:  # noqa: N802
+        """Map role enum values to QByteArray identifiers for QML property access."""
+        roles = super().roleNames()
+        t_role = TransactionModel.TransactionRole  # type: ignore  # noqa: PGH003 # Pylance doesn't recognize TransactionRole
+
+        roles[t_role.IdRole] = QByteArray(b"index")  # not to be confused with qml Ids
+        roles[t_role.NameRole] = QByteArray(b"name")
+        roles[t_role.AmountRole] = QByteArray(b"amount")
+        roles[t_role.DateRole] = QByteArray(b"date")
+        roles[t_role.CategoryRole] = QByteArray(b"category")
+        roles[t_role.TypeRole] = QByteArray(b"type")
+
+        return roles
+
+    def _schedule_reload(self) -> None:
+        """Reload the stale months soon if the model is active.
+
+        Calls made before the reload starts (in the same event loop iteration) share one reload.
+        """
+        if self._active and not self._reload_scheduled:
+            self._reload_scheduled = True
+            QTimer.singleShot(0, self, self._start_reload)
+
+    def _start_reload(self) -> None:
+        """Start reloading the stale months down to the oldest fetched transaction."""
+        self._reload_scheduled = False
+        months = self._stale_months
+
+        if not self._active or months == set():
+            return  # Reloaded once active, or nothing to reload
+
+        self._stale_months = set()
+
+        if not len(self._transactions):
+            # Nothing fetched to reload, fetch the first page instead
+            self._exhausted = False
+            self.fetchMore()
+            return
+
+        # A running reload is superseded, its months are reloaded with this one
+        if months is not None and self._loading_months is not None:
+            months |= self._loading_months
+
+        self._loading_months = months
+        self._request_id += 1
+        request_id = self._request_id
+        down_to = self._transactions[-1]
+        self._load_pool.start(lambda: self._reload(request_id, months, down_to))
+
+    def _reload(self, request_id: int, months: set[str] | None, down_to: Transaction) -> None:
+        """Load the transactions of months down to one and report them. Runs on the load pool."""
+        transactions = None
+
+        try:
+            transactions = self._load(down_to=down_to, limit=None, months=months)
+        except Exception:
+            logger.exception("Failed to reload the transaction ledger")
+        finally:
+            db.remove_thread_sessions()
+
+        self._rows_loaded.emit(request_id, months, down_to, transactions)
+
+    def _on_rows_loaded(
+        self,
+        request_id: int,
+        months: set[str] | None,
+        down_to: Transaction,
+        transactions: list[Transaction] | None,
+    ) -> None:
+        if request_id != self._request_id:
+            logger.debug("Dropped transactions of superseded ledger reload %d", request_id)
+            return
+
+        self._loading_months = set()
+
+        if transactions is None:
+            return  # The rows stay as they were, the failure is logged
+
+        # Rows fetched by scrolling while the reload ran are older than down_to and kept
+        down_to_key = _ledger_key(down_to)
+        reloaded_ids = {transaction.id for transaction in transactions}
+        kept = (
+            transaction
+            for transaction in self._transactions
+            if transaction.id not in reloaded_ids
+            and (
+                _ledger_key(transaction) > down_to_key
+                or (months is not None and _month_of(transaction.date) not in months)
+            )
+        )
+
+        self._transactions.refresh(
+            self,
+            SortedRows(_ledger_key, attrgetter("id"), [*kept, *transactions]),
+        )
+
+        if months is None:
+            self._exhausted = False  # Older transactions may have been added, fetched by scrolling
+
+    @Slot()
+    def update_model(self) -> None:
+        """Update the fetched transactions to reflect the db, in the background once active.
+
+        Reloads down to the oldest fetched transaction, older ones are fetched by scrolling. Only
+        changed rows are signalled.
+        """
+        self._stale_months = None
+        self._schedule_reload()
+
+    @Slot(list)
+    def update_months(self, months: list[str]) -> None:
+        """Update the fetched transactions of the given months ("YYYY-MM").
+
+        Like update_model, but only the transactions of the given months are reloaded.
+        """
+        if not len(self._transactions):
+            self.update_model()
+            return
+
+        oldest_month = _month_of(self._transactions[-1].date)
+
+        if self._exhausted and any(month < oldest_month for month in months):
+            self._exhausted = False  # Older transactions were added, fetched by scrolling
+
+        fetched_months = {month for month in months if month >= oldest_month}
+
+        if fetched_months and self._stale_months is not None:
+            self._stale_months |= fetched_months
+            self._schedule_reload()
@@ -1,9 +1,13 @@
 import datetime
 import logging
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
 from enum import IntEnum
+from operator import attrgetter
 from typing import cast
 
 from PySide6.QtCore import (
@@ -15,6 +19,7 @@ from PySide6.QtCore import (
     QModelIndex,
     QObject,
     Qt,
+    QThreadPool,
     Signal,
     Slot,
 )
@@ -22,8 +27,9 @@ from PySide6.QtQml import QmlElement
 from sqlalchemy import select
 
 from data import db, models
-from data.models import TransactionType
-from py_qml.common import EmptyStringError, OperationResult, strip_name
+from data.models import DataVersion, TransactionType
+from py_qml.common import EmptyStringError, OperationResult, SortedRows, strip_name
+from utility import qt_util
 
 QML_IMPORT_NAME = "PFM.Models"
 QML_IMPORT_MAJOR_VERSION = 1
@@ -31,10 +37,76 @@ QML_IMPORT_MAJOR_VERSION = 1
 # Create logger for context
 logger = logging.getLogger(__name__)
 
+_PAGE_CACHE_SIZE = 12  # Months
+_LOAD_PRIORITY = 1  # Loads of the shown month run before queued prefetches
+
+
+def _month_start(day: date, months: int = 0) -> date:
+    """Get the first day of the month months after (or before) the month of day."""
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+class _MonthPages[T]:
+    """Least recently used month pages, safe to use from any thread.
+
+    A page is only valid for the data version it was loaded at, any write invalidates it.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._lock = threading.Lock()
+        self._pages: OrderedDict[date, tuple[int, T]] = OrderedDict()
+        self._pending: set[date] = set()  # Months being prefetched
+        self._size = size
+
+    def get(self, month: date, version: int) -> T | None:
+        with self._lock:
+            cached = self._pages.get(month)
+
+            if cached is None or cached[0] != version:
+                return None
+
+            self._pages.move_to_end(month)
+            return cached[1]
+
+    def put(self, month: date, version: int, page: T) -> None:
+        with self._lock:
+            self._pages[month] = (version, page)
+            self._pages.move_to_end(month)
+
+            while len(self._pages) > self._size:
+                self._pages.popitem(last=False)
+
+    def reserve(self, month: date, version: int) -> bool:
+        """Mark a month as being prefetched, unless it is cached at version or already pending."""
+        with self._lock:
+            cached = self._pages.get(month)
+
+            if month in self._pending or (cached is not None and cached[0] == version):
+                return False
+
+            self._pending.add(month)
+            return True
+
+    def release(self, month: date) -> None:
+        with self._lock:
+            self._pending.discard(month)
+
 
 @QmlElement
 class TransactionModel(QAbstractListModel):
+    """Transactions of the current month.
+
+    Months are shown from a page cache when possible, otherwise they are loaded on a background
+    thread while loading is true. Cached pages are checked against the database in the background
+    too, the GUI thread never reads the database to show a month.
+    """
+
     current_month_changed = Signal()
+    # Transactions were written, through this model or elsewhere. Carries the written months
+    # ("YYYY-MM"), empty if any month may have changed.
+    transactions_changed = Signal(list)
+    _month_loaded = Signal(int, int, object)  # Request id, data version, transactions (or None)
 
     def _get_current_month(self) -> QDate:
         """Get the current month (qml side)."""
@@ -43,32 +115,26 @@ class TransactionModel(QAbstractListModel):
 
     current_month = Property(QDate, _get_current_month, notify=current_month_changed)  # type: ignore  # noqa: PGH003
 
+    # whether the current month is being loaded, the rows are still of the previous one
+    loading, _get_loading, _set_loading, loading_changed = qt_util.qt_property(
+        bool,
+        "loading",
+        "loading_changed",
+    )
+
     @Slot()
     def next_month(self) -> None:
         """Move to the next month."""
-        year = self._current_month.year + (1 if self._current_month.month == 12 else 0)  # noqa: PLR2004
-        month = 1 if self._current_month.month == 12 else self._current_month.month + 1  # noqa: PLR2004
-        self._current_month = date(year, month, 1)
-
-        # Update model state
-        self.beginResetModel()
-        self._transactions = self._load_transactions()
-        self.endResetModel()
-
-        self.current_month_changed.emit()
+        self._show_month(_month_start(self._current_month, 1))
 
     @Slot()
     def previous_month(self) -> None:
         """Move to the previous month."""
-        year = self._current_month.year - (1 if self._current_month.month == 1 else 0)
-        month = 12 if self._current_month.month == 1 else self._current_month.month - 1
-        self._current_month = date(year, month, 1)
-
-        # Update model state
-        self.beginResetModel()
-        self._transactions = self._load_transactions()
-        self.endResetModel()
+        self._show_month(_month_start(self._current_month, -1))
 
+    def _show_month(self, month: date) -> None:
+        self._current_month = month
+        self._load_transactions()
         self.current_month_changed.emit()
 
     @QEnum
@@ -82,9 +148,9 @@ class TransactionModel(QAbstractListModel):
         CategoryRole = Qt.ItemDataRole.UserRole + 4
         TypeRole = Qt.ItemDataRole.UserRole + 5
 
-    @dataclass
+    @dataclass(slots=True)
     class Transaction:
-        """Data structure for individual transaction."""
+        """Data structure for individual transaction, display values are computed once."""
 
         id: int
         name: str
@@ -92,31 +158,180 @@ class TransactionModel(QAbstractListModel):
         date: date
         category: str
         type: TransactionType
+        amount_text: str = field(init=False)
+        q_date: QDate = field(init=False)
+
+        def __post_init__(self) -> None:
+            """Compute the display values."""
+            self.amount_text = str(self.amount)
+            self.q_date = QDate(self.date.year, self.date.month, self.date.day)
+
+    @staticmethod
+    def _sort_key(transaction: Transaction) -> tuple[int, int]:
+        """Latest day first, then latest created first."""
+        return -transaction.date.day, -transaction.id
 
     def __init__(self, parent: QObject | None = None) -> None:
         super().__init__(parent)
+
+        # Role to row value getters, so data() does not build anything per call
+        t_role = TransactionModel.TransactionRole  # type: ignore  # noqa: PGH003 # Pylance doesn't recognize TransactionRole
+        self._role_getters = {
+            t_role.IdRole: attrgetter("id"),
+            t_role.NameRole: attrgetter("name"),
+            t_role.AmountRole: attrgetter("amount_text"),
+            t_role.DateRole: attrgetter("q_date"),
+            t_role.CategoryRole: attrgetter("category"),
+            t_role.TypeRole: attrgetter("type.value"),
+        }
+
+        self._pages: _MonthPages[SortedRows[TransactionModel.Transaction]] = _MonthPages(
+            _PAGE_CACHE_SIZE,
+        )
+        self._load_pool = QThreadPool(self)  # Waits for running loads when destroyed
+        self._load_pool.setMaxThreadCount(1)
+        self._month_loaded.connect(self._on_month_loaded)  # Queued, loads emit it from the pool
+
         self._current_month = datetime.datetime.now().astimezone().date()  # use local time zone
-        self._transactions = self._load_transactions()
+        self._transactions = self._sorted_rows(())
+        self._shown_month: date | None = None  # Month of the rows
+        self._version = -1  # Data version of the latest load, pages cached at it are shown
+        self._loading = False
+        self._request_id = 0  # Identifies the latest load, results of earlier ones are dropped
+        self._load_transactions()
+
+    def _load_transactions(self) -> None:
+        """Show transactions for current month from the page cache, or start loading them.
+
+        A cached page is shown right away and refreshed if the load finds newer data.
+        """
+        transactions = self._pages.get(_month_start(self._current_month), self._version)
+
+        if transactions is None:
+            self._set_loading(True)  # noqa: FBT003
+        else:
+            self._show_transactions(transactions)
+
+        self._start_load()
+
+    def _start_load(self) -> None:
+        """Start loading the current month, superseding pending loads."""
+        self._request_id += 1
+        request_id = self._request_id
+        month = _month_start(self._current_month)
+        self._load_pool.start(lambda: self._load(request_id, month), _LOAD_PRIORITY)
 
-    def _load_transactions(self) -> list[Transaction]:
-        """Load transactions for current month from the database."""
-        start_of_month = self._current_month.replace(day=1)
+    def _load(self, request_id: int, month: date) -> None:
+        """Load a month into the page cache and report it. Runs on the load thread pool.
 
-        # Calculate first day of next month
-        if self._current_month.month == 12:  # noqa: PLR2004
-            start_of_next_month = date(self._current_month.year + 1, 1, 1)
+        Also starts prefetching the adjacent months.
+        """
+        version = -1
+        transactions = None
+
+        try:
+            # A prefetch may have loaded it while this load was queued
+            version = db.data_version()
+            transactions = self._pages.get(month, version)
+
+            if transactions is None:
+                version, transactions = self._load_month(month)
+                self._pages.put(month, version, transactions)
+
+            self._prefetch_adjacent(month, version)
+        except Exception:
+            logger.exception("Failed to load transactions of %s", month)
+        finally:
+            db.remove_thread_sessions()
+
+        self._month_loaded.emit(request_id, version, transactions)
+
+    def _on_month_loaded(
+        self,
+        request_id: int,
+        version: int,
+        transactions: SortedRows[Transaction] | None,
+    ) -> None:
+        if request_id != self._request_id:
+            logger.debug("Dropped transactions of superseded month request %d", request_id)
+            return
+
+        # Rows shown from the cache at the loaded version are up to date already
+        if transactions is not None and (self._loading or version != self._version):
+            self._version = version
+            self._show_transactions(transactions)
+
+        self._set_loading(False)  # noqa: FBT003
+
+    def _show_transactions(self, transactions: SortedRows[Transaction]) -> None:
+        month = _month_start(self._current_month)
+
+        if month == self._shown_month:
+            # Refresh of the shown month, only signal changed rows to keep delegates and scrolling
+            self._transactions.refresh(self, transactions)
         else:
-            start_of_next_month = date(start_of_month.year, start_of_month.month + 1, 1)
+            # Copy the cached page, the rows are changed in place by writes and refreshes
+            self.beginResetModel()
+            self._transactions = self._sorted_rows(transactions)
+            self._shown_month = month
+            self.endResetModel()
+
+        self._set_loading(False)  # noqa: FBT003
+
+    def _prefetch_adjacent(self, month: date, version: int) -> None:
+        """Load the previous and next month into the page cache in the background.
+
+        Safe to call from the load thread pool.
+        """
+        for adjacent in (_month_start(month, 1), _month_start(month, -1)):
+            if self._pages.reserve(adjacent, version):
+                self._load_pool.start(lambda adjacent=adjacent: self._prefetch(adjacent))
+
+    def _after_write(self, *days: date) -> None:
+        """Reload what a write invalidated: the current month and the adjacent pages.
+
+        A pending load may have read the data before the write, the reload supersedes it. The
+        rows already show the write, the reload only signals what was written elsewhere. days
+        are the dates of the written transactions, before and after the write.
+        """
+        self._start_load()
+        self.transactions_changed.emit(sorted({f"{day.year}-{day.month:02}" for day in days}))
+
+    def _shows_month_of(self, day: date) -> bool:
+        """Check whether the rows are of the month of day.
+
+        While the current month loads, the rows are still of the previously shown month.
+        """
+        return self._shown_month == _month_start(day)
+
+    def _prefetch(self, month: date) -> None:
+        """Load a month into the page cache. Runs on the load thread pool."""
+        try:
+            self._pages.put(month, *self._load_month(month))
+        except Exception:
+            logger.exception("Failed to prefetch transactions of %s", month)
+        finally:
+            self._pages.release(month)
+            db.remove_thread_sessions()
+
+    @classmethod
+    def _load_month(cls, month: date) -> tuple[int, SortedRows[Transaction]]:
+        """Load the transactions of a month from the database, with the data version they are of.
+
+        Both are read in one transaction, so the version always matches the transactions.
+        """
+        start_of_next_month = _month_start(month, 1)
 
         # Grab transactions based on the start/end of the month
-        with db.create_session() as session:
+        with db.read_session() as session, session.begin():
+            version = session.scalars(select(DataVersion.version)).one()
             stmt = select(models.Transaction).where(
-                models.Transaction.execution_date >= start_of_month,
+                models.Transaction.execution_date >= month,
                 models.Transaction.execution_date < start_of_next_month,
             )
 
             transactions = [
-                self.Transaction(
+                cls.Transaction(
                     transaction.id,
                     transaction.name,
                     transaction.amount,
@@ -128,17 +343,11 @@ class TransactionModel(QAbstractListModel):
             ]
 
         # Return sorted transactions by day (descending)
-        return sorted(transactions, key=lambda t: t.date.day, reverse=True)
+        return version, cls._sorted_rows(transactions)
 
-    def _get_insert_index(self, transaction_date: date) -> int:
-        insert_index = len(self._transactions)
-
-        for i, transaction in enumerate(self._transactions):
-            if transaction.date.day <= transaction_date.day:
-                insert_index = i
-                break
-
-        return insert_index
+    @classmethod
+    def _sorted_rows(cls, transactions: Iterable[Transaction]) -> SortedRows[Transaction]:
+        return SortedRows(cls._sort_key, attrgetter("id"), transactions)
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: ARG002, B008, N802
         """Return the number of rows in the model."""
@@ -147,26 +356,10 @@ class TransactionModel(QAbstractListModel):
     def data(self, index: QModelIndex, role: int) -> str | QDate | int | None:
         """Return the data for a given role and index in the model."""
         row = index.row()
-        t_role = TransactionModel.TransactionRole  # type: ignore  # noqa: PGH003 # Pylance doesn't recognize TransactionRole
+        getter = self._role_getters.get(role)
 
-        if row < self.rowCount():
-            transaction = self._transactions[row]
-
-            data = {
-                t_role.IdRole: transaction.id,
-                t_role.NameRole: transaction.name,
-                t_role.AmountRole: str(transaction.amount),
-                t_role.DateRole: QDate(
-                    transaction.date.year,
-                    transaction.date.month,
-                    transaction.date.day,
-                ),
-                t_role.CategoryRole: transaction.category,
-                t_role.TypeRole: transaction.type.value,
-            }
-
-            if role in data:
-                return data[role]
+        if getter is not None and row < len(self._transactions):
+            return getter(self._transactions[row])
 
         return None
 
@@ -186,10 +379,19 @@ class TransactionModel(QAbstractListModel):
 
     @Slot()
     def update_model(self) -> None:
-        """Update the model to reflect current transactions in the db."""
-        self.beginResetModel()
-        self._transactions = self._load_transactions()
-        self.endResetModel()
+        """Update the model to reflect current transactions in the db, loads in the background.
+
+        Only changed rows are signalled, so views keep their delegates and scroll position.
+        Called after transactions were written elsewhere, emits transactions_changed.
+        """
+        self._start_load()
+        self.transactions_changed.emit([])  # The written months are not known
+
+    @Slot(list)
+    def update_months(self, months: list[str]) -> None:
+        """Update the model if the current month is one of the given months ("YYYY-MM")."""
+        if f"{self._current_month.year}-{self._current_month.month:02}" in months:
+            self._start_load()  # Generated transactions are signalled by the generation
 
     @Slot(str, str, QDate, str, str, result=dict)
     def append(
@@ -235,25 +437,22 @@ class TransactionModel(QAbstractListModel):
             )
 
             # Check if data model needs to be updated
-            current_month = self._current_month
+            if self._shows_month_of(py_date):
+                model_transaction = self.Transaction(
+                    id=transaction_id,
+                    name=name,
+                    amount=decimal_amount,
+                    date=py_date,
+                    category=category,
+                    type=transaction_type_enum,
+                )
 
-            if py_date.month == current_month.month and py_date.year == current_month.year:
                 # Get new insertion position
-                insert_index = self._get_insert_index(py_date)
+                insert_index = self._transactions.insert_index(model_transaction)
 
                 # Update data model
                 self.beginInsertRows(QModelIndex(), insert_index, insert_index)
-                self._transactions.insert(
-                    insert_index,
-                    self.Transaction(
-                        id=transaction_id,
-                        name=name,
-                        amount=decimal_amount,
-                        date=py_date,
-                        category=category,
-                        type=transaction_type_enum,
-                    ),
-                )
+                self._transactions.insert(model_transaction)
                 self.endInsertRows()
 
         except EmptyStringError as e:
@@ -263,6 +462,7 @@ class TransactionModel(QAbstractListModel):
             logger.exception("Failed to create transaction")
             return {"success": False, "error": "An unexpected error occurred."}
         else:
+            self._after_write(py_date)
             return {"success": True}
 
     @Slot(int, str, str, QDate, str, str, result=dict)
@@ -302,6 +502,7 @@ class TransactionModel(QAbstractListModel):
                     return self.append(name, amount, date, category, transaction_type)
 
                 # Gather before data for logging
+                old_date = transaction.execution_date
                 before_data = (
                     f"Name: {transaction.name}, "
                     f"Amount: {transaction.amount}, Date: {transaction.execution_date}, "
@@ -331,29 +532,22 @@ class TransactionModel(QAbstractListModel):
             )
 
             # Check if data model needs to be updated
-            model_transaction = next(
-                (t for t in self._transactions if t.id == transaction_id),
-                None,
-            )
+            row_index = self._transactions.index_of(transaction_id)
 
-            if model_transaction:
-                # Check if repositioning is needed
-                row_index = self._transactions.index(model_transaction)
-
-                if (
-                    py_date.month == self._current_month.month
-                    and py_date.year == self._current_month.year
-                ):
-                    date_changed = model_transaction.date != py_date
-
-                    # Update data model object
-                    model_transaction.name = name
-                    model_transaction.amount = decimal_amount
-                    model_transaction.date = py_date
-                    model_transaction.category = category
-                    model_transaction.type = transaction_type_enum
+            if row_index != -1:
+                if self._shows_month_of(py_date):
+                    # Replace data model object, its display values depend on the fields
+                    model_transaction = self.Transaction(
+                        transaction_id,
+                        name,
+                        decimal_amount,
+                        py_date,
+                        category,
+                        transaction_type_enum,
+                    )
 
-                    if not date_changed:
+                    # Check if repositioning is needed
+                    if self._transactions.replace(row_index, model_transaction):
                         # Notify QML about the changes
                         model_index = self.index(  # Qt method that returns a QModelIndex
                             row_index,
@@ -367,12 +561,11 @@ class TransactionModel(QAbstractListModel):
                         self.endRemoveRows()
 
                         # Get new insertion position
-
-                        insert_index = self._get_insert_index(py_date)
+                        insert_index = self._transactions.insert_index(model_transaction)
 
                         # Insert at newly calculated position
                         self.beginInsertRows(QModelIndex(), insert_index, insert_index)
-                        self._transactions.insert(insert_index, model_transaction)
+                        self._transactions.insert(model_transaction)
                         self.endInsertRows()
                 else:
                     # Month changed, transaction no longer on displayed month:
@@ -389,6 +582,7 @@ class TransactionModel(QAbstractListModel):
             logger.exception("Failed to edit transaction")
             return {"success": False, "error": "An unexpected error occurred."}
         else:
+            self._after_write(old_date, py_date)
             return {"success": True}
 
     @Slot(int, result=dict)
@@ -410,18 +604,14 @@ class TransactionModel(QAbstractListModel):
                 )
 
                 # Delete transaction
+                removed_date = to_remove.execution_date
                 session.delete(to_remove)
                 session.commit()
 
             # Check if data model needs to be updated
-            model_transaction = next(
-                (t for t in self._transactions if t.id == transaction_id),
-                None,
-            )
-
-            if model_transaction:
-                index = self._transactions.index(model_transaction)
+            index = self._transactions.index_of(transaction_id)
 
+            if index != -1:
                 # Remove the category from the model
                 self.beginRemoveRows(QModelIndex(), index, index)
                 self._transactions.pop(index)
@@ -434,4 +624,5 @@ class TransactionModel(QAbstractListModel):
             logger.exception("Failed to remove transaction")
             return {"success": False, "error": "An unexpected error occurred."}
         else:
+            self._after_write(removed_date)
             return {"success": True}
@@ -0,0 +1,356 @@
+import logging
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from operator import attrgetter
+from typing import cast
+
+from PySide6.QtCore import (
+    Property,
+    QAbstractListModel,
+    QByteArray,
+    QDate,
+    QModelIndex,
+    QObject,
+    QThreadPool,
+    QTimer,
+    Signal,
+    Slot,
+)
+from PySide6.QtQml import QmlElement
+from sqlalchemy import column, literal_column, or_, select, table
+
+from data import db, models
+from py_qml.transaction_model import TransactionModel
+from utility import qt_util
+
+QML_IMPORT_NAME = "PFM.Models"
+QML_IMPORT_MAJOR_VERSION = 1
+
+# Create logger for context
+logger = logging.getLogger(__name__)
+
+RESULT_LIMIT = 200  # Best ranked transactions shown
+_DEBOUNCE_MS = 150  # Quiet time after the last filter change before searching
+
+Transaction = TransactionModel.Transaction
+
+# Full text index of transaction names and categories, see models.CREATE_TRANSACTIONS_SEARCH
+_transactions_search = table("transactions_search", column("rowid"), column("rank"))
+
+
+def _match_query(text: str) -> str:
+    """Turn search text into an FTS5 query matching every word as a prefix of a word.
+
+    Words are quoted, so FTS5 syntax and punctuation in the text are searched for literally.
+    """
+    words = (word.replace('"', '""') for word in text.split())
+    return " ".join(f'"{word}"*' for word in words)
+
+
+@dataclass(frozen=True)
+class _Filters:
+    """Snapshot of the search filters, None means no bound."""
+
+    text: str
+    start_date: date | None
+    end_date: date | None
+    min_amount: Decimal | None
+    max_amount: Decimal | None
+
+
+_NO_FILTERS = _Filters("", None, None, None, None)
+
+
+def _search(filters: _Filters) -> list[Transaction]:
+    """Get the best matching transactions, by bm25 rank with text and newest first without.
+
+    Without the full text index every word has to be contained in the name or category,
+    newest first.
+    """
+    transaction = models.Transaction
+    match = _match_query(filters.text)
+    stmt = select(transaction).limit(RESULT_LIMIT)
+
+    if match and db.has_search_index():
+        stmt = (
+            stmt.join(_transactions_search, _transactions_search.c.rowid == transaction.id)
+            .where(literal_column("transactions_search").match(match))
+            .order_by(_transactions_search.c.rank, transaction.execution_date.desc())
+        )
+    elif match:
+        stmt = stmt.where(
+            *(
+                or_(
+                    transaction.name.contains(word, autoescape=True),
+                    transaction.category.contains(word, autoescape=True),
+                )
+                for word in filters.text.split()
+            ),
+        ).order_by(transaction.execution_date.desc(), transaction.id.desc())
+    elif filters == _NO_FILTERS:
+        return []  # Nothing to search for
+    else:
+        stmt = stmt.order_by(transaction.execution_date.desc(), transaction.id.desc())
+
+    if filters.start_date is not None:
+        stmt = stmt.where(transaction.execution_date >= filters.start_date)
+
+    if filters.end_date is not None:
+        stmt = stmt.where(transaction.execution_date <= filters.end_date)
+
+    if filters.min_amount is not None:
+        stmt = stmt.where(transaction.amount >= filters.min_amount)
+
+    if filters.max_amount is not None:
+        stmt = stmt.where(transaction.amount <= filters.max_amount)
+
+    with db.read_session() as session:
+        return [
+            Transaction(
+                row.id,
+                row.name,
+                row.amount,
+                row.execution_date,
+                row.category,
+                row.transaction_type,
+            )
+            for row in session.scalars(stmt).all()
+        ]
+
+
+@QmlElement
+class TransactionSearchModel(QAbstractListModel):
+    """Transactions matching a text search and optional date and amount filters, best first.
+
+    Every word of the text has to match the start of a word in the name or category of a
+    transaction (full text index, ranked with bm25). If SQLite has no FTS5, words only have
+    to be contained in the name or category and results are newest first. Searches run on a
+    background thread once the filters stop changing for a moment, results of superseded
+    searches are dropped.
+    Roles are the ones of TransactionModel.
+    """
+
+    text_changed = Signal()
+    start_date_changed = Signal()
+    end_date_changed = Signal()
+    min_amount_changed = Signal()
+    max_amount_changed = Signal()
+    _results_ready = Signal(int, object)  # Search id, transactions (None if the search failed)
+
+    # whether a search is pending or running, the rows are of the previous search
+    searching, _get_searching, _set_searching, searching_changed = qt_util.qt_property(
+        bool,
+        "searching",
+        "searching_changed",
+    )
+
+    # whether the latest search failed, the rows are empty then
+    failed, _get_failed, _set_failed, failed_changed = qt_util.qt_property(
+        bool,
+        "failed",
+        "failed_changed",
+    )
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+
+        # Role to row value getters, so data() does not build anything per call
+        t_role = TransactionModel.TransactionRole  # type: ignore  # noqa: PGH003 # Pylance doesn't recognize TransactionRole
+        self._role_getters = {
+            t_role.IdRole: attrgetter("id"),
+            t_role.NameRole: attrgetter("name"),
+            t_role.AmountRole: attrgetter("amount_text"),
+            t_role.DateRole: attrgetter("q_date"),
+            t_role.CategoryRole: attrgetter("category"),
+            t_role.TypeRole: attrgetter("type.value"),
+        }
+
+        self._filters = _NO_FILTERS
+        self._transactions: list[Transaction] = []
+        self._searching = False
+        self._failed = False
+        self._search_id = 0  # Identifies the latest search, results of earlier ones are dropped
+
+        self._search_pool = QThreadPool(self)  # Waits for running searches when destroyed
+        self._search_pool.setMaxThreadCount(1)
+        self._results_ready.connect(self._on_results_ready)  # Queued, emitted from the pool
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._start_search)
+
+    def _set_filters(self, **changes: object) -> None:
+        """Change filters and search once they stop changing."""
+        self._filters = _Filters(**{**self._filters.__dict__, **changes})
+        self._search_id += 1  # Running searches no longer match the filters
+        self._set_searching(True)  # noqa: FBT003
+        self._debounce.start()
+
+    def _get_text(self) -> str:
+        return self._filters.text
+
+    def _set_text(self, value: str) -> None:
+        if self._filters.text != value:
+            self._set_filters(text=value)
+            self.text_changed.emit()
+
+    text = Property(str, _get_text, _set_text, notify=text_changed)  # type: ignore  # noqa: PGH003
+
+    def _get_start_date(self) -> QDate:
+        start_date = self._filters.start_date
+        return QDate(start_date) if start_date else QDate()
+
+    def _set_start_date(self, value: QDate) -> None:
+        start_date = cast("date", value.toPython()) if value.isValid() else None
+
+        if self._filters.start_date != start_date:
+            self._set_filters(start_date=start_date)
+            self.start_date_changed.emit()
+
+    start_date = Property(  # earliest execution date, an invalid date for no bound
+        QDate,
+        _get_start_date,
+        _set_start_date,
+        notify=start_date_changed,  # type: ignore  # noqa: PGH003
+    )
+
+    def _get_end_date(self) -> QDate:
+        end_date = self._filters.end_date
+        return QDate(end_date) if end_date else QDate()
+
+    def _set_end_date(self, value: QDate) -> None:
+        end_date = cast("date", value.toPython()) if value.isValid() else None
+
+        if self._filters.end_date != end_date:
+            self._set_filters(end_date=end_date)
+            self.end_date_changed.emit()
+
+    end_date = Property(  # latest execution date, an invalid date for no bound
+        QDate,
+        _get_end_date,
+        _set_end_date,
+        notify=end_date_changed,  # type: ignore  # noqa: PGH003
+    )
+
+    @staticmethod
+    def _parse_amount(value: str) -> Decimal | None:
+        """Parse an amount filter, empty for no bound. Raises InvalidOperation if invalid."""
+        return Decimal(value) if value.strip() else None
+
+    def _get_min_amount(self) -> str:
+        min_amount = self._filters.min_amount
+        return str(min_amount) if min_amount is not None else ""
+
+    def _set_min_amount(self, value: str) -> None:
+        try:
+            min_amount = self._parse_amount(value)
+        except InvalidOperation:
+            logger.exception("Failed to set min_amount value: %s", value)
+            return
+
+        if self._filters.min_amount != min_amount:
+            self._set_filters(min_amount=min_amount)
+            self.min_amount_changed.emit()
+
+    min_amount = Property(  # smallest amount, empty for no bound
+        str,
+        _get_min_amount,
+        _set_min_amount,
+        notify=min_amount_changed,  # type: ignore  # noqa: PGH003
+    )
+
+    def _get_max_amount(self) -> str:
+        max_amount = self._filters.max_amount
+        return str(max_amount) if max_amount is not None else ""
+
+    def _set_max_amount(self, value: str) -> None:
+        try:
+            max_amount = self._parse_amount(value)
+        except InvalidOperation:
+            logger.exception("Failed to set max_amount value: %s", value)
+            return
+
+        if self._filters.max_amount != max_amount:
+            self._set_filters(max_amount=max_amount)
+            self.max_amount_changed.emit()
+
+    max_amount = Property(  # largest amount, empty for no bound
+        str,
+        _get_max_amount,
+        _set_max_amount,
+        notify=max_amount_changed,  # type: ignore  # noqa: PGH003
+    )
+
+    def _start_search(self) -> None:
+        """Search with the current filters on the search thread pool."""
+        self._debounce.stop()
+        self._search_id += 1
+        search_id = self._search_id
+        filters = self._filters
+
+        self._set_searching(True)  # noqa: FBT003
+        self._search_pool.start(lambda: self._run_search(search_id, filters))
+
+    def _run_search(self, search_id: int, filters: _Filters) -> None:
+        """Run a search and report its results. Runs on the search thread pool."""
+        transactions = None
+
+        try:
+            transactions = _search(filters)
+        except Exception:
+            logger.exception("Failed to search transactions")
+        finally:
+            db.remove_thread_sessions()
+
+        self._results_ready.emit(search_id, transactions)
+
+    def _on_results_ready(self, search_id: int, transactions: list[Transaction] | None) -> None:
+        if search_id != self._search_id:
+            logger.debug("Dropped results of superseded search %d", search_id)
+            return
+
+        # Rows of a failed search are cleared, they do not match the filters
+        self.beginResetModel()
+        self._transactions = transactions if transactions is not None else []
+        self.endResetModel()
+
+        self._set_failed(transactions is None)
+        self._set_searching(False)  # noqa: FBT003
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: ARG002, B008, N802
+        """Return the number of rows in the model."""
+        return len(self._transactions)
+
+    def data(self, index: QModelIndex, role: int) -> str | QDate | int | None:
+        """Return the data for a given role and index in the model."""
+        row = index.row()
+        getter = self._role_getters.get(role)
+
+        if getter is not None and row < len(self._transactions):
+            return getter(self._transactions[row])
+
+        return None
+
+    def roleNames(self) -> dict[int, QByteArray]:  # noqa: N802
+        """Map role enum values to QByteArray identifiers for QML property access."""
+        roles = super().roleNames()
+        t_role = TransactionModel.TransactionRole  # type: ignore  # noqa: PGH003 # Pylance doesn't recognize TransactionRole
+
+        roles[t_role.IdRole] = QByteArray(b"index")  # not to be confused with qml Ids
+        roles[t_role.NameRole] = QByteArray(b"name")
+        roles[t_role.AmountRole] = QByteArray(b"amount")
+        roles[t_role.DateRole] = QByteArray(b"date")
+        roles[t_role.CategoryRole] = QByteArray(b"category")
+        roles[t_role.TypeRole] = QByteArray(b"type")
+
+        return roles
+
+    @Slot()
+    def update_model(self) -> None:
+        """Search again at once, e.g. after transactions were changed."""
+        if self._filters == _NO_FILTERS and not self._transactions:
+            return  # Nothing is searched for, nothing to update
+
+        self._start_search()
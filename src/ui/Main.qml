@@ -85,6 +85,16 @@ ApplicationWindow {
         asynchronous: true
     }
 
+    // Refresh the displayed month when background generation adds transactions to it
+    Connections {
+        target: AppController
+        enabled: transactionModelLoader.status == Loader.Ready
+
+        function onTransactions_generated(months) {
+            transactionModelLoader.item.update_months(months);
+        }
+    }
+
     // Monthly Transaction model
     Loader {
         id: monthlyTransactionModelLoader
@@ -93,6 +103,93 @@ ApplicationWindow {
         asynchronous: true
     }
 
+    // Transaction ledger model, the full history on the history tab
+    Loader {
+        id: transactionLedgerModelLoader
+        active: AppController.init_status // defer data model loading until db is ready
+        sourceComponent: TransactionLedgerModel {
+            active: historyTab.visible // reload written months only while the history is shown
+        }
+        asynchronous: true
+    }
+
+    // Refresh the history when transactions are generated or written
+    Connections {
+        target: AppController
+        enabled: transactionLedgerModelLoader.status == Loader.Ready
+
+        function onTransactions_generated(months) {
+            transactionLedgerModelLoader.item.update_months(months);
+        }
+    }
+
+    Connections {
+        target: transactionModelLoader.item
+        enabled: transactionLedgerModelLoader.status == Loader.Ready
+
+        function onTransactions_changed(months) {
+            if (months.length > 0) {
+                transactionLedgerModelLoader.item.update_months(months);
+            } else {
+                transactionLedgerModelLoader.item.update_model();
+            }
+        }
+    }
+
+    // Transaction search model, searched from the history tab
+    Loader {
+        id: transactionSearchModelLoader
+        active: AppController.init_status // defer data model loading until db is ready
+        sourceComponent: TransactionSearchModel {}
+        asynchronous: true
+    }
+
+    // Search again when transactions are generated or written
+    Connections {
+        target: AppController
+        enabled: transactionSearchModelLoader.status == Loader.Ready
+
+        function onTransactions_generated(months) {
+            transactionSearchModelLoader.item.update_model();
+        }
+    }
+
+    Connections {
+        target: transactionModelLoader.item
+        enabled: transactionSearchModelLoader.status == Loader.Ready
+
+        function onTransactions_changed() {
+            transactionSearchModelLoader.item.update_model();
+        }
+    }
+
+    // Chart series model, drawn natively on the data analysis tab
+    Loader {
+        id: chartSeriesModelLoader
+        active: AppController.init_status // defer data model loading until db is ready
+        sourceComponent: ChartSeriesModel {}
+        asynchronous: true
+    }
+
+    // Refresh the chart series when transactions are generated or written
+    Connections {
+        target: AppController
+        enabled: chartSeriesModelLoader.status == Loader.Ready
+
+        function onTransactions_generated(months) {
+            chartSeriesModelLoader.item.update_months(months);
+        }
+    }
+
+    Connections {
+        target: transactionModelLoader.item
+        enabled: chartSeriesModelLoader.status == Loader.Ready
+
+        function onTransactions_changed() {
+            chartSeriesModelLoader.item.update_model();
+        }
+    }
+
     // App window content
     ColumnLayout {
         anchors.fill: parent
@@ -117,6 +214,12 @@ ApplicationWindow {
                 font.pointSize: Math.max(10, Math.min(parent.width, parent.height) * 0.15)
                 onClicked: stackView.currentIndex = 1
             }
+
+            TabButton {
+                text: qsTr("History")
+                font.pointSize: Math.max(10, Math.min(parent.width, parent.height) * 0.15)
+                onClicked: stackView.currentIndex = 2
+            }
         }
 
         // Tab content
@@ -147,6 +250,7 @@ ApplicationWindow {
                         appController: AppController
                         appWindow: appWindow
                         foregroundColor: Material.foreground
+                        seriesModel: chartSeriesModelLoader.status == Loader.Ready ? chartSeriesModelLoader.item : null
                     }
                     ExportComponent {
                         appController: AppController
@@ -154,6 +258,15 @@ ApplicationWindow {
                     }
                 }
             }
+
+            TransactionHistory {
+                id: historyTab
+                Layout.fillWidth: true
+                Layout.fillHeight: true
+
+                ledgerModel: transactionLedgerModelLoader.status == Loader.Ready ? transactionLedgerModelLoader.item : null
+                searchModel: transactionSearchModelLoader.status == Loader.Ready ? transactionSearchModelLoader.item : null
+            }
         }
     }
 }
@@ -1,5 +1,6 @@
 pragma ComponentBehavior: Bound
 import QtQuick
+import QtQuick.Window
 import QtQuick.Controls
 import QtQuick.Controls.Material
 import QtQuick.Layouts
@@ -15,6 +16,9 @@ ColumnLayout {
     property var selectedIndices: defaultIndices.slice()
     property bool populateYearModel: false
     property bool includeMonths: false
+    property bool populateYearRange: false  // Start and end year instead of a single year
+    property int renderProgress: 100  // Percentage of the running chart render
+    readonly property size renderSize: Qt.size(chartImage.width * Screen.devicePixelRatio, chartImage.height * Screen.devicePixelRatio)  // Device pixels
 
     Component.onCompleted: {
         updatePlaceholderVisibility();
@@ -36,6 +40,16 @@ ColumnLayout {
             let currentMonthIndex = new Date().getMonth();
             defaultIndices = includeMonths ? [years.length - 2, currentMonthIndex] : [years.length - 2];
             selectedIndices = defaultIndices.slice();
+        } else if (populateYearRange) {
+            let currentYear = new Date().getFullYear();
+            let years = [];
+            for (let i = currentYear - 25; i <= currentYear + 1; i++) {
+                years.push(i.toString());
+            }
+
+            comboModels = [years, years];
+            defaultIndices = [years.length - 12, years.length - 2];  // The last 10 years
+            selectedIndices = defaultIndices.slice();
         }
     }
 
@@ -80,6 +94,7 @@ ColumnLayout {
             Button {
                 text: "Generate Graph"
                 onClicked: {
+                    root.renderProgress = 0;
                     root.generateRequested();
                 }
             }
@@ -94,13 +109,29 @@ ColumnLayout {
         border.width: 1
         radius: 8
 
+        // Low resolution preview, shown until the full resolution chart is ready
+        Image {
+            id: previewImage
+            anchors.fill: chartImage
+            source: root.imageSource ? root.imageSource + "&preview" : ""
+            sourceSize: chartImage.sourceSize
+            fillMode: Image.PreserveAspectFit
+            visible: chartImage.visible && chartImage.status !== Image.Ready
+        }
+
         Image {
             id: chartImage
             anchors.centerIn: parent
             width: parent.width
             height: parent.height
+            source: root.imageSource  // Rendered by the chart image provider
+            sourceSize: Qt.size(width, height)  // Rendered at this size in device pixels
+            fillMode: Image.PreserveAspectFit
 
             onStatusChanged: {
+                if (status !== Image.Loading) {
+                    root.renderProgress = 100;
+                }
                 if (status === Image.Error) {
                     placeholderText.visible = true;
                     chartImage.visible = false;
@@ -123,11 +154,24 @@ ColumnLayout {
             wrapMode: Text.WordWrap
             visible: false
         }
+
+        ProgressBar {
+            anchors.left: parent.left
+            anchors.right: parent.right
+            anchors.bottom: parent.bottom
+            anchors.margins: 8
+            from: 0
+            to: 100
+            value: root.renderProgress
+            visible: root.renderProgress < 100
+        }
     }
-    function reloadImage() {
-        var base = imageSource.split("?")[0];
-        var timestamp = new Date().getTime();  // unique value to force reload
-        chartImage.source = base + "?" + timestamp;
+    function showImage(url) {
+        imageSource = url;
+        updatePlaceholderVisibility();
+        if (chartImage.status !== Image.Loading) {
+            renderProgress = 100;  // Same url as before, the image is already shown
+        }
     }
     function updatePlaceholderVisibility() {
         if (!root.imageSource) {
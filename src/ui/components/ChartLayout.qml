@@ -1,5 +1,6 @@
 pragma ComponentBehavior: Bound
 import QtQuick
+import QtQuick.Controls
 import QtQuick.Layouts
 
 Item {
@@ -7,9 +8,74 @@ Item {
     property var appController
     property var appWindow
     property color foregroundColor
+    property var seriesModel  // ChartSeriesModel of the natively drawn chart, null until loaded
     Layout.fillHeight: true
     Layout.preferredWidth: parent.width * 0.78
 
+    function chartItem(kind) {
+        switch (kind) {
+        case "monthly_trend":
+            return chart1Loader.item;
+        case "daily_transactions":
+            return chart2Loader.item;
+        case "income_vs_expense":
+            return chart3Loader.item;
+        case "expense_distribution":
+            return chart4Loader.item;
+        case "net_flow_trend":
+            return chart5Loader.item;
+        case "balance_history":
+            return chart6Loader.item;
+        default:
+            return null;
+        }
+    }
+
+    // Chart urls and render progress arrive through signals, images come from the image provider
+    Connections {
+        target: root.appController
+        function onChart_ready(kind, url) {
+            let chart = root.chartItem(kind);
+            if (chart) {
+                chart.showImage(url);
+            }
+        }
+        function onChart_progress(kind, percentage) {
+            let chart = root.chartItem(kind);
+            if (chart) {
+                chart.renderProgress = percentage;
+            }
+        }
+        function onChart_failed(kind) {
+            let chart = root.chartItem(kind);
+            if (chart) {
+                chart.renderProgress = 100;
+            }
+        }
+        function onDashboard_timings(timings) {
+            let parts = [];
+            for (let kind in timings) {
+                parts.push(kind.replace(/_/g, " ") + ": " + (timings[kind] < 0 ? "cached" : Math.round(timings[kind]) + " ms"));
+            }
+            dashboardTimings.text = parts.join("   ");
+        }
+    }
+
+    function generateDashboard() {
+        let year = dashboardYear.currentText;
+        let dailyChart = chart2Loader.item;
+        let month = dailyChart ? dailyChart.comboModels[1][dailyChart.selectedIndices[1]] : ("0" + (new Date().getMonth() + 1)).slice(-2);
+        for (let kind of ["monthly_trend", "daily_transactions", "income_vs_expense", "expense_distribution"]) {
+            let chart = root.chartItem(kind);
+            if (chart) {
+                chart.renderProgress = 0;
+            }
+        }
+        dashboardTimings.text = "";
+        let renderSize = dailyChart ? dailyChart.renderSize : Qt.size(0, 0);  // All charts have the same size
+        root.appController.plot_dashboard(year, month, renderSize.width, renderSize.height);
+    }
+
     Flickable {
         id: scrollArea
         anchors.fill: parent
@@ -21,6 +87,40 @@ Item {
             id: contentWrapper
             width: scrollArea.width
             spacing: 20
+
+            // Generate every chart of a year in one pass (the daily chart keeps its selected month)
+            RowLayout {
+                anchors.horizontalCenter: parent.horizontalCenter
+                spacing: 10
+                visible: root.appController.init_status === true
+
+                ComboBox {
+                    id: dashboardYear
+                    Layout.preferredHeight: 40
+                    popup.height: 300
+                    model: {
+                        let currentYear = new Date().getFullYear();
+                        let years = [];
+                        for (let i = currentYear - 25; i <= currentYear + 1; i++) {
+                            years.push(i.toString());
+                        }
+                        return years;
+                    }
+                    currentIndex: count - 2
+                }
+
+                Button {
+                    text: "Generate All Graphs"
+                    onClicked: root.generateDashboard()
+                }
+
+                Text {
+                    id: dashboardTimings
+                    color: root.foregroundColor
+                    font.pixelSize: 12
+                }
+            }
+
             Item {
                 width: parent.width
                 height: chartsGrid.implicitHeight
@@ -45,9 +145,6 @@ Item {
                             active: root.appController.init_status
                             asynchronous: true
                             sourceComponent: chart1Component
-                            onLoaded: {
-                                item.imageSource = root.appController.chart_paths["monthlyChart"];
-                            }
                         }
 
                         // Chart 2 Loader
@@ -56,9 +153,6 @@ Item {
                             active: root.appController.init_status === true
                             asynchronous: true
                             sourceComponent: chart2Component
-                            onLoaded: {
-                                item.imageSource = root.appController.chart_paths["dailyChart"];
-                            }
                         }
 
                         // Chart 3 Loader
@@ -67,9 +161,6 @@ Item {
                             active: root.appController.init_status === true
                             asynchronous: true
                             sourceComponent: chart3Component
-                            onLoaded: {
-                                item.imageSource = root.appController.chart_paths["incomeVsExpense"];
-                            }
                         }
 
                         // Chart 4 Loader
@@ -78,8 +169,32 @@ Item {
                             active: root.appController.init_status === true
                             asynchronous: true
                             sourceComponent: chart4Component
-                            onLoaded: {
-                                item.imageSource = root.appController.chart_paths["expenseDistribution"];
+                        }
+
+                        // Chart 5 Loader
+                        Loader {
+                            id: chart5Loader
+                            active: root.appController.init_status === true
+                            asynchronous: true
+                            sourceComponent: chart5Component
+                        }
+
+                        // Chart 6 Loader
+                        Loader {
+                            id: chart6Loader
+                            active: root.appController.init_status === true
+                            asynchronous: true
+                            sourceComponent: chart6Component
+                        }
+
+                        // Natively drawn chart, follows the database without generating
+                        Loader {
+                            id: seriesChartLoader
+                            active: root.seriesModel ? true : false
+                            asynchronous: true
+                            sourceComponent: SeriesChart {
+                                foregroundColor: root.foregroundColor
+                                seriesModel: root.seriesModel
                             }
                         }
                     }
@@ -99,7 +214,6 @@ Item {
             includeMonths: false
             onGenerateRequested: function () {
                 root.appController.plot_monthly_trend(comboModels[0][selectedIndices[0]]);
-                chart1.reloadImage();
             }
         }
     }
@@ -115,7 +229,6 @@ Item {
             includeMonths: true
             onGenerateRequested: function () {
                 root.appController.plot_daily_transactions(comboModels[0][selectedIndices[0]], comboModels[1][selectedIndices[1]]);
-                chart2.reloadImage();
             }
         }
     }
@@ -131,7 +244,6 @@ Item {
             includeMonths: false
             onGenerateRequested: function () {
                 root.appController.plot_income_vs_expense(comboModels[0][selectedIndices[0]]);
-                chart3.reloadImage();
             }
         }
     }
@@ -147,7 +259,34 @@ Item {
             includeMonths: false
             onGenerateRequested: function () {
                 root.appController.plot_expense_distribution(comboModels[0][selectedIndices[0]]);
-                chart4.reloadImage();
+            }
+        }
+    }
+
+    // Chart 5 Component
+    Component {
+        id: chart5Component
+        ChartComponent {
+            id: chart5
+            title: "Monthly Net Flow for Range of Years"
+            foregroundColor: root.foregroundColor
+            populateYearRange: true
+            onGenerateRequested: function () {
+                root.appController.plot_net_flow_trend(comboModels[0][selectedIndices[0]], comboModels[1][selectedIndices[1]]);
+            }
+        }
+    }
+
+    // Chart 6 Component
+    Component {
+        id: chart6Component
+        ChartComponent {
+            id: chart6
+            title: "Daily Balance for Range of Years"
+            foregroundColor: root.foregroundColor
+            populateYearRange: true
+            onGenerateRequested: function () {
+                root.appController.plot_balance_history(comboModels[0][selectedIndices[0]], comboModels[1][selectedIndices[1]]);
             }
         }
     }
@@ -542,6 +542,7 @@ Item {
                     Layout.preferredHeight: parent.height * 0.55
 
                     model: overview.transactionModel
+                    opacity: overview.transactionModel && overview.transactionModel.loading ? 0.5 : 1.0
                     headerText: qsTr("Click the plus icon to add a new transaction")
 
                     delegate: TransactionDelegate {
@@ -0,0 +1,183 @@
+pragma ComponentBehavior: Bound
+import QtQuick
+import QtQuick.Controls
+import QtQuick.Controls.Material
+import QtQuick.Layouts
+
+// Bar chart drawn from a ChartSeriesModel, updates with the model instead of rendering an image
+ColumnLayout {
+    id: root
+    property string title: "Income&Expenses (live)"
+    property color foregroundColor: "black"
+    property var seriesModel  // ChartSeriesModel
+    readonly property color incomeColor: "#4caf50"
+    readonly property color expenseColor: "#f44336"
+    readonly property bool showsCategories: seriesModel ? seriesModel.series === "categories" : false
+
+    spacing: 10
+    Layout.alignment: Qt.AlignLeft
+
+    Text {
+        text: root.title
+        font.bold: true
+        font.pointSize: 14
+        color: root.foregroundColor
+        Layout.alignment: Qt.AlignHCenter
+    }
+
+    RowLayout {
+        Layout.preferredWidth: 600
+        Layout.preferredHeight: 40
+        spacing: 10
+
+        ComboBox {
+            id: seriesBox
+            Layout.fillWidth: true
+            Layout.preferredHeight: 40
+            textRole: "text"
+            valueRole: "value"
+            model: [
+                {
+                    text: qsTr("Months of Year"),
+                    value: "monthly"
+                },
+                {
+                    text: qsTr("Days of Month"),
+                    value: "daily"
+                },
+                {
+                    text: qsTr("Categories of Year"),
+                    value: "categories"
+                }
+            ]
+            onActivated: root.seriesModel.series = currentValue
+        }
+
+        ComboBox {
+            id: yearBox
+            Layout.fillWidth: true
+            Layout.preferredHeight: 40
+            popup.height: 300
+            model: {
+                let currentYear = new Date().getFullYear();
+                let years = [];
+                for (let i = currentYear - 25; i <= currentYear + 1; i++) {
+                    years.push(i.toString());
+                }
+                return years;
+            }
+            currentIndex: count - 2
+            onActivated: root.seriesModel.year = parseInt(currentText)
+        }
+
+        ComboBox {
+            id: monthBox
+            Layout.fillWidth: true
+            Layout.preferredHeight: 40
+            popup.height: 300
+            visible: seriesBox.currentValue === "daily"
+            model: 12
+            displayText: ("0" + (currentIndex + 1)).slice(-2)
+            delegate: ItemDelegate {
+                required property int index
+                width: ListView.view.width
+                text: ("0" + (index + 1)).slice(-2)
+            }
+            currentIndex: new Date().getMonth()
+            onActivated: root.seriesModel.month = currentIndex + 1
+        }
+
+        ComboBox {
+            id: categoryTypeBox
+            Layout.fillWidth: true
+            Layout.preferredHeight: 40
+            visible: seriesBox.currentValue === "categories"
+            model: ["Expense", "Income"]
+            onActivated: root.seriesModel.category_type = currentText
+        }
+    }
+
+    Rectangle {
+        Layout.preferredWidth: 600
+        Layout.preferredHeight: 400
+        color: "#eeeeee"
+        border.color: "#cccccc"
+        border.width: 1
+        radius: 8
+
+        Item {
+            id: plotArea
+            anchors.fill: parent
+            anchors.margins: 16
+            anchors.bottomMargin: 32  // Room for the labels
+            opacity: root.seriesModel && root.seriesModel.loading ? 0.5 : 1.0
+
+            Row {
+                anchors.fill: parent
+
+                Repeater {
+                    id: bars
+                    model: root.seriesModel
+
+                    Item {
+                        id: point
+                        required property string label
+                        required property real income
+                        required property real expense
+                        required property real value
+                        readonly property real maximum: root.seriesModel.maximum > 0 ? root.seriesModel.maximum : 1
+
+                        width: plotArea.width / Math.max(1, bars.count)
+                        height: plotArea.height
+
+                        Row {
+                            anchors.bottom: parent.bottom
+                            anchors.horizontalCenter: parent.horizontalCenter
+                            spacing: 1
+
+                            Rectangle {
+                                width: point.width * (root.showsCategories ? 0.7 : 0.35)
+                                height: plotArea.height * Math.max(0, root.showsCategories ? point.value : point.income) / point.maximum
+                                anchors.bottom: parent.bottom
+                                color: root.showsCategories ? Material.accent : root.incomeColor
+                            }
+
+                            Rectangle {
+                                width: point.width * 0.35
+                                height: plotArea.height * point.expense / point.maximum
+                                anchors.bottom: parent.bottom
+                                color: root.expenseColor
+                                visible: !root.showsCategories
+                            }
+                        }
+
+                        Text {
+                            anchors.top: parent.bottom
+                            anchors.topMargin: 4
+                            width: parent.width
+                            text: point.label
+                            color: "#666"
+                            font.pixelSize: 10
+                            horizontalAlignment: Text.AlignHCenter
+                            elide: Text.ElideRight
+                        }
+                    }
+                }
+            }
+        }
+
+        Text {
+            anchors.centerIn: parent
+            text: "No transactions in this period."
+            color: "#666"
+            font.pixelSize: 18
+            font.bold: true
+            visible: root.seriesModel && !root.seriesModel.loading && root.seriesModel.maximum <= 0
+        }
+
+        BusyIndicator {
+            anchors.centerIn: parent
+            running: root.seriesModel ? root.seriesModel.loading : false
+        }
+    }
+}
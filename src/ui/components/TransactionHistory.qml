@@ -0,0 +1,115 @@
+pragma ComponentBehavior: Bound
+import QtQuick
+import QtQuick.Controls
+import QtQuick.Controls.Material
+import QtQuick.Layouts
+
+// Full transaction history, newest first, fetched a page at a time while scrolling.
+// Typing in the search field shows the best matching transactions instead.
+Item {
+    id: history
+
+    property var ledgerModel  // TransactionLedgerModel, null until loaded
+    property var searchModel  // TransactionSearchModel, null until loaded
+    readonly property bool showsSearch: searchField.text.trim() !== "" && searchModel !== null
+
+    ColumnLayout {
+        anchors.fill: parent
+        anchors.margins: 10
+
+        TextField {
+            id: searchField
+            Layout.fillWidth: true
+            placeholderText: qsTr("Search transactions by name or category")
+            enabled: history.searchModel !== null
+
+            onTextChanged: {
+                history.searchModel.text = text;
+            }
+        }
+
+        ListView {
+            id: historyList
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            clip: true
+
+            model: history.showsSearch ? history.searchModel : history.ledgerModel
+            opacity: history.showsSearch && history.searchModel.searching ? 0.5 : 1.0
+
+            ScrollBar.vertical: ScrollBar {}
+
+            delegate: ItemDelegate {
+                id: delegate
+
+                required property var model
+
+                width: historyList.width
+                height: 60
+                padding: 20
+
+                contentItem: RowLayout {
+                    // Date
+                    Text {
+                        Layout.fillWidth: true
+                        Layout.preferredWidth: 1
+
+                        text: delegate.model.date.toLocaleDateString(Qt.locale(), "dd MMMM yyyy")
+                        color: Material.foreground
+                        font.weight: Font.StyleItalic
+                        font.pointSize: 12
+                    }
+
+                    // Name
+                    Text {
+                        Layout.fillWidth: true
+                        Layout.preferredWidth: 1
+
+                        text: delegate.model.name
+                        color: Material.foreground
+                        font.bold: true
+                        font.pointSize: 12
+                        elide: Text.ElideRight
+                    }
+
+                    // Category
+                    Text {
+                        Layout.fillWidth: true
+                        Layout.preferredWidth: 1
+
+                        text: delegate.model.category
+                        color: Material.foreground
+                        font.pointSize: 12
+                        elide: Text.ElideRight
+                    }
+
+                    // Amount
+                    Text {
+                        Layout.fillWidth: true
+                        Layout.preferredWidth: 1
+
+                        text: delegate.model.amount + "€"
+                        font.pointSize: 14
+                        color: delegate.model.type === "income" ? "green" : "red"
+                        horizontalAlignment: Text.AlignRight
+                    }
+                }
+
+                background: Rectangle {
+                    color: Material.dividerColor
+                    height: 1
+                    width: parent.width
+                    anchors.bottom: parent.bottom
+                }
+            }
+
+            Text {
+                anchors.centerIn: parent
+                text: !history.showsSearch ? qsTr("No transactions yet.") : history.searchModel.failed ? qsTr("Search failed.") : qsTr("No matching transactions.")
+                color: Material.foreground
+                font.pointSize: 16
+                visible: historyList.count === 0 && !(history.showsSearch && history.searchModel.searching)
+            }
+        }
+    }
+}
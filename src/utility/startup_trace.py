@@ -0,0 +1,77 @@
+"""Startup timing. Measures import groups and time to first frame, printed with --startup-trace.
+
+Must be the first app module imported by main, the startup clock starts when it is imported.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Modules that are only loaded on first use (or by the warm-up after the first frame)
+DEFERRED_MODULES = ("gen.graph_gen", "gen.excel_gen", "matplotlib", "pandas", "xlsxwriter")
+
+
+class State:
+    def __init__(self) -> None:
+        self._start = time.perf_counter()
+        self._imports: list[tuple[str, float]] = []
+        self._first_frame: float | None = None
+        self._enabled = False
+
+    def enable(self) -> None:
+        """Print the startup report once the first frame is shown."""
+        self._enabled = True
+
+    @contextmanager
+    def measure_import(self, label: str) -> Iterator[None]:
+        """Measure the time taken by the imports in the with block."""
+        start = time.perf_counter()
+        yield
+        self._imports.append((label, time.perf_counter() - start))
+
+    def first_frame(self) -> None:
+        """Record that the first frame was shown, only the first call counts."""
+        if self._first_frame is not None:
+            return
+
+        self._first_frame = time.perf_counter() - self._start
+
+        if self._enabled:
+            print(self.report(), file=sys.stderr)  # noqa: T201
+
+    def warm_up_finished(self, seconds: float) -> None:
+        """Report how long the background warm-up took."""
+        if self._enabled:
+            print(f"Startup trace: warm-up finished in {seconds * 1000:.0f} ms", file=sys.stderr)  # noqa: T201
+
+    def report(self) -> str:
+        """Get the startup report."""
+        lines = ["Startup trace:"]
+
+        if self._first_frame is not None:
+            lines.append(f"  time to first frame: {self._first_frame * 1000:.0f} ms")
+
+        lines.append("  imports:")
+        lines.extend(
+            f"    {label:<24} {seconds * 1000:>7.0f} ms" for label, seconds in self._imports
+        )
+
+        loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+        lines.append(f"  deferred modules loaded before first frame: {', '.join(loaded) or 'none'}")
+
+        return "\n".join(lines)
+
+
+_state = State()
+
+enable = _state.enable
+measure_import = _state.measure_import
+first_frame = _state.first_frame
+warm_up_finished = _state.warm_up_finished
+report = _state.report
@@ -0,0 +1,64 @@
+from collections.abc import Iterator
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from data import monthly_gen
+from data.models import Base, MonthlyTransaction, TransactionCategory, TransactionType
+
+
+@pytest.fixture
+def session() -> Iterator[Session]:
+    """Session of an empty in-memory database."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add(TransactionCategory(name="Bills", transaction_type=TransactionType.EXPENSE))
+        session.flush()
+        yield session
+
+
+def _monthly_transaction(start_date: date) -> MonthlyTransaction:
+    return MonthlyTransaction(
+        name="Rent",
+        amount=Decimal("500.00"),
+        transaction_type=TransactionType.EXPENSE,
+        day_of_month=10,
+        start_date=start_date,
+        category="Bills",
+    )
+
+
+def test_materialize_from_start_date(session: Session) -> None:
+    monthly_transaction = _monthly_transaction(date(2024, 1, 15))
+    session.add(monthly_transaction)
+
+    dates = monthly_gen._materialize(session, monthly_transaction, date(2024, 4, 10))
+
+    assert dates == [
+        date(2024, 2, 10),
+        date(2024, 3, 10),
+        date(2024, 4, 10),
+    ]
+    assert monthly_transaction.generated_until == date(2024, 4, 10)
+
+
+def test_materialize_after_start_date_moved_forward(session: Session) -> None:
+    monthly_transaction = _monthly_transaction(date(2024, 1, 1))
+    session.add(monthly_transaction)
+    monthly_gen._materialize(session, monthly_transaction, date(2024, 3, 31))
+
+    # Edited to start after the generated dates, the months in between are skipped
+    monthly_transaction.start_date = date(2024, 6, 1)
+    dates = monthly_gen._materialize(session, monthly_transaction, date(2024, 8, 15))
+
+    assert dates == [
+        date(2024, 6, 10),
+        date(2024, 7, 10),
+        date(2024, 8, 10),
+    ]
+    assert monthly_transaction.generated_until == date(2024, 8, 15)
@@ -0,0 +1,102 @@
+"""Benchmark the commit latency of the SQLite pragma profiles (data.db.PRAGMA_PROFILES).
+
+A fresh database is created with the given profile in a temporary data folder, then --commits
+transactions are inserted with one commit each, the way the app saves a transaction. The median
+and 95th percentile commit latency are printed. The temporary folder is on the disk of the system
+temp directory (set TMPDIR to measure another disk).
+
+Run from the repository root, once per profile:
+    python tools/bench_db_profiles.py safe
+    python tools/bench_db_profiles.py performance
+"""
+
+# ruff: noqa: INP001, PLC0415, T201
+
+import argparse
+import datetime
+import logging
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+DB_FILES = ("pfm.db", "pfm.db-wal", "pfm.db-shm", "pfm.db-journal")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "profile",
+        help="Pragma profile to benchmark (a data.db.PRAGMA_PROFILES key).",
+    )
+    parser.add_argument(
+        "--src",
+        type=Path,
+        help="Source folder of the app revision to benchmark.",
+        default=Path(__file__).resolve().parent.parent / "src",
+    )
+    parser.add_argument(
+        "--commits",
+        type=int,
+        help="Number of single row commits per profile.",
+        default=500,
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Time single row commits with a pragma profile on a fresh database."""
+    args = parse_args()
+    sys.path.insert(0, str(args.src))
+
+    from data import db
+    from data.models import Transaction, TransactionCategory, TransactionType
+    from utility import save
+
+    # Temporary data folder (removed on exit), without the copied development database
+    save.instantiate(temp_instance=True)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for name in DB_FILES:
+        (save.data_folder_path() / name).unlink(missing_ok=True)
+
+    db.initialize(args.profile)
+    today = datetime.datetime.now().astimezone().date()
+
+    with db.create_session() as session:
+        session.add(TransactionCategory(name="Bills", transaction_type=TransactionType.EXPENSE))
+        session.commit()
+
+    latencies = []
+
+    for i in range(args.commits):
+        with db.create_session() as session:
+            session.add(
+                Transaction(
+                    name=f"Transaction {i}",
+                    amount=Decimal("12.34"),
+                    transaction_type=TransactionType.EXPENSE,
+                    execution_date=today,
+                    category="Bills",
+                ),
+            )
+            session.flush()
+
+            start = time.perf_counter()
+            session.commit()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    db.close_db()
+
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"{args.profile}: median {statistics.median(latencies):.3f} ms, p95 {p95:.3f} ms "
+        f"per commit ({args.commits} commits)",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark recurring transaction generation (data.monthly_gen).
+
+Creates --count recurring transactions that started --years years ago in a temporary data
+folder, then times either
+- each: gen_transactions called once for each of them
+- catch-up: gen_transactions_for_all (the startup catch-up), then again with nothing due
+
+Run from the repository root:
+    python tools/bench_monthly_gen.py each
+    python tools/bench_monthly_gen.py catch-up
+
+Only the public monthly_gen API is used, so the numbers of an older revision can be reproduced
+by pointing --src at a checkout of it:
+    git worktree add /tmp/pfm-old <revision>
+    python tools/bench_monthly_gen.py each --src /tmp/pfm-old/src
+"""
+
+# ruff: noqa: INP001, PLC0415, T201
+
+import argparse
+import datetime
+import logging
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+DB_FILES = ("pfm.db", "pfm.db-wal", "pfm.db-shm")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "mode",
+        choices=("each", "catch-up"),
+        help="Generate one recurring transaction at a time, or all due ones at once.",
+    )
+    parser.add_argument(
+        "--src",
+        type=Path,
+        help="Source folder of the app revision to benchmark.",
+        default=Path(__file__).resolve().parent.parent / "src",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        help="Number of recurring transactions.",
+        default=1000,
+    )
+    parser.add_argument(
+        "--years",
+        type=int,
+        help="Years since the recurring transactions started.",
+        default=20,
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Set up a fresh database with recurring transactions and run the benchmark."""
+    args = parse_args()
+    sys.path.insert(0, str(args.src))
+
+    from sqlalchemy import func, select
+
+    from data import db, monthly_gen
+    from data.models import (
+        MonthlyTransaction,
+        Transaction,
+        TransactionCategory,
+        TransactionType,
+    )
+    from utility import save
+
+    # Temporary data folder (removed on exit), without the copied development database
+    save.instantiate(temp_instance=True)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for name in DB_FILES:
+        (save.data_folder_path() / name).unlink(missing_ok=True)
+
+    db.initialize()
+
+    today = datetime.datetime.now().astimezone().date()
+    start_date = today.replace(year=today.year - args.years, day=1)
+
+    with db.create_session() as session:
+        session.add(TransactionCategory(name="Bills", transaction_type=TransactionType.EXPENSE))
+        session.flush()
+
+        session.add_all(
+            MonthlyTransaction(
+                name=f"Recurring {i}",
+                amount=Decimal("12.34"),
+                transaction_type=TransactionType.EXPENSE,
+                day_of_month=1 + i % 31,
+                start_date=start_date,
+                category="Bills",
+            )
+            for i in range(args.count)
+        )
+        session.commit()
+
+        ids = session.scalars(select(MonthlyTransaction.id)).all()
+
+    start = time.perf_counter()
+
+    if args.mode == "each":
+        for monthly_transaction_id in ids:
+            monthly_gen.gen_transactions(monthly_transaction_id)
+    else:
+        monthly_gen.gen_transactions_for_all()
+
+    seconds = time.perf_counter() - start
+
+    with db.create_session() as session:
+        row_count = session.scalar(select(func.count()).select_from(Transaction))
+
+    print(f"{args.mode}, {len(ids)} recurring transactions: {seconds:.2f} s, {row_count} rows")
+
+    if args.mode == "catch-up":
+        start = time.perf_counter()
+        monthly_gen.gen_transactions_for_all()
+        milliseconds = (time.perf_counter() - start) * 1000
+
+        print(f"catch-up, nothing due: {milliseconds:.1f} ms")
+
+    db.close_db()
+
+
+if __name__ == "__main__":
+    main()